@@ -1,25 +1,34 @@
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.app.api.deps import get_current_admin_user, get_db
+from backend.app.core.config import settings
+from backend.app.db.bulk import delete_users, log_conditions, purge_logs, purge_trainings, training_conditions, update_users, users_with_active_trainings
+from backend.app.db.log_search import action_filter
+from backend.app.db.stats import record_training_deleted
 from backend.app.models.user import User
 from backend.app.models.training import Training
 from backend.app.models.log import Log
-from backend.app.schemas.user import UserOut
-from backend.app.schemas.training import TrainingOut
+from backend.app.schemas.user import UserOut, AuthCacheStats
+from backend.app.schemas.admin import BulkUserIds, BulkUserUpdate, BulkUserResult, TrainingPurge, LogPurge, PurgeResult
+from backend.app.schemas.training import ArtifactGCReport, TrainingListItem
+from backend.app.utils.artifact_gc import artifact_collector, delete_training_files
+from backend.app.utils.audit import audit_log
+from backend.app.utils.auth_cache import auth_cache
+from backend.app.utils.pagination import keyset_page
+from backend.app.utils.responses import json_response, row_dicts
+from backend.app.utils.serving import model_cache
 from typing import List, Optional
 from sqlalchemy.future import select
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 
 @router.get("/users", response_model=List[UserOut])
-async def get_users(skip: int = 0, limit: int = 20, email: Optional[str] = None, db: AsyncSession = Depends(get_db), current_admin=Depends(get_current_admin_user)):
+async def get_users(response: Response, cursor: Optional[str] = None, skip: int = 0, limit: int = Query(20, ge=1, le=500), email: Optional[str] = None, db: AsyncSession = Depends(get_db), current_admin=Depends(get_current_admin_user)):
     query = select(User)
     if email:
         query = query.filter(User.email.ilike(f"%{email}%"))
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    users = result.scalars().all()
-    return users
+    users = await keyset_page(db, query, User.created_at, User.id, cursor, limit, response, skip)
+    return json_response(row_dicts(users, UserOut.__fields__), response)
 
 @router.get("/users/{user_id}", response_model=UserOut)
 async def get_user(user_id: int, db: AsyncSession = Depends(get_db), current_admin=Depends(get_current_admin_user)):
@@ -33,52 +42,130 @@ async def update_user(user_id: int, is_active: Optional[bool] = None, is_admin:
     user = await db.get(User, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
-    if is_active is not None:
+    changed = False
+    if is_active is not None and is_active != user.is_active:
         user.is_active = is_active
-    if is_admin is not None:
+        changed = True
+    if is_admin is not None and is_admin != user.is_admin:
         user.is_admin = is_admin
+        changed = True
+    if changed:
+        # Revoke tokens issued before the change
+        user.token_version += 1
     await db.commit()
     await db.refresh(user)
+    if changed:
+        await auth_cache.invalidate_user(user.email)
+        audit_log.log(current_admin.id, "admin.update_user", f"user_id={user.id} is_active={user.is_active} is_admin={user.is_admin}")
     return user
 
 @router.delete("/users/{user_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_user(user_id: int, db: AsyncSession = Depends(get_db), current_admin=Depends(get_current_admin_user)):
-    user = await db.get(User, user_id)
-    if not user:
+async def delete_user(user_id: int, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db), current_admin=Depends(get_current_admin_user)):
+    deleted = await remove_users(db, [user_id], background_tasks)
+    if not deleted:
         raise HTTPException(status_code=404, detail="User not found")
-    await db.delete(user)
-    await db.commit()
+    audit_log.log(current_admin.id, "admin.delete_user", f"user_id={user_id} email={deleted[0].email}")
     return
 
-@router.get("/trainings", response_model=List[TrainingOut])
-async def get_trainings(skip: int = 0, limit: int = 20, status: Optional[str] = None, user_id: Optional[int] = None, db: AsyncSession = Depends(get_db), current_admin=Depends(get_current_admin_user)):
-    query = select(Training)
+@router.post("/users/bulk-update", response_model=BulkUserResult)
+async def bulk_update_users(body: BulkUserUpdate, db: AsyncSession = Depends(get_db), current_admin=Depends(get_current_admin_user)):
+    values = {name: getattr(body, name) for name in ("is_active", "is_admin") if getattr(body, name) is not None}
+    if not values:
+        raise HTTPException(status_code=400, detail="Nothing to update")
+    if current_admin.id in body.user_ids and False in values.values():
+        raise HTTPException(status_code=400, detail="Cannot deactivate or demote your own account")
+    updated = await update_users(db, body.user_ids, values)
+    await db.commit()
+    await auth_cache.invalidate_users([row.email for row in updated])
+    user_ids = [row.id for row in updated]
+    audit_log.log(current_admin.id, "admin.bulk_update_users", f"count={len(user_ids)} " + " ".join(f"{name}={value}" for name, value in values.items()))
+    return {"count": len(user_ids), "user_ids": user_ids}
+
+@router.post("/users/bulk-delete", response_model=BulkUserResult)
+async def bulk_delete_users(body: BulkUserIds, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db), current_admin=Depends(get_current_admin_user)):
+    if current_admin.id in body.user_ids:
+        raise HTTPException(status_code=400, detail="Cannot delete your own account")
+    deleted = await remove_users(db, body.user_ids, background_tasks)
+    user_ids = [row.id for row in deleted]
+    audit_log.log(current_admin.id, "admin.bulk_delete_users", f"count={len(user_ids)}")
+    return {"count": len(user_ids), "user_ids": user_ids}
+
+async def remove_users(db: AsyncSession, user_ids: List[int], background_tasks: BackgroundTasks):
+    # One DELETE; trainings, logs and stats go through ON DELETE CASCADE, and the
+    # trainings' files are removed after the response is sent
+    active = await users_with_active_trainings(db, user_ids)
+    if active:
+        raise HTTPException(status_code=409, detail=f"Users with pending or running trainings: {', '.join(map(str, sorted(active)))}")
+    deleted, files = await delete_users(db, user_ids)
+    await db.commit()
+    await auth_cache.invalidate_users([row.email for row in deleted])
+    forget_training_files(files, background_tasks)
+    return deleted
+
+def forget_training_files(files, background_tasks: BackgroundTasks):
+    for row in files:
+        model_cache.invalidate(row.model_version)
+    if files:
+        background_tasks.add_task(delete_training_files, files)
+
+@router.get("/trainings", response_model=List[TrainingListItem])
+async def get_trainings(response: Response, cursor: Optional[str] = None, skip: int = 0, limit: int = Query(20, ge=1, le=500), status: Optional[str] = None, user_id: Optional[int] = None, db: AsyncSession = Depends(get_db), current_admin=Depends(get_current_admin_user)):
+    # Project only the list columns; parameters/results are fetched per training
+    query = select(*[getattr(Training, field) for field in TrainingListItem.__fields__])
     if status:
         query = query.filter(Training.status == status)
     if user_id:
         query = query.filter(Training.user_id == user_id)
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    trainings = result.scalars().all()
-    return trainings
+    rows = await keyset_page(db, query, Training.created_at, Training.id, cursor, limit, response, skip)
+    return json_response(row_dicts(rows, TrainingListItem.__fields__), response)
 
 @router.delete("/trainings/{training_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_training(training_id: int, db: AsyncSession = Depends(get_db), current_admin=Depends(get_current_admin_user)):
+async def delete_training(training_id: int, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db), current_admin=Depends(get_current_admin_user)):
     training = await db.get(Training, training_id)
     if not training:
         raise HTTPException(status_code=404, detail="Training not found")
     await db.delete(training)
+    await record_training_deleted(db, training)
     await db.commit()
+    forget_training_files([training], background_tasks)
+    audit_log.log(current_admin.id, "admin.delete_training", f"training_id={training_id} model_version={training.model_version}")
     return
 
+@router.post("/trainings/purge", response_model=PurgeResult)
+async def purge_trainings_by_filter(body: TrainingPurge, background_tasks: BackgroundTasks, db: AsyncSession = Depends(get_db), current_admin=Depends(get_current_admin_user)):
+    if not (body.user_ids or body.job_type or body.created_after or body.created_before):
+        raise HTTPException(status_code=400, detail="Specify at least one of user_ids, job_type, created_after or created_before")
+    deleted = await purge_trainings(db, training_conditions(body.user_ids, body.statuses, body.job_type, body.created_after, body.created_before))
+    await db.commit()
+    forget_training_files(deleted, background_tasks)
+    audit_log.log(current_admin.id, "admin.purge_trainings", f"count={len(deleted)}")
+    return {"deleted": len(deleted)}
+
 @router.get("/logs")
-async def get_logs(skip: int = 0, limit: int = 50, user_id: Optional[int] = None, action: Optional[str] = None, db: AsyncSession = Depends(get_db), current_admin=Depends(get_current_admin_user)):
+async def get_logs(response: Response, cursor: Optional[str] = None, skip: int = 0, limit: int = Query(50, ge=1, le=500), user_id: Optional[int] = None, action: Optional[str] = None, db: AsyncSession = Depends(get_db), current_admin=Depends(get_current_admin_user)):
     query = select(Log)
     if user_id:
         query = query.filter(Log.user_id == user_id)
     if action:
-        query = query.filter(Log.action.ilike(f"%{action}%"))
-    query = query.offset(skip).limit(limit)
-    result = await db.execute(query)
-    logs = result.scalars().all()
-    return logs
+        query = query.filter(action_filter(db.bind.dialect.name, Log.__table__, action))
+    logs = await keyset_page(db, query, Log.timestamp, Log.id, cursor, limit, response, skip)
+    return json_response(row_dicts(logs, [column.key for column in Log.__table__.columns]), response)
+
+@router.post("/logs/purge", response_model=PurgeResult)
+async def purge_logs_by_filter(body: LogPurge, current_admin=Depends(get_current_admin_user)):
+    conditions = log_conditions(body.user_ids, body.actions, body.before, body.after)
+    if not conditions:
+        raise HTTPException(status_code=400, detail="Specify at least one of user_ids, actions, after or before")
+    deleted = await purge_logs(conditions, settings.AUDIT_LOG_DELETE_BATCH)
+    audit_log.log(current_admin.id, "admin.purge_logs", f"count={deleted}")
+    return {"deleted": deleted}
+
+@router.get("/auth-cache/stats", response_model=AuthCacheStats)
+async def get_auth_cache_stats(current_admin=Depends(get_current_admin_user)):
+    return auth_cache.stats()
+
+@router.post("/artifacts/gc", response_model=ArtifactGCReport)
+async def collect_model_artifacts(current_admin=Depends(get_current_admin_user)):
+    report = await artifact_collector.collect()
+    audit_log.log(current_admin.id, "admin.artifacts_gc", f"orphans={report['orphans_deleted']} superseded={report['superseded_deleted']} bytes_freed={report['bytes_freed']}")
+    return report
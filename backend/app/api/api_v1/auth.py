@@ -2,13 +2,23 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.app.schemas.user import UserCreate, UserLogin, UserOut
 from backend.app.models.user import User
-from backend.app.utils.security import get_password_hash, verify_password, create_access_token
+from backend.app.utils.security import password_hasher, create_access_token, HasherBusyError
 from backend.app.api.deps import get_db
+from backend.app.utils.audit import audit_log
 from sqlalchemy.future import select
 from backend.app.core.config import settings
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
+def busy_error(e: HasherBusyError) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e), headers={"Retry-After": "1"})
+
+async def hash_password(password: str) -> str:
+    try:
+        return await password_hasher.hash(password)
+    except HasherBusyError as e:
+        raise busy_error(e)
+
 @router.post("/register", response_model=UserOut)
 async def register_user(user_create: UserCreate, db: AsyncSession = Depends(get_db)):
     query = select(User).filter(User.email == user_create.email)
@@ -16,12 +26,13 @@ async def register_user(user_create: UserCreate, db: AsyncSession = Depends(get_
     existing_user = result.scalars().first()
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
-    hashed_password = get_password_hash(user_create.password)
+    hashed_password = await hash_password(user_create.password)
     is_admin = user_create.email.lower() in [email.lower() for email in settings.ADMIN_EMAILS]
     new_user = User(email=user_create.email, hashed_password=hashed_password, is_admin=is_admin)
     db.add(new_user)
     await db.commit()
     await db.refresh(new_user)
+    audit_log.log(new_user.id, "register")
     return new_user
 
 @router.post("/login")
@@ -29,7 +40,18 @@ async def login_user(user_login: UserLogin, db: AsyncSession = Depends(get_db)):
     query = select(User).filter(User.email == user_login.email)
     result = await db.execute(query)
     user = result.scalars().first()
-    if user is None or not verify_password(user_login.password, user.hashed_password):
+    if user is None:
+        raise HTTPException(status_code=401, detail="Invalid email or password")
+    try:
+        valid, new_hash = await password_hasher.verify_and_update(user_login.password, user.hashed_password)
+    except HasherBusyError as e:
+        raise busy_error(e)
+    if not valid:
         raise HTTPException(status_code=401, detail="Invalid email or password")
-    access_token = create_access_token(data={"sub": user.email, "is_admin": user.is_admin})
+    if new_hash is not None:
+        # Stored with a different bcrypt cost than configured
+        user.hashed_password = new_hash
+        await db.commit()
+    audit_log.log(user.id, "login")
+    access_token = create_access_token(data={"sub": user.email, "is_admin": user.is_admin, "ver": user.token_version})
     return {"access_token": access_token, "token_type": "bearer"}
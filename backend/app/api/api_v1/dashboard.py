@@ -1,41 +1,79 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.app.api.deps import get_current_active_user, get_db
 from backend.app.models.training import Training, TrainingStatusEnum
 from backend.app.models.user import User
+from backend.app.models.stats import UserTrainingStats
+from backend.app.db.stats import seed_user_stats
+from sqlalchemy import case, func
 from sqlalchemy.future import select
-from typing import List
-from backend.app.schemas.training import TrainingOut
-from datetime import datetime
+from typing import Any, Dict, List, Optional
+from backend.app.schemas.training import TrainingListItem, TrainingResultItem
+from backend.app.utils.pagination import keyset_page, NEXT_CURSOR_HEADER
+from backend.app.utils.responses import conditional_json, make_etag, row_dicts
+from datetime import datetime, timedelta
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 @router.get("/summary")
 async def get_summary(current_user: User = Depends(get_current_active_user), db: AsyncSession = Depends(get_db)):
-    stmt = select(Training).filter(Training.user_id == current_user.id)
-    result = await db.execute(stmt)
-    trainings = result.scalars().all()
+    stats = await db.get(UserTrainingStats, current_user.id)
+    if stats is None:
+        await seed_user_stats(db, current_user.id)
+        await db.commit()
+        stats = await db.get(UserTrainingStats, current_user.id)
 
-    count = len(trainings)
+    count = stats.total
     if count == 0:
         return {
             "count": 0,
             "last_training": None,
             "success_rate": 0.0,
         }
-    last_training = max(trainings, key=lambda t: t.created_at)
-    completed_count = sum(1 for t in trainings if t.status == TrainingStatusEnum.completed)
-    success_rate = completed_count / count if count > 0 else 0.0
-
     return {
         "count": count,
-        "last_training": last_training.created_at,
-        "success_rate": success_rate,
+        "last_training": stats.last_training_at,
+        "success_rate": stats.completed / count,
     }
 
-@router.get("/results", response_model=List[TrainingOut])
-async def get_results(current_user: User = Depends(get_current_active_user), db: AsyncSession = Depends(get_db)):
-    stmt = select(Training).filter(Training.user_id == current_user.id).order_by(Training.created_at.desc())
+@router.get("/timeseries")
+async def get_timeseries(bucket: str = Query("day", regex="^(day|week)$"), days: int = Query(90, ge=1, le=3660), current_user: User = Depends(get_current_active_user), db: AsyncSession = Depends(get_db)):
+    if db.bind.dialect.name == "postgresql":
+        period = func.date(func.date_trunc(bucket, Training.created_at))
+    elif bucket == "week":
+        # SQLite: Monday of the row's week
+        period = func.date(Training.created_at, "weekday 0", "-6 days")
+    else:
+        period = func.date(Training.created_at)
+    period = period.label("period")
+    completed = func.sum(case((Training.status == TrainingStatusEnum.completed, 1), else_=0))
+    stmt = (
+        select(period, func.count(Training.id), completed)
+        .filter(Training.user_id == current_user.id, Training.created_at >= datetime.utcnow() - timedelta(days=days))
+        .group_by(period)
+        .order_by(period)
+    )
     result = await db.execute(stmt)
-    trainings = result.scalars().all()
-    return trainings
+    return [
+        {"period": str(day), "count": count, "completed": done, "success_rate": done / count if count else 0.0}
+        for day, count, done in result.all()
+    ]
+
+DASHBOARD_METRICS = ("accuracy", "f1_score")
+
+def result_item(row) -> Dict[str, Any]:
+    item = row_dicts([row], TrainingListItem.__fields__)[0]
+    item["results"] = {name: getattr(row, name) for name in DASHBOARD_METRICS if getattr(row, name) is not None} or None
+    return item
+
+@router.get("/results", response_model=List[TrainingResultItem])
+async def get_results(request: Request, response: Response, cursor: Optional[str] = None, limit: int = Query(100, ge=1, le=1000), current_user: User = Depends(get_current_active_user), db: AsyncSession = Depends(get_db)):
+    # Project the list columns and extract the charted metrics in the query, like the
+    # admin list, instead of loading every row's parameters/results JSON
+    metrics = [Training.results[name].as_float().label(name) for name in DASHBOARD_METRICS]
+    stmt = select(*[getattr(Training, field) for field in TrainingListItem.__fields__], *metrics).filter(Training.user_id == current_user.id)
+    rows = await keyset_page(db, stmt, Training.created_at, Training.id, cursor, limit, response)
+    # The page changes when any of its rows is updated or the rows on it change
+    etag = make_etag(cursor, limit, response.headers.get(NEXT_CURSOR_HEADER), [(row.id, row.updated_at) for row in rows])
+    last_modified = max((row.updated_at for row in rows), default=None)
+    return conditional_json(request, lambda: [result_item(row) for row in rows], etag, last_modified, response)
@@ -0,0 +1,32 @@
+from fastapi import APIRouter, Depends, HTTPException
+from backend.app.api.deps import get_current_active_user, get_current_admin_user
+from backend.app.models.user import User
+from backend.app.schemas.prediction import PredictRequest, PredictResponse, ModelCacheStats
+from backend.app.utils.serving import model_cache, predict_rows, check_row, ModelNotFoundError, InvalidRowError
+import asyncio
+
+router = APIRouter(prefix="/models", tags=["models"])
+
+@router.post("/{version}/predict", response_model=PredictResponse)
+async def predict(version: int, request: PredictRequest, current_user: User = Depends(get_current_active_user)):
+    try:
+        entry = await model_cache.get(version)
+    except ModelNotFoundError:
+        raise HTTPException(status_code=404, detail="Model not found")
+    if entry.owner_id != current_user.id and not current_user.is_admin:
+        raise HTTPException(status_code=404, detail="Model not found")
+    try:
+        for row in request.rows:
+            check_row(entry.model, row)
+        if len(request.rows) == 1:
+            # Single rows are micro-batched with concurrent requests for the same model
+            predictions = [await entry.batcher.predict(request.rows[0])]
+        else:
+            predictions = await asyncio.to_thread(predict_rows, entry.model, request.rows)
+    except (InvalidRowError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=str(e))
+    return {"model_version": version, "predictions": predictions}
+
+@router.get("/cache/stats", response_model=ModelCacheStats)
+async def get_model_cache_stats(current_admin=Depends(get_current_admin_user)):
+    return model_cache.stats()
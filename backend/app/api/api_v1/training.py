@@ -1,116 +1,444 @@
-import io
+import os
+import json
+import time
 import asyncio
-from fastapi import APIRouter, Depends, UploadFile, File, WebSocket, WebSocketDisconnect, Query, HTTPException, status
+import functools
+from fastapi import APIRouter, Depends, UploadFile, File, Form, WebSocket, WebSocketDisconnect, Query, HTTPException, Header, Request, status
 from fastapi.responses import JSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.app.api.deps import get_current_active_user, get_db
-from backend.app.schemas.training import TrainingCreate, TrainingOut
-from backend.app.models.training import Training, TrainingStatusEnum
+from backend.app.db.database import async_session_local
+from backend.app.core.config import settings
+from backend.app.db.stats import set_training_status, transition_training, record_trainings_created
+from backend.app.db.versions import allocate_model_versions
+from backend.app.db.job_queue import check_queue_admission
+from backend.app.schemas.training import TrainingCreate, TrainingBatchCreate, SweepCreate, ScoringCreate, TrainingOut
+from backend.app.models.training import Training, TrainingStatusEnum, TrainingJobTypeEnum
 from backend.app.models.user import User
-from backend.app.utils.model import train_model, save_model
-import pandas as pd
+from backend.app.utils.broadcast import broadcast
+from backend.app.utils.audit import audit_log
+from backend.app.utils.metrics import Histogram, TRAINING_BUCKETS, SIZE_BUCKETS, COUNT_BUCKETS
+from backend.app.utils.executor import training_executor, JobHandle, JobCancelledError, ExecutorFullError, UserLimitError
+from backend.app.models.dataset import Dataset
+from backend.app.utils.datasets import spool_bytes, spool_upload, discard_source, dataset_exists, read_dataset_meta, SpooledCSV, DatasetTooLargeError
+from backend.app.utils.downloads import file_response
+from backend.app.utils.responses import conditional_json, make_etag, row_dicts
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.future import select
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, NamedTuple, Optional
 
 router = APIRouter(prefix="/training", tags=["training"])
 
-training_progress = {}
+class TrainingJob(NamedTuple):
+    parameters: Dict[str, Any]
+    source: Dict[str, Any]
+    base_version: Optional[int] = None
 
 @router.post("/start", response_model=TrainingOut)
 async def start_training(training_create: TrainingCreate, current_user: User = Depends(get_current_active_user), db: AsyncSession = Depends(get_db)):
-    # Validate and parse CSV if provided
+    admit_training(current_user.id)
+    base_version = await resolve_base_version(db, current_user, training_create.base_version)
+    source = await resolve_source(db, current_user, training_create)
+    return (await create_trainings(db, current_user, [TrainingJob(training_create.parameters, source, base_version)]))[0]
+
+@router.post("/batch", response_model=List[TrainingOut])
+async def start_training_batch(batch: TrainingBatchCreate, current_user: User = Depends(get_current_active_user), db: AsyncSession = Depends(get_db)):
+    if len(batch.jobs) > settings.TRAINING_BATCH_MAX_JOBS:
+        raise HTTPException(status_code=400, detail=f"At most {settings.TRAINING_BATCH_MAX_JOBS} jobs per batch")
+    admit_training(current_user.id, len(batch.jobs))
+    jobs = []
+    try:
+        for training_create in batch.jobs:
+            base_version = await resolve_base_version(db, current_user, training_create.base_version)
+            jobs.append(TrainingJob(training_create.parameters, await resolve_source(db, current_user, training_create), base_version))
+    except HTTPException:
+        for job in jobs:
+            discard_source(job.source)
+        raise
+    return await create_trainings(db, current_user, jobs)
+
+@router.post("/sweep", response_model=TrainingOut)
+async def start_sweep(sweep_create: SweepCreate, current_user: User = Depends(get_current_active_user), db: AsyncSession = Depends(get_db)):
+    if not sweep_create.sweep.space:
+        raise HTTPException(status_code=400, detail="Sweep search space is empty")
+    if sweep_create.base_version is not None:
+        raise HTTPException(status_code=400, detail="Sweeps cannot warm-start from a base version")
+    from backend.app.utils.sweep import sweep_candidates
+    candidates = len(sweep_candidates(sweep_create.sweep.dict()))
+    if candidates > settings.SWEEP_MAX_CANDIDATES:
+        raise HTTPException(status_code=400, detail=f"Sweep has {candidates} candidates, at most {settings.SWEEP_MAX_CANDIDATES} are allowed")
+    admit_training(current_user.id)
+    source = await resolve_source(db, current_user, sweep_create)
+    parameters = {**sweep_create.parameters, "sweep": sweep_create.sweep.dict()}
+    return (await create_trainings(db, current_user, [TrainingJob(parameters, source)], TrainingJobTypeEnum.sweep))[0]
+
+@router.post("/score", response_model=TrainingOut)
+async def start_scoring(scoring_create: ScoringCreate, current_user: User = Depends(get_current_active_user), db: AsyncSession = Depends(get_db)):
+    admit_training(current_user.id)
+    model_version = await resolve_base_version(db, current_user, scoring_create.model_version)
+    source = await resolve_source(db, current_user, scoring_create, check_target=False)
+    return (await create_trainings(db, current_user, [TrainingJob(scoring_create.parameters, source, model_version)], TrainingJobTypeEnum.scoring))[0]
+
+@router.post("/score/upload", response_model=TrainingOut)
+async def upload_scoring(file: UploadFile = File(...), model_version: int = Form(...), parameters: str = Form("{}"), current_user: User = Depends(get_current_active_user), db: AsyncSession = Depends(get_db)):
+    parameters = parse_parameters(parameters)
+    admit_training(current_user.id)
+    model_version = await resolve_base_version(db, current_user, model_version)
+    spool = await spool_file(file)
+    source = await csv_source(db, current_user, spool, parameters, check_target=False)
+    return (await create_trainings(db, current_user, [TrainingJob(parameters, source, model_version)], TrainingJobTypeEnum.scoring))[0]
+
+async def resolve_source(db: AsyncSession, current_user: User, training_create: TrainingCreate, check_target: bool = True) -> Dict[str, Any]:
+    parameters = training_create.parameters
+    # Spool CSV bytes to disk if provided; parsing happens in the training worker
     csv_bytes = training_create.csv_file
-    data = None
+    if training_create.dataset_id:
+        return await stored_dataset_source(db, current_user, training_create.dataset_id, parameters, check_target)
     if csv_bytes:
         try:
-            csv_stream = io.BytesIO(csv_bytes)
-            data = pd.read_csv(csv_stream)
-        except Exception:
-            raise HTTPException(status_code=400, detail="Invalid CSV file")
-    else:
-        # Manual parameters must include at least 'data' key for training
-        if "data" not in training_create.parameters:
-            raise HTTPException(status_code=400, detail="No CSV file or manual data provided")
+            spool = await asyncio.to_thread(spool_bytes, csv_bytes)
+        except DatasetTooLargeError as e:
+            raise HTTPException(status_code=413, detail=str(e))
+        return await csv_source(db, current_user, spool, parameters, check_target)
+    # Manual parameters must include at least 'data' key for training
+    if "data" not in parameters:
+        raise HTTPException(status_code=400, detail="No CSV file or manual data provided")
+    data_dict = parameters.pop("data")
+    if not isinstance(data_dict, (dict, list)):
+        raise HTTPException(status_code=400, detail="Invalid manual data format")
+    return {"records": data_dict}
+
+@router.post("/upload", response_model=TrainingOut)
+async def upload_training(file: UploadFile = File(...), parameters: str = Form("{}"), base_version: Optional[int] = Form(None), current_user: User = Depends(get_current_active_user), db: AsyncSession = Depends(get_db)):
+    parameters = parse_parameters(parameters)
+    # Reject before streaming the file when the job could not be queued anyway
+    admit_training(current_user.id)
+    base_version = await resolve_base_version(db, current_user, base_version)
+    spool = await spool_file(file)
+    source = await csv_source(db, current_user, spool, parameters)
+    return (await create_trainings(db, current_user, [TrainingJob(parameters, source, base_version)]))[0]
+
+def parse_parameters(parameters: str) -> Dict[str, Any]:
+    try:
+        parameters = json.loads(parameters)
+    except ValueError:
+        parameters = None
+    if not isinstance(parameters, dict):
+        raise HTTPException(status_code=400, detail="Invalid parameters JSON")
+    return parameters
+
+async def spool_file(file: UploadFile) -> SpooledCSV:
+    try:
+        return await spool_upload(file)
+    except DatasetTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    finally:
+        await file.close()
+
+async def csv_source(db: AsyncSession, current_user: User, spool: SpooledCSV, parameters: Dict[str, Any], check_target: bool = True) -> Dict[str, Any]:
+    target = parameters.get("target_column")
+    if check_target and (not target or target not in spool.columns):
+        spool.discard()
+        raise HTTPException(status_code=400, detail="Target column not found in data")
+    # Datasets are content-addressed: identical bytes are stored (and parsed) once
+    dataset = await db.get(Dataset, spool.sha256)
+    if dataset is None:
+        db.add(Dataset(id=spool.sha256, user_id=current_user.id, size_bytes=spool.size))
         try:
-            data_dict = training_create.parameters.pop("data")
-            data = pd.DataFrame(data_dict)
-        except Exception:
-            raise HTTPException(status_code=400, detail="Invalid manual data format")
-
-    # Create training record with status pending
-    latest_version = 0
-    res = await db.execute(select(Training.model_version).order_by(Training.model_version.desc()))
-    latest = res.scalars().first()
-    if latest is not None:
-        latest_version = latest
-    new_version = latest_version + 1
-    new_training = Training(
-        user_id=current_user.id,
-        model_version=new_version,
-        status=TrainingStatusEnum.pending,
-        parameters=training_create.parameters,
-        results=None,
-        model_path=None,
-    )
-    db.add(new_training)
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+    if dataset_exists(spool.sha256):
+        spool.discard()
+        return {"dataset_id": spool.sha256}
+    return {"dataset_id": spool.sha256, "csv_path": spool.path, "dtypes": parameters.get("dtypes"), "spooled": True}
+
+async def stored_dataset_source(db: AsyncSession, current_user: User, dataset_id: str, parameters: Dict[str, Any], check_target: bool = True) -> Dict[str, Any]:
+    dataset = await db.get(Dataset, dataset_id)
+    if dataset is not None and dataset.user_id != current_user.id:
+        used = await db.execute(select(Training.id).filter(Training.user_id == current_user.id, Training.dataset_id == dataset_id).limit(1))
+        if used.scalar() is None:
+            dataset = None
+    if dataset is None or not dataset_exists(dataset_id):
+        raise HTTPException(status_code=404, detail="Dataset not found")
+    if check_target and dataset.columns is not None and parameters.get("target_column") not in dataset.columns:
+        raise HTTPException(status_code=400, detail="Target column not found in data")
+    return {"dataset_id": dataset_id}
+
+async def record_dataset_meta(db: AsyncSession, dataset_id: str):
+    dataset = await db.get(Dataset, dataset_id)
+    if dataset is None or dataset.rows is not None or not dataset_exists(dataset_id):
+        return
+    meta = await asyncio.to_thread(read_dataset_meta, dataset_id)
+    dataset.rows = meta["rows"]
+    dataset.columns = [column["name"] for column in meta["columns"]]
     await db.commit()
-    await db.refresh(new_training)
 
-    # start background training task
-    asyncio.create_task(run_training(new_training.id, training_create.parameters, data, db))
+async def resolve_base_version(db: AsyncSession, current_user: User, base_version: Optional[int]) -> Optional[int]:
+    # Warm starts and scoring jobs use another completed model the user can see
+    if base_version is None:
+        return None
+    result = await db.execute(select(Training.user_id, Training.status, Training.job_type).filter(Training.model_version == base_version))
+    base = result.first()
+    if base is None or base.job_type == TrainingJobTypeEnum.scoring or (base.user_id != current_user.id and not current_user.is_admin):
+        raise HTTPException(status_code=404, detail="Model not found")
+    if base.status != TrainingStatusEnum.completed:
+        raise HTTPException(status_code=409, detail=f"Model is {base.status.value}, not completed")
+    return base_version
 
-    return new_training
+async def create_trainings(db: AsyncSession, current_user: User, jobs: List[TrainingJob], job_type: TrainingJobTypeEnum = TrainingJobTypeEnum.training) -> List[Training]:
+    # With the durable queue the rows themselves are the queue: workers pick them up
+    # together with their source
+    durable = settings.TRAINING_QUEUE == "database"
+    try:
+        if durable:
+            admit_training(current_user.id, len(jobs))
+            await admit_queued(db, current_user.id, len(jobs))
+        else:
+            # Room for the whole batch is held from here until each job is submitted
+            reserve_training(current_user.id, len(jobs))
+    except HTTPException:
+        for job in jobs:
+            discard_source(job.source)
+        raise
 
-async def run_training(training_id: int, parameters: Dict[str, Any], data: pd.DataFrame, db: AsyncSession):
-    # update status to running
-    training = await db.get(Training, training_id)
-    training.status = TrainingStatusEnum.running
-    await db.commit()
-    training_progress[training_id] = 0  # 0% progress
+    unsubmitted = 0 if durable else len(jobs)
+    try:
+        # Create all training records with status pending in one transaction
+        versions = await allocate_model_versions(db, len(jobs))
+        new_trainings = [
+            Training(
+                user_id=current_user.id,
+                model_version=version,
+                status=TrainingStatusEnum.pending,
+                job_type=job_type,
+                parameters=job.parameters,
+                results=None,
+                model_path=None,
+                dataset_id=job.source.get("dataset_id"),
+                base_version=job.base_version,
+                source=job.source if durable else None,
+            )
+            for version, job in zip(versions, jobs)
+        ]
+        db.add_all(new_trainings)
+        await record_trainings_created(db, current_user.id, len(new_trainings))
+        await db.commit()
+        for training in new_trainings:
+            audit_log.log(current_user.id, f"{job_type.value}.submit", f"training_id={training.id} model_version={training.model_version}")
+
+        if durable:
+            return new_trainings
+        # hand the jobs over to the training executor
+        for index, (training, job) in enumerate(zip(new_trainings, jobs)):
+            unsubmitted -= 1
+            try:
+                await submit_training(db, training, job.source, functools.partial(run_training, parameters=job.parameters, source=job.source), reserved=True)
+            except HTTPException as e:
+                # Only when the executor is shutting down: the rest of the batch fails too
+                for training, job in zip(new_trainings[index + 1:], jobs[index + 1:]):
+                    await fail_unsubmitted(db, training, job.source, e.detail)
+                await db.commit()
+                raise
+    finally:
+        if unsubmitted:
+            training_executor.release(current_user.id, unsubmitted)
+
+    return new_trainings
+
+def admission_error(e: Exception) -> HTTPException:
+    code = status.HTTP_429_TOO_MANY_REQUESTS if isinstance(e, UserLimitError) else status.HTTP_503_SERVICE_UNAVAILABLE
+    return HTTPException(status_code=code, detail=str(e), headers={"Retry-After": "5"})
+
+def admit_training(user_id: int, count: int = 1):
+    try:
+        training_executor.check_admission(user_id, count)
+    except (UserLimitError, ExecutorFullError) as e:
+        raise admission_error(e)
 
+async def admit_queued(db: AsyncSession, user_id: int, count: int):
     try:
-        # Simulate progress updates
-        for i in range(1, 6):
-            await asyncio.sleep(1)
-            training_progress[training_id] = i * 20  # 20%,40%,60%,80%,100%
+        await check_queue_admission(db, user_id, count)
+    except (UserLimitError, ExecutorFullError) as e:
+        raise admission_error(e)
 
-        # Train the model
-        model, metrics = train_model(parameters, data)
+def reserve_training(user_id: int, count: int):
+    try:
+        training_executor.reserve(user_id, count)
+    except (UserLimitError, ExecutorFullError) as e:
+        raise admission_error(e)
 
-        # Save model
-        model_path = save_model(model, training.model_version)
+async def fail_unsubmitted(db: AsyncSession, training: Training, source: Dict[str, Any], error: str):
+    discard_source(source)
+    await set_training_status(db, training, TrainingStatusEnum.failed)
+    training.results = {"error": error}
 
-        # Update training record
-        training = await db.get(Training, training_id)
-        training.status = TrainingStatusEnum.completed
-        training.results = metrics
-        training.model_path = model_path
+async def submit_training(db: AsyncSession, training: Training, source: Dict[str, Any], runner, reserved: bool = False):
+    try:
+        training_executor.submit(training.id, training.user_id, runner, on_drop=functools.partial(discard_source, source), reserved=reserved)
+    except (UserLimitError, ExecutorFullError) as e:
+        await fail_unsubmitted(db, training, source, str(e))
         await db.commit()
-    except Exception as e:
+        raise admission_error(e)
+
+TERMINAL_STATUSES = (TrainingStatusEnum.completed, TrainingStatusEnum.failed, TrainingStatusEnum.cancelled)
+TERMINAL_STATUS_VALUES = {s.value for s in TERMINAL_STATUSES}
+ACTIVE_STATUSES = (TrainingStatusEnum.pending, TrainingStatusEnum.running)
+
+TRAINING_STAGE_SECONDS = Histogram("training_stage_duration_seconds", "Time spent in each training stage (load/ingest: parsing, fit, metrics, save: save_model, ...).", ("job_type", "stage"), TRAINING_BUCKETS)
+TRAINING_SECONDS = Histogram("training_duration_seconds", "Training job run time by final status.", ("job_type", "status"), TRAINING_BUCKETS)
+DATASET_ROWS = Histogram("training_dataset_rows", "Rows in the datasets of completed trainings.", (), SIZE_BUCKETS)
+DATASET_COLUMNS = Histogram("training_dataset_columns", "Columns in the datasets of completed trainings.", (), COUNT_BUCKETS)
+
+async def observe_dataset_shape(source: Dict[str, Any]):
+    if "records" in source:
+        rows, columns = len(source["records"]), len(source["records"][0]) if source["records"] else 0
+    elif "dataset_id" in source and dataset_exists(source["dataset_id"]):
+        meta = await asyncio.to_thread(read_dataset_meta, source["dataset_id"])
+        rows, columns = meta["rows"], len(meta["columns"])
+    else:
+        return
+    DATASET_ROWS.observe(rows)
+    DATASET_COLUMNS.observe(columns)
+
+def progress_channel(training_id: int) -> str:
+    return f"training:{training_id}"
+
+async def publish_progress(training_id: int, training_status: TrainingStatusEnum, stage: str, progress: int):
+    message = {"training_id": training_id, "status": training_status.value, "stage": stage, "progress": progress}
+    await broadcast.publish(progress_channel(training_id), message, final=training_status in TERMINAL_STATUSES)
+
+# Referenced by name and imported in the worker process only, so that the API
+# process never loads the ML stack for them
+JOB_FUNCTIONS = {
+    TrainingJobTypeEnum.training: "backend.app.utils.model:fit_and_save",
+    TrainingJobTypeEnum.sweep: "backend.app.utils.sweep:sweep_and_save",
+    TrainingJobTypeEnum.scoring: "backend.app.utils.scoring:score_and_save",
+}
+INCREMENTAL_JOB_FUNCTION = "backend.app.utils.incremental:fit_incremental_and_save"
+
+def job_function(job_type: TrainingJobTypeEnum, parameters: Dict[str, Any]) -> str:
+    if job_type == TrainingJobTypeEnum.training and parameters.get("mode") == "incremental":
+        return INCREMENTAL_JOB_FUNCTION
+    return JOB_FUNCTIONS[job_type]
+
+async def run_training(handle: JobHandle, parameters: Dict[str, Any], source: Dict[str, Any], lease_owner: Optional[str] = None):
+    # `lease_owner` is the durable queue worker that claimed the job. Every status
+    # write is conditional, so that a job cancelled meanwhile, or requeued after its
+    # lease expired, is not overwritten by this run's outcome, which is then dropped.
+    training_id = handle.job_id
+    async with async_session_local() as db:
+        # update status to running
         training = await db.get(Training, training_id)
-        training.status = TrainingStatusEnum.failed
-        training.results = {"error": str(e)}
+        started_running = await transition_training(db, training, TrainingStatusEnum.running, ACTIVE_STATUSES, lease_owner)
         await db.commit()
-    finally:
-        training_progress.pop(training_id, None)
+        if not started_running:
+            if training.status in TERMINAL_STATUSES:
+                discard_source(source)
+            return
+        await publish_progress(training_id, TrainingStatusEnum.running, "starting", 0)
+
+        job_type = training.job_type.value
+        started = stage_started = time.perf_counter()
+        current_stage = None
+
+        async def on_progress(stage: str, progress: int):
+            # Stage timings are taken from when the worker reports each stage
+            nonlocal current_stage, stage_started
+            if stage != current_stage:
+                now = time.perf_counter()
+                if current_stage is not None:
+                    TRAINING_STAGE_SECONDS.observe(now - stage_started, job_type, current_stage)
+                current_stage, stage_started = stage, now
+            await publish_progress(training_id, TrainingStatusEnum.running, stage, progress)
+
+        recorded = False
+        try:
+            # Train and save the model in a worker process
+            job = job_function(training.job_type, parameters)
+            base = {"base_version": training.base_version} if training.base_version is not None else {}
+            model_path, metrics = await handle.run(job, parameters, source, training.model_version, on_progress=on_progress, **base)
+
+            # Update training record
+            recorded = await transition_training(db, training, TrainingStatusEnum.completed, (TrainingStatusEnum.running,), lease_owner, results=metrics, model_path=model_path)
+            await db.commit()
+        except JobCancelledError:
+            recorded = await transition_training(db, training, TrainingStatusEnum.cancelled, (TrainingStatusEnum.running,), lease_owner)
+            await db.commit()
+        except Exception as e:
+            recorded = await transition_training(db, training, TrainingStatusEnum.failed, (TrainingStatusEnum.running,), lease_owner, results={"error": str(e)})
+            await db.commit()
+        finally:
+            # An interrupted job keeps its spooled upload for the worker that retries it
+            if training.status in TERMINAL_STATUSES:
+                discard_source(source)
+            now = time.perf_counter()
+            if current_stage is not None:
+                TRAINING_STAGE_SECONDS.observe(now - stage_started, job_type, current_stage)
+            TRAINING_SECONDS.observe(now - started, job_type, training.status.value)
+        if "dataset_id" in source:
+            await record_dataset_meta(db, source["dataset_id"])
+        if recorded:
+            if training.status == TrainingStatusEnum.completed:
+                await observe_dataset_shape(source)
+            await publish_progress(training_id, training.status, "done", 100)
 
 @router.websocket("/progress")
 async def websocket_training_progress(websocket: WebSocket, training_id: int = Query(...)):
     await websocket.accept()
+    channel = progress_channel(training_id)
     try:
-        while True:
-            progress = training_progress.get(training_id, None)
-            if progress is None:
-                await websocket.send_json({"progress": 100})
+        snapshot = await broadcast.latest(channel)
+        if snapshot is None:
+            # Nothing published yet (queued job) or anymore (long finished job)
+            async with async_session_local() as db:
+                training = await db.get(Training, training_id)
+            if training is None or training.status in TERMINAL_STATUSES:
+                final_status = training.status.value if training is not None else None
+                await websocket.send_json({"training_id": training_id, "status": final_status, "stage": "done", "progress": 100})
+                return
+            await websocket.send_json({"training_id": training_id, "status": training.status.value, "stage": "queued", "progress": 0})
+        elif snapshot["status"] in TERMINAL_STATUS_VALUES:
+            await websocket.send_json(snapshot)
+            return
+        async for message in broadcast.subscribe(channel):
+            await websocket.send_json(message)
+            if message["status"] in TERMINAL_STATUS_VALUES:
                 break
-            await websocket.send_json({"progress": progress})
-            await asyncio.sleep(1)
     except WebSocketDisconnect:
         pass
 
 @router.get("/{training_id}", response_model=TrainingOut)
-async def get_training(training_id: int, current_user: User = Depends(get_current_active_user), db: AsyncSession = Depends(get_db)):
+async def get_training(training_id: int, request: Request, current_user: User = Depends(get_current_active_user), db: AsyncSession = Depends(get_db)):
     training = await db.get(Training, training_id)
     if training is None or training.user_id != current_user.id:
         raise HTTPException(status_code=404, detail="Training not found")
+    etag = make_etag(training.id, training.updated_at)
+    return conditional_json(request, lambda: row_dicts([training], TrainingOut.__fields__)[0], etag, training.updated_at)
+
+@router.get("/{training_id}/scores")
+async def download_scores(training_id: int, range_header: Optional[str] = Header(None, alias="Range"), current_user: User = Depends(get_current_active_user), db: AsyncSession = Depends(get_db)):
+    training = await db.get(Training, training_id)
+    if training is None or training.user_id != current_user.id or training.job_type != TrainingJobTypeEnum.scoring:
+        raise HTTPException(status_code=404, detail="Scoring job not found")
+    if training.status != TrainingStatusEnum.completed or not training.model_path or not os.path.exists(training.model_path):
+        raise HTTPException(status_code=409, detail=f"Scores are not available, the job is {training.status.value}")
+    return file_response(training.model_path, range_header, f"scores_{training.id}.csv", "text/csv")
+
+@router.post("/{training_id}/cancel", response_model=TrainingOut)
+async def cancel_training(training_id: int, current_user: User = Depends(get_current_active_user), db: AsyncSession = Depends(get_db)):
+    training = await db.get(Training, training_id)
+    if training is None or training.user_id != current_user.id:
+        raise HTTPException(status_code=404, detail="Training not found")
+    if training.status not in ACTIVE_STATUSES:
+        raise HTTPException(status_code=409, detail=f"Training is already {training.status.value}")
+    # In-process jobs are stopped right away. With TRAINING_QUEUE=database the job
+    # runs in a worker, which stops it at its next lease heartbeat (within
+    # TRAINING_LEASE_SECONDS / 3); it can no longer record a result either way, since
+    # its final write only applies to a row that is still running.
+    training_executor.cancel(training_id)
+    if await transition_training(db, training, TrainingStatusEnum.cancelled, ACTIVE_STATUSES):
+        await db.commit()
+        await publish_progress(training_id, TrainingStatusEnum.cancelled, "done", 100)
+    audit_log.log(current_user.id, "training.cancel", f"training_id={training_id}")
     return training
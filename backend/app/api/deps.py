@@ -1,9 +1,9 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 from backend.app.db.database import get_db
 from backend.app.models.user import User
+from backend.app.utils.auth_cache import auth_cache
 from backend.app.utils.security import decode_access_token
 from backend.app.core.config import settings
 from backend.app.db.database import async_session_local
@@ -16,18 +16,25 @@ async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
+    payload = auth_cache.get_payload(token)
+    if payload is None:
         payload = decode_access_token(token)
-        email: str = payload.get("sub")
-        if email is None:
+        if payload.get("sub") is None:
             raise credentials_exception
-        is_admin = payload.get("is_admin", False)
-    except JWTError:
-        raise credentials_exception
-    from sqlalchemy.future import select
-    result = await db.execute(select(User).filter(User.email == email))
-    user = result.scalars().first()
-    if user is None:
+        auth_cache.set_payload(token, payload)
+    email: str = payload["sub"]
+    token_version = payload.get("ver", 0)
+    user = auth_cache.get_user(email)
+    if user is None or user.token_version < token_version:
+        # Missing, or cached before the user signed in with a newer token
+        from sqlalchemy.future import select
+        result = await db.execute(select(User).filter(User.email == email))
+        user = result.scalars().first()
+        if user is None:
+            raise credentials_exception
+        auth_cache.set_user(user)
+    if user.token_version != token_version:
+        # Issued before an admin changed the account
         raise credentials_exception
     return user
 
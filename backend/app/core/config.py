@@ -1,5 +1,5 @@
 from pydantic import BaseSettings, Field, validator
-from typing import List
+from typing import List, Optional
 import os
 
 class Settings(BaseSettings):
@@ -9,6 +9,130 @@ class Settings(BaseSettings):
     DATABASE_URL: str = Field(..., env="DATABASE_URL")
     ADMIN_EMAILS: List[str] = Field(default_factory=list, env="ADMIN_EMAILS")
 
+    TRAINING_MAX_WORKERS: int = Field(default_factory=lambda: os.cpu_count() or 1, env="TRAINING_MAX_WORKERS")
+    TRAINING_MAX_PENDING: int = Field(100, env="TRAINING_MAX_PENDING")
+    TRAINING_MAX_JOBS_PER_USER: int = Field(2, env="TRAINING_MAX_JOBS_PER_USER")
+    TRAINING_USER_LIMIT_POLICY: str = Field("queue", env="TRAINING_USER_LIMIT_POLICY")
+    TRAINING_START_METHOD: str = Field("spawn", env="TRAINING_START_METHOD")
+    TRAINING_BATCH_MAX_JOBS: int = Field(100, env="TRAINING_BATCH_MAX_JOBS")
+    TRAINING_QUEUE: str = Field("memory", env="TRAINING_QUEUE")
+    TRAINING_LEASE_SECONDS: float = Field(60.0, env="TRAINING_LEASE_SECONDS")
+    TRAINING_QUEUE_POLL_INTERVAL: float = Field(1.0, env="TRAINING_QUEUE_POLL_INTERVAL")
+    TRAINING_QUEUE_MAX_ATTEMPTS: int = Field(3, env="TRAINING_QUEUE_MAX_ATTEMPTS")
+    TRAINING_WORKER_DRAIN_SECONDS: float = Field(30.0, env="TRAINING_WORKER_DRAIN_SECONDS")
+    SWEEP_MAX_WORKERS: int = Field(default_factory=lambda: os.cpu_count() or 1, env="SWEEP_MAX_WORKERS")
+    SWEEP_MAX_CANDIDATES: int = Field(200, env="SWEEP_MAX_CANDIDATES")
+
+    PROGRESS_BACKEND: str = Field("memory", env="PROGRESS_BACKEND")
+    PROGRESS_REDIS_URL: str = Field("redis://localhost:6379/0", env="PROGRESS_REDIS_URL")
+    PROGRESS_POLL_INTERVAL: float = Field(0.5, env="PROGRESS_POLL_INTERVAL")
+    PROGRESS_RETAIN_SECONDS: int = Field(300, env="PROGRESS_RETAIN_SECONDS")
+
+    UPLOAD_DIR: str = Field(os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../uploads"), env="UPLOAD_DIR")
+    UPLOAD_MAX_BYTES: int = Field(512 * 1024 * 1024, env="UPLOAD_MAX_BYTES")
+    UPLOAD_MAX_ROWS: int = Field(10_000_000, env="UPLOAD_MAX_ROWS")
+    UPLOAD_CHUNK_BYTES: int = Field(1024 * 1024, env="UPLOAD_CHUNK_BYTES")
+    CSV_CHUNK_ROWS: int = Field(100_000, env="CSV_CHUNK_ROWS")
+    DATASET_DIR: str = Field(os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../datasets"), env="DATASET_DIR")
+
+    MODEL_CACHE_SIZE: int = Field(16, env="MODEL_CACHE_SIZE")
+    MODEL_CACHE_WARMUP: int = Field(0, env="MODEL_CACHE_WARMUP")
+    PREDICT_BATCH_MAX_SIZE: int = Field(64, env="PREDICT_BATCH_MAX_SIZE")
+    PREDICT_BATCH_MAX_WAIT_MS: float = Field(2.0, env="PREDICT_BATCH_MAX_WAIT_MS")
+    AUTH_CACHE_SIZE: int = Field(10000, env="AUTH_CACHE_SIZE")
+    AUTH_CACHE_TTL_SECONDS: float = Field(30.0, env="AUTH_CACHE_TTL_SECONDS")
+    # Unset: cache users only with a PROGRESS_BACKEND shared between processes
+    AUTH_CACHE_USERS: Optional[bool] = Field(None, env="AUTH_CACHE_USERS")
+    BCRYPT_ROUNDS: int = Field(12, env="BCRYPT_ROUNDS")
+    PASSWORD_HASH_WORKERS: int = Field(default_factory=lambda: min(4, os.cpu_count() or 1), env="PASSWORD_HASH_WORKERS")
+    PASSWORD_HASH_MAX_PENDING: int = Field(64, env="PASSWORD_HASH_MAX_PENDING")
+    AUDIT_LOG_BATCH_SIZE: int = Field(500, env="AUDIT_LOG_BATCH_SIZE")
+    AUDIT_LOG_FLUSH_INTERVAL: float = Field(1.0, env="AUDIT_LOG_FLUSH_INTERVAL")
+    AUDIT_LOG_MAX_QUEUE: int = Field(50000, env="AUDIT_LOG_MAX_QUEUE")
+    AUDIT_LOG_RETENTION_DAYS: int = Field(90, env="AUDIT_LOG_RETENTION_DAYS")
+    AUDIT_LOG_RETENTION_INTERVAL: float = Field(3600.0, env="AUDIT_LOG_RETENTION_INTERVAL")
+    AUDIT_LOG_DELETE_BATCH: int = Field(5000, env="AUDIT_LOG_DELETE_BATCH")
+    DB_POOL_SIZE: int = Field(10, env="DB_POOL_SIZE")
+    DB_MAX_OVERFLOW: int = Field(20, env="DB_MAX_OVERFLOW")
+    DB_POOL_TIMEOUT: float = Field(30.0, env="DB_POOL_TIMEOUT")
+    DB_POOL_RECYCLE: int = Field(1800, env="DB_POOL_RECYCLE")
+    DB_POOL_PRE_PING: bool = Field(True, env="DB_POOL_PRE_PING")
+    DB_SLOW_QUERY_MS: float = Field(200.0, env="DB_SLOW_QUERY_MS")
+    SQLITE_JOURNAL_MODE: str = Field("WAL", env="SQLITE_JOURNAL_MODE")
+    SQLITE_SYNCHRONOUS: str = Field("NORMAL", env="SQLITE_SYNCHRONOUS")
+    SQLITE_BUSY_TIMEOUT_MS: int = Field(5000, env="SQLITE_BUSY_TIMEOUT_MS")
+    SQLITE_CACHE_SIZE_KB: int = Field(65536, env="SQLITE_CACHE_SIZE_KB")
+    PREPROCESS_HASH_THRESHOLD: int = Field(1000, env="PREPROCESS_HASH_THRESHOLD")
+    PREPROCESS_HASH_FEATURES: int = Field(2 ** 20, env="PREPROCESS_HASH_FEATURES")
+    INCREMENTAL_CHUNK_ROWS: int = Field(100_000, env="INCREMENTAL_CHUNK_ROWS")
+    INCREMENTAL_EPOCHS: int = Field(5, env="INCREMENTAL_EPOCHS")
+    SCORING_OUTPUT_DIR: str = Field(os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../scores"), env="SCORING_OUTPUT_DIR")
+    SCORING_CHUNK_ROWS: int = Field(100_000, env="SCORING_CHUNK_ROWS")
+    SCORING_MAX_WORKERS: int = Field(default_factory=lambda: os.cpu_count() or 1, env="SCORING_MAX_WORKERS")
+    DOWNLOAD_CHUNK_BYTES: int = Field(1024 * 1024, env="DOWNLOAD_CHUNK_BYTES")
+    COMPRESSION_MINIMUM_SIZE: int = Field(1024, env="COMPRESSION_MINIMUM_SIZE")
+    COMPRESSION_GZIP_LEVEL: int = Field(6, env="COMPRESSION_GZIP_LEVEL")
+    COMPRESSION_BROTLI_QUALITY: int = Field(4, env="COMPRESSION_BROTLI_QUALITY")
+    MODEL_STORE: str = Field("local", env="MODEL_STORE")
+    MODEL_DIR: str = Field(os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../models"), env="MODEL_DIR")
+    MODEL_COMPRESSION: str = Field("", env="MODEL_COMPRESSION")
+    MODEL_MMAP_MODE: str = Field("r", env="MODEL_MMAP_MODE")
+    MODEL_VERIFY_CHECKSUM: bool = Field(True, env="MODEL_VERIFY_CHECKSUM")
+    MODEL_S3_BUCKET: str = Field("models", env="MODEL_S3_BUCKET")
+    MODEL_S3_PREFIX: str = Field("", env="MODEL_S3_PREFIX")
+    MODEL_S3_ENDPOINT_URL: str = Field("", env="MODEL_S3_ENDPOINT_URL")
+    MODEL_STORE_CACHE_DIR: str = Field(os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../models_cache"), env="MODEL_STORE_CACHE_DIR")
+    MODEL_DISK_QUOTA_BYTES: int = Field(0, env="MODEL_DISK_QUOTA_BYTES")
+    MODEL_KEEP_LATEST: int = Field(5, env="MODEL_KEEP_LATEST")
+    MODEL_GC_INTERVAL: float = Field(3600.0, env="MODEL_GC_INTERVAL")
+    MODEL_GC_GRACE_SECONDS: float = Field(3600.0, env="MODEL_GC_GRACE_SECONDS")
+
+    @validator("SQLITE_JOURNAL_MODE", "SQLITE_SYNCHRONOUS")
+    def check_sqlite_pragma(cls, v, field):
+        allowed = {
+            "SQLITE_JOURNAL_MODE": ("DELETE", "TRUNCATE", "PERSIST", "MEMORY", "WAL", "OFF"),
+            "SQLITE_SYNCHRONOUS": ("OFF", "NORMAL", "FULL", "EXTRA"),
+        }[field.name]
+        if v.upper() not in allowed:
+            raise ValueError(f"{field.name} must be one of {', '.join(allowed)}")
+        return v.upper()
+
+    @validator("BCRYPT_ROUNDS")
+    def check_bcrypt_rounds(cls, v):
+        if not 4 <= v <= 31:
+            raise ValueError("BCRYPT_ROUNDS must be between 4 and 31")
+        return v
+
+    @validator("TRAINING_USER_LIMIT_POLICY")
+    def check_user_limit_policy(cls, v):
+        if v not in ("queue", "reject"):
+            raise ValueError("TRAINING_USER_LIMIT_POLICY must be 'queue' or 'reject'")
+        return v
+
+    @validator("TRAINING_QUEUE")
+    def check_training_queue(cls, v):
+        if v not in ("memory", "database"):
+            raise ValueError("TRAINING_QUEUE must be 'memory' or 'database'")
+        return v
+
+    @validator("MODEL_STORE")
+    def check_model_store(cls, v):
+        if v not in ("local", "s3"):
+            raise ValueError("MODEL_STORE must be 'local' or 's3'")
+        return v
+
+    @validator("MODEL_MMAP_MODE")
+    def check_model_mmap_mode(cls, v):
+        if v not in ("", "r", "r+", "c"):
+            raise ValueError("MODEL_MMAP_MODE must be 'r', 'r+', 'c' or empty")
+        return v
+
+    @validator("PROGRESS_BACKEND")
+    def check_progress_backend(cls, v):
+        if v not in ("memory", "database", "redis"):
+            raise ValueError("PROGRESS_BACKEND must be 'memory', 'database' or 'redis'")
+        return v
+
     @validator("ADMIN_EMAILS", pre=True)
     def split_admin_emails(cls, v):
         if isinstance(v, str):
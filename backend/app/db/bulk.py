@@ -0,0 +1,108 @@
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import and_, delete, or_, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.expression import ColumnElement
+
+from backend.app.db.database import async_session_local
+from backend.app.db.stats import recompute_user_stats
+from backend.app.models.log import Log
+from backend.app.models.training import Training, TrainingStatusEnum
+from backend.app.models.user import User
+
+# Set-based admin operations: one UPDATE/DELETE per request instead of loading and
+# flushing ORM objects. Rows that depend on a user (trainings, logs, stats) go with
+# it through the foreign keys' ON DELETE CASCADE.
+
+ACTIVE_STATUSES = (TrainingStatusEnum.pending, TrainingStatusEnum.running)
+# Enough to delete the artifact or score file of a training
+TRAINING_FILE_COLUMNS = (Training.id, Training.job_type, Training.model_version, Training.model_path)
+
+
+async def update_users(db: AsyncSession, user_ids: List[int], values: Dict[str, Any]) -> List[Row]:
+    # Only rows that actually change, which also get their tokens revoked
+    changed = or_(*[getattr(User, name) != value for name, value in values.items()])
+    result = await db.execute(
+        update(User)
+        .where(User.id.in_(user_ids), changed)
+        .values(**values, token_version=User.token_version + 1)
+        .returning(User.id, User.email)
+        .execution_options(synchronize_session=False)
+    )
+    return result.all()
+
+
+async def users_with_active_trainings(db: AsyncSession, user_ids: List[int]) -> List[int]:
+    # Their jobs would still try to record a result for the deleted rows
+    result = await db.execute(
+        select(Training.user_id).filter(Training.user_id.in_(user_ids), Training.status.in_(ACTIVE_STATUSES)).distinct()
+    )
+    return result.scalars().all()
+
+
+async def delete_users(db: AsyncSession, user_ids: List[int]) -> Tuple[List[Row], List[Row]]:
+    # Returns the deleted users and their trainings' files, read before the cascade
+    files = (await db.execute(select(*TRAINING_FILE_COLUMNS).filter(Training.user_id.in_(user_ids)))).all()
+    result = await db.execute(
+        delete(User)
+        .where(User.id.in_(user_ids))
+        .returning(User.id, User.email)
+        .execution_options(synchronize_session=False)
+    )
+    return result.all(), files
+
+
+def training_conditions(user_ids: Optional[List[int]], statuses: List[TrainingStatusEnum], job_type: Optional[str], created_after: Optional[datetime], created_before: Optional[datetime]) -> List[ColumnElement]:
+    conditions = [Training.status.in_(statuses)]
+    if user_ids:
+        conditions.append(Training.user_id.in_(user_ids))
+    if job_type:
+        conditions.append(Training.job_type == job_type)
+    if created_after is not None:
+        conditions.append(Training.created_at >= created_after)
+    if created_before is not None:
+        conditions.append(Training.created_at < created_before)
+    return conditions
+
+
+async def purge_trainings(db: AsyncSession, conditions: List[ColumnElement]) -> List[Row]:
+    # Returns the deleted trainings' files; the owners' stats are recomputed from
+    # what is left
+    result = await db.execute(
+        delete(Training)
+        .where(and_(*conditions))
+        .returning(Training.user_id, *TRAINING_FILE_COLUMNS)
+        .execution_options(synchronize_session=False)
+    )
+    deleted = result.all()
+    for user_id in {row.user_id for row in deleted}:
+        await recompute_user_stats(db, user_id)
+    return deleted
+
+
+def log_conditions(user_ids: Optional[List[int]], actions: Optional[List[str]], before: Optional[datetime], after: Optional[datetime]) -> List[ColumnElement]:
+    conditions = []
+    if user_ids:
+        conditions.append(Log.user_id.in_(user_ids))
+    if actions:
+        conditions.append(Log.action.in_(actions))
+    if after is not None:
+        conditions.append(Log.timestamp >= after)
+    if before is not None:
+        conditions.append(Log.timestamp < before)
+    return conditions
+
+
+async def purge_logs(conditions: List[ColumnElement], batch_size: int) -> int:
+    # In bounded batches, each in its own transaction, like the audit log retention
+    deleted = 0
+    while True:
+        async with async_session_local() as db:
+            matching = select(Log.id).filter(*conditions).order_by(Log.timestamp, Log.id).limit(batch_size)
+            result = await db.execute(delete(Log).where(Log.id.in_(matching)).execution_options(synchronize_session=False))
+            await db.commit()
+        deleted += result.rowcount
+        if result.rowcount < batch_size:
+            return deleted
@@ -0,0 +1,133 @@
+from datetime import datetime, timedelta
+from typing import List, Set
+
+from sqlalchemy import and_, func, select, update
+from sqlalchemy.engine import Row
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.app.core.config import settings
+from backend.app.db.stats import apply_stats_delta
+from backend.app.models.training import Training, TrainingStatusEnum
+from backend.app.utils.executor import ExecutorFullError, UserLimitError
+
+# Durable job queue on the trainings table (TRAINING_QUEUE=database). The API only
+# inserts pending rows that carry their data source; worker processes
+# (backend/worker.py) claim them with a lease, renew it while the job runs, and
+# rows whose lease expired (worker crashed or was killed) go back to pending.
+
+
+def _lease_deadline() -> datetime:
+    return datetime.utcnow() + timedelta(seconds=settings.TRAINING_LEASE_SECONDS)
+
+
+async def check_queue_admission(db: AsyncSession, user_id: int, count: int = 1):
+    # The same limits the in-process executor applies, counted on the table
+    pending = (await db.execute(select(func.count(Training.id)).filter(Training.status == TrainingStatusEnum.pending))).scalar()
+    if pending + count > settings.TRAINING_MAX_PENDING:
+        raise ExecutorFullError("Training queue is full")
+    if settings.TRAINING_USER_LIMIT_POLICY == "reject":
+        active = (await db.execute(
+            select(func.count(Training.id))
+            .filter(Training.user_id == user_id, Training.status.in_((TrainingStatusEnum.pending, TrainingStatusEnum.running)))
+        )).scalar()
+        if active + count > settings.TRAINING_MAX_JOBS_PER_USER:
+            raise UserLimitError(f"At most {settings.TRAINING_MAX_JOBS_PER_USER} concurrent trainings per user")
+
+
+async def claim_jobs(db: AsyncSession, owner: str, count: int) -> List[Row]:
+    # Oldest pending jobs first, at most as many per user as that user still has room
+    # for next to their running jobs. On PostgreSQL concurrent workers skip each
+    # other's locked rows (FOR UPDATE SKIP LOCKED); SQLite ignores the locking clause
+    # but runs the whole UPDATE under its single write lock, which gives the same
+    # exclusivity.
+    running = (
+        select(Training.user_id, func.count(Training.id).label("running"))
+        .filter(Training.status == TrainingStatusEnum.running)
+        .group_by(Training.user_id)
+        .subquery()
+    )
+    pending = (
+        select(Training.id, Training.user_id)
+        .filter(Training.status == TrainingStatusEnum.pending, Training.source.isnot(None))
+        .with_for_update(skip_locked=True)
+        .subquery()
+    )
+    ranked = (
+        select(pending.c.id, pending.c.user_id, func.row_number().over(partition_by=pending.c.user_id, order_by=pending.c.id).label("rank"))
+        .subquery()
+    )
+    candidates = (
+        select(ranked.c.id)
+        .outerjoin(running, running.c.user_id == ranked.c.user_id)
+        .filter(ranked.c.rank + func.coalesce(running.c.running, 0) <= settings.TRAINING_MAX_JOBS_PER_USER)
+        .order_by(ranked.c.id)
+        .limit(count)
+    )
+    stmt = (
+        update(Training)
+        .where(Training.id.in_(candidates.scalar_subquery()), Training.status == TrainingStatusEnum.pending)
+        .values(status=TrainingStatusEnum.running, lease_owner=owner, lease_expires_at=_lease_deadline(), attempts=Training.attempts + 1)
+        .returning(Training.id, Training.user_id, Training.parameters, Training.source)
+        .execution_options(synchronize_session=False)
+    )
+    return (await db.execute(stmt)).all()
+
+
+async def renew_leases(db: AsyncSession, owner: str, job_ids: List[int]) -> Set[int]:
+    # Returns the ids whose lease is still held
+    if not job_ids:
+        return set()
+    result = await db.execute(
+        update(Training)
+        .where(Training.id.in_(job_ids), Training.lease_owner == owner, Training.status == TrainingStatusEnum.running)
+        .values(lease_expires_at=_lease_deadline())
+        .returning(Training.id)
+        .execution_options(synchronize_session=False)
+    )
+    return set(result.scalars().all())
+
+
+async def requeue_expired(db: AsyncSession) -> int:
+    # Jobs out of attempts fail instead of being retried forever (e.g. one that takes
+    # its worker down with it every time)
+    expired = and_(Training.status == TrainingStatusEnum.running, Training.lease_expires_at < datetime.utcnow())
+    failed = await db.execute(
+        update(Training)
+        .where(expired, Training.attempts >= settings.TRAINING_QUEUE_MAX_ATTEMPTS)
+        .values(status=TrainingStatusEnum.failed, lease_owner=None, lease_expires_at=None, results={"error": "Worker lost the job too many times"})
+        .returning(Training.user_id)
+        .execution_options(synchronize_session=False)
+    )
+    for user_id in failed.scalars().all():
+        await apply_stats_delta(db, user_id, failed=1)
+    requeued = await db.execute(
+        update(Training)
+        .where(expired)
+        .values(status=TrainingStatusEnum.pending, lease_owner=None, lease_expires_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    return requeued.rowcount
+
+
+async def release_leases(db: AsyncSession, owner: str) -> int:
+    # A worker shutting down hands its unfinished jobs straight back to the queue
+    result = await db.execute(
+        update(Training)
+        .where(Training.lease_owner == owner, Training.status == TrainingStatusEnum.running)
+        .values(status=TrainingStatusEnum.pending, lease_owner=None, lease_expires_at=None)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+async def unclaim_jobs(db: AsyncSession, owner: str, job_ids: List[int]) -> int:
+    # Claimed jobs this worker could not start go back without using up an attempt
+    if not job_ids:
+        return 0
+    result = await db.execute(
+        update(Training)
+        .where(Training.id.in_(job_ids), Training.lease_owner == owner, Training.status == TrainingStatusEnum.running)
+        .values(status=TrainingStatusEnum.pending, lease_owner=None, lease_expires_at=None, attempts=Training.attempts - 1)
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
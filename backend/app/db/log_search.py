@@ -0,0 +1,52 @@
+from sqlalchemy import literal_column, select, text
+
+# Indexed substring search on logs.action. SQLite keeps a trigram FTS5 index over
+# the column, maintained by triggers, whose LIKE is served from the index; PostgreSQL
+# uses a pg_trgm GIN index, which ILIKE '%...%' picks up directly.
+
+SQLITE_STATEMENTS = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS logs_fts USING fts5(action, content='logs', content_rowid='id', tokenize='trigram')",
+    "CREATE TRIGGER IF NOT EXISTS logs_fts_insert AFTER INSERT ON logs BEGIN "
+    "INSERT INTO logs_fts(rowid, action) VALUES (new.id, new.action); END",
+    "CREATE TRIGGER IF NOT EXISTS logs_fts_delete AFTER DELETE ON logs BEGIN "
+    "INSERT INTO logs_fts(logs_fts, rowid, action) VALUES ('delete', old.id, old.action); END",
+    "CREATE TRIGGER IF NOT EXISTS logs_fts_update AFTER UPDATE OF action ON logs BEGIN "
+    "INSERT INTO logs_fts(logs_fts, rowid, action) VALUES ('delete', old.id, old.action); "
+    "INSERT INTO logs_fts(rowid, action) VALUES (new.id, new.action); END",
+]
+
+POSTGRES_STATEMENTS = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS idx_logs_action_trgm ON logs USING gin (action gin_trgm_ops)",
+]
+
+
+def install_log_search(connection):
+    # Idempotent; runs after the logs table is created and again at startup so that
+    # databases created before the index existed get it too.
+    if connection.dialect.name == "sqlite":
+        exists = connection.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'logs_fts'")).first()
+        for statement in SQLITE_STATEMENTS:
+            connection.execute(text(statement))
+        if not exists:
+            connection.execute(text("INSERT INTO logs_fts(logs_fts) VALUES ('rebuild')"))
+    elif connection.dialect.name == "postgresql":
+        for statement in POSTGRES_STATEMENTS:
+            connection.execute(text(statement))
+
+
+def action_filter(dialect_name: str, log_table, search: str):
+    # An ESCAPE clause stops FTS5 from using the trigram index, so it is only added
+    # when the search text itself contains LIKE wildcards
+    escape = "\\" if any(c in search for c in "%_\\") else None
+    if escape:
+        search = search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    pattern = f"%{search}%"
+    if dialect_name == "sqlite":
+        matches = (
+            select(literal_column("logs_fts.rowid"))
+            .select_from(text("logs_fts"))
+            .where(literal_column("logs_fts.action").like(pattern, escape=escape))
+        )
+        return log_table.c.id.in_(matches)
+    return log_table.c.action.ilike(pattern, escape=escape)
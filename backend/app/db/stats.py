@@ -0,0 +1,95 @@
+from datetime import datetime
+from typing import Iterable, Optional
+from sqlalchemy import case, delete, func, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.app.db.database import dialect_insert
+from backend.app.models.stats import UserTrainingStats
+from backend.app.models.training import Training, TrainingStatusEnum
+
+def _count_status(status: TrainingStatusEnum):
+    return func.coalesce(func.sum(case((Training.status == status, 1), else_=0)), 0)
+
+async def apply_stats_delta(db: AsyncSession, user_id: int, total: int = 0, completed: int = 0, failed: int = 0, last_training_at: Optional[datetime] = None):
+    # Runs in the caller's transaction, after its pending changes are flushed. A user
+    # without a stats row yet gets one seeded from a single aggregate query, which
+    # already reflects those changes.
+    values = {
+        UserTrainingStats.total: UserTrainingStats.total + total,
+        UserTrainingStats.completed: UserTrainingStats.completed + completed,
+        UserTrainingStats.failed: UserTrainingStats.failed + failed,
+    }
+    if last_training_at is not None:
+        values[UserTrainingStats.last_training_at] = last_training_at
+    result = await db.execute(update(UserTrainingStats).where(UserTrainingStats.user_id == user_id).values(values))
+    if result.rowcount == 0:
+        await seed_user_stats(db, user_id)
+
+async def seed_user_stats(db: AsyncSession, user_id: int):
+    aggregate = select(
+        literal(user_id),
+        func.count(Training.id),
+        _count_status(TrainingStatusEnum.completed),
+        _count_status(TrainingStatusEnum.failed),
+        func.max(Training.created_at),
+    ).where(Training.user_id == user_id)
+    stmt = dialect_insert(db, UserTrainingStats).from_select(
+        ["user_id", "total", "completed", "failed", "last_training_at"], aggregate
+    )
+    await db.execute(stmt.on_conflict_do_nothing())
+
+async def recompute_user_stats(db: AsyncSession, user_id: int):
+    await db.execute(delete(UserTrainingStats).where(UserTrainingStats.user_id == user_id))
+    await seed_user_stats(db, user_id)
+
+def _status_delta(old: Optional[TrainingStatusEnum], new: Optional[TrainingStatusEnum], status: TrainingStatusEnum) -> int:
+    return int(new == status) - int(old == status)
+
+async def set_training_status(db: AsyncSession, training: Training, status: TrainingStatusEnum):
+    old = training.status
+    training.status = status
+    if old != status:
+        await apply_stats_delta(
+            db,
+            training.user_id,
+            completed=_status_delta(old, status, TrainingStatusEnum.completed),
+            failed=_status_delta(old, status, TrainingStatusEnum.failed),
+        )
+
+async def transition_training(db: AsyncSession, training: Training, status: TrainingStatusEnum, from_statuses: Iterable[TrainingStatusEnum], lease_owner: Optional[str] = None, **values) -> bool:
+    # Conditional status change out of pending/running, for writers that race each
+    # other (the job itself, a cancellation, the durable queue's lease expiry): the
+    # row only changes if it is still in one of `from_statuses` and, when
+    # `lease_owner` is given, still leased by that worker. Returns whether it did;
+    # `training` is refreshed either way.
+    conditions = [Training.id == training.id, Training.status.in_(list(from_statuses))]
+    if lease_owner is not None:
+        conditions.append(Training.lease_owner == lease_owner)
+    result = await db.execute(
+        update(Training)
+        .where(*conditions)
+        .values(status=status, **values)
+        .returning(Training.id)
+        .execution_options(synchronize_session=False)
+    )
+    changed = result.scalar() is not None
+    if changed and status in (TrainingStatusEnum.completed, TrainingStatusEnum.failed):
+        await apply_stats_delta(
+            db,
+            training.user_id,
+            completed=int(status == TrainingStatusEnum.completed),
+            failed=int(status == TrainingStatusEnum.failed),
+        )
+    await db.refresh(training)
+    return changed
+
+async def record_trainings_created(db: AsyncSession, user_id: int, count: int):
+    await apply_stats_delta(db, user_id, total=count, last_training_at=datetime.utcnow())
+
+async def record_training_deleted(db: AsyncSession, training: Training):
+    await apply_stats_delta(
+        db,
+        training.user_id,
+        total=-1,
+        completed=-int(training.status == TrainingStatusEnum.completed),
+        failed=-int(training.status == TrainingStatusEnum.failed),
+    )
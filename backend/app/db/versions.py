@@ -0,0 +1,26 @@
+from sqlalchemy import func, literal, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from backend.app.db.database import dialect_insert
+from backend.app.models.counter import Counter
+from backend.app.models.training import Training
+
+MODEL_VERSION_COUNTER = "model_version"
+
+async def allocate_model_versions(db: AsyncSession, count: int = 1) -> range:
+    # A single atomic UPDATE ... RETURNING on the counter row; the row stays locked
+    # until the caller commits, so concurrent submissions never share a version.
+    stmt = (
+        update(Counter)
+        .where(Counter.name == MODEL_VERSION_COUNTER)
+        .values(value=Counter.value + count)
+        .returning(Counter.value)
+    )
+    last = (await db.execute(stmt)).scalar()
+    if last is None:
+        # First allocation: seed the counter from the versions that already exist. The
+        # WHERE is required by SQLite, which cannot parse an upsert on INSERT ... SELECT
+        # without one.
+        seed = select(literal(MODEL_VERSION_COUNTER), func.coalesce(func.max(Training.model_version), 0)).where(true())
+        await db.execute(dialect_insert(db, Counter).from_select(["name", "value"], seed).on_conflict_do_nothing())
+        last = (await db.execute(stmt)).scalar()
+    return range(last - count + 1, last + 1)
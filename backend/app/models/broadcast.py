@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON, Index
+from sqlalchemy.sql import func
+from backend.app.db.database import Base
+
+class BroadcastMessage(Base):
+    __tablename__ = "broadcast_messages"
+
+    id = Column(Integer, primary_key=True, index=True)
+    channel = Column(String(128), nullable=False)
+    payload = Column(JSON, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+Index("idx_broadcast_channel_id", BroadcastMessage.channel, BroadcastMessage.id)
@@ -0,0 +1,8 @@
+from sqlalchemy import Column, String, BigInteger
+from backend.app.db.database import Base
+
+class Counter(Base):
+    __tablename__ = "counters"
+
+    name = Column(String(64), primary_key=True)
+    value = Column(BigInteger, nullable=False, default=0)
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, BigInteger, ForeignKey, String, DateTime, JSON
+from sqlalchemy.sql import func
+from backend.app.db.database import Base
+
+class Dataset(Base):
+    __tablename__ = "datasets"
+
+    # sha256 of the uploaded CSV bytes; the columnar copy lives under DATASET_DIR/<id>
+    id = Column(String(64), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="SET NULL"), nullable=True)
+    size_bytes = Column(BigInteger, nullable=False)
+    rows = Column(Integer, nullable=True)
+    columns = Column(JSON, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Index, event
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from backend.app.db.database import Base
+from backend.app.db.log_search import install_log_search
 
 class Log(Base):
     __tablename__ = "logs"
@@ -13,3 +14,10 @@ class Log(Base):
     timestamp = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
     user = relationship("User", back_populates="logs")
+
+Index("idx_logs_user_timestamp", Log.user_id, Log.timestamp, Log.id)
+Index("idx_logs_timestamp_id", Log.timestamp, Log.id)
+
+@event.listens_for(Log.__table__, "after_create")
+def create_log_search_index(target, connection, **kw):
+    install_log_search(connection)
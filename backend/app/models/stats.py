@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, ForeignKey, DateTime
+from backend.app.db.database import Base
+
+class UserTrainingStats(Base):
+    __tablename__ = "user_training_stats"
+
+    # Maintained incrementally by backend.app.db.stats on every insert and status change
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    completed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    last_training_at = Column(DateTime(timezone=True), nullable=True)
@@ -1,26 +1,55 @@
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Enum, JSON
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Enum, JSON, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 import enum
+from datetime import datetime
 from backend.app.db.database import Base
+from backend.app.models.dataset import Dataset  # noqa: F401 (registers the table behind the dataset_id foreign key)
 
 class TrainingStatusEnum(str, enum.Enum):
     pending = "pending"
     running = "running"
     completed = "completed"
     failed = "failed"
+    cancelled = "cancelled"
+
+class TrainingJobTypeEnum(str, enum.Enum):
+    training = "training"
+    sweep = "sweep"
+    scoring = "scoring"
 
 class Training(Base):
     __tablename__ = "trainings"
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    model_version = Column(Integer, nullable=False, default=1)
+    model_version = Column(Integer, nullable=False, default=1, unique=True, index=True)
     status = Column(Enum(TrainingStatusEnum), default=TrainingStatusEnum.pending, nullable=False)
+    job_type = Column(Enum(TrainingJobTypeEnum), default=TrainingJobTypeEnum.training, nullable=False)
     parameters = Column(JSON, nullable=False)
     results = Column(JSON, nullable=True)
     model_path = Column(String(512), nullable=True)
+    dataset_id = Column(String(64), ForeignKey("datasets.id", ondelete="SET NULL"), nullable=True, index=True)
+    # Lineage: the model version this one was warm-started from (for scoring jobs,
+    # the model that was applied)
+    base_version = Column(Integer, nullable=True, index=True)
+    # Durable queue (TRAINING_QUEUE=database): the job's data source and the lease
+    # of the worker running it
+    source = Column(JSON, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0, server_default="0")
+    lease_owner = Column(String(128), nullable=True)
+    lease_expires_at = Column(DateTime(timezone=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), server_default=func.now(), nullable=False)
+    # Set in Python on every update: SQLite's CURRENT_TIMESTAMP has whole seconds, too
+    # coarse for the ETags derived from it
+    updated_at = Column(DateTime(timezone=True), onupdate=datetime.utcnow, server_default=func.now(), nullable=False)
 
     user = relationship("User", back_populates="trainings")
+
+    # fetch server-generated timestamps with RETURNING instead of a refresh round-trip
+    __mapper_args__ = {"eager_defaults": True}
+
+Index("idx_trainings_user_created", Training.user_id, Training.created_at, Training.id)
+Index("idx_trainings_created_id", Training.created_at, Training.id)
+Index("idx_trainings_status", Training.status)
+Index("idx_trainings_status_lease", Training.status, Training.lease_expires_at)
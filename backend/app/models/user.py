@@ -11,9 +11,14 @@ class User(Base):
     hashed_password = Column(String(256), nullable=False)
     is_active = Column(Boolean, default=True, nullable=False)
     is_admin = Column(Boolean, default=False, nullable=False)
+    # Bumped when an admin changes the account; tokens carry it as "ver"
+    token_version = Column(Integer, default=0, server_default="0", nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
 
-    trainings = relationship("Training", back_populates="user", cascade="all, delete-orphan")
-    logs = relationship("Log", back_populates="user", cascade="all, delete-orphan")
+    # Children are removed by the foreign keys' ON DELETE CASCADE, not loaded and
+    # deleted one by one
+    trainings = relationship("Training", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
+    logs = relationship("Log", back_populates="user", cascade="all, delete-orphan", passive_deletes=True)
 
 Index("idx_user_email", User.email)
+Index("idx_users_created_id", User.created_at, User.id)
@@ -0,0 +1,40 @@
+from pydantic import BaseModel, conlist, validator
+from typing import Optional, List
+from datetime import datetime
+from backend.app.schemas.training import TrainingStatusEnum, TrainingJobTypeEnum
+
+MAX_BULK_USERS = 10000
+
+class BulkUserIds(BaseModel):
+    user_ids: conlist(int, min_items=1, max_items=MAX_BULK_USERS)
+
+class BulkUserUpdate(BulkUserIds):
+    is_active: Optional[bool] = None
+    is_admin: Optional[bool] = None
+
+class BulkUserResult(BaseModel):
+    count: int
+    user_ids: List[int]
+
+class TrainingPurge(BaseModel):
+    # Pending and running trainings cannot be purged; cancel them first
+    user_ids: Optional[conlist(int, max_items=MAX_BULK_USERS)] = None
+    statuses: List[TrainingStatusEnum] = [TrainingStatusEnum.completed, TrainingStatusEnum.failed, TrainingStatusEnum.cancelled]
+    job_type: Optional[TrainingJobTypeEnum] = None
+    created_after: Optional[datetime] = None
+    created_before: Optional[datetime] = None
+
+    @validator("statuses")
+    def check_statuses(cls, v):
+        if not v or any(status in (TrainingStatusEnum.pending, TrainingStatusEnum.running) for status in v):
+            raise ValueError("statuses must be completed, failed or cancelled")
+        return v
+
+class LogPurge(BaseModel):
+    user_ids: Optional[conlist(int, max_items=MAX_BULK_USERS)] = None
+    actions: Optional[List[str]] = None
+    after: Optional[datetime] = None
+    before: Optional[datetime] = None
+
+class PurgeResult(BaseModel):
+    deleted: int
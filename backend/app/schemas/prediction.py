@@ -0,0 +1,21 @@
+from pydantic import BaseModel, Field
+from typing import Any, Dict, List
+
+class PredictRequest(BaseModel):
+    rows: List[Dict[str, Any]] = Field(..., min_items=1)
+
+class Prediction(BaseModel):
+    prediction: Any
+    probabilities: Dict[str, float]
+
+class PredictResponse(BaseModel):
+    model_version: int
+    predictions: List[Prediction]
+
+class ModelCacheStats(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    hit_rate: float
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Literal
 from datetime import datetime
 from enum import Enum
 
@@ -8,23 +8,79 @@ class TrainingStatusEnum(str, Enum):
     running = "running"
     completed = "completed"
     failed = "failed"
+    cancelled = "cancelled"
+
+class TrainingJobTypeEnum(str, Enum):
+    training = "training"
+    sweep = "sweep"
+    scoring = "scoring"
 
 class TrainingCreate(BaseModel):
     parameters: Dict[str, Any]
     csv_file: Optional[bytes] = None  # Optional raw CSV file bytes
+    dataset_id: Optional[str] = None  # Retrain on a previously uploaded dataset
+    base_version: Optional[int] = None  # Warm-start from this completed model version
+
+class SweepSpec(BaseModel):
+    strategy: Literal["grid", "random"] = "grid"
+    space: Dict[str, List[Any]] = Field(..., description="Candidate values per model parameter")
+    n_iter: int = Field(10, ge=1)  # number of sampled candidates for random search
+    scoring: Literal["accuracy", "precision", "recall", "f1_score"] = "f1_score"
+    validation_fraction: float = Field(0.2, gt=0, lt=1)
+    random_state: Optional[int] = None
+
+class SweepCreate(TrainingCreate):
+    sweep: SweepSpec
+
+class ScoringCreate(BaseModel):
+    model_version: int
+    parameters: Dict[str, Any] = Field(default_factory=dict)  # "scoring" options and/or manual "data"
+    csv_file: Optional[bytes] = None
+    dataset_id: Optional[str] = None
+
+class TrainingBatchCreate(BaseModel):
+    jobs: List[TrainingCreate] = Field(..., min_items=1)
 
 class TrainingOut(BaseModel):
     id: int
     user_id: int
     model_version: int
     status: TrainingStatusEnum
+    job_type: TrainingJobTypeEnum
     parameters: Dict[str, Any]
     results: Optional[Dict[str, Any]]
+    dataset_id: Optional[str]
+    base_version: Optional[int]
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        orm_mode = True
+
+class TrainingListItem(BaseModel):
+    # TrainingOut without the potentially large parameters/results JSON columns
+    id: int
+    user_id: int
+    model_version: int
+    status: TrainingStatusEnum
+    job_type: TrainingJobTypeEnum
+    dataset_id: Optional[str]
+    base_version: Optional[int]
     created_at: datetime
     updated_at: datetime
 
     class Config:
         orm_mode = True
 
+class TrainingResultItem(TrainingListItem):
+    # Only the metrics the dashboard charts, not the whole results JSON
+    results: Optional[Dict[str, float]]
+
 class TrainingUpdate(BaseModel):
     status: TrainingStatusEnum
+
+class ArtifactGCReport(BaseModel):
+    orphans_deleted: int
+    superseded_deleted: int
+    bytes_freed: int
+    bytes_used: int
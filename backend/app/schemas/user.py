@@ -20,3 +20,17 @@ class UserOut(BaseModel):
 
 class UserInDB(UserOut):
     hashed_password: str
+
+class CacheStats(BaseModel):
+    size: int
+    max_size: int
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    hit_rate: float
+
+class AuthCacheStats(BaseModel):
+    tokens: CacheStats
+    users: CacheStats
+    users_cached: bool
@@ -0,0 +1,155 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import update
+from sqlalchemy.future import select
+
+from backend.app.core.config import settings
+from backend.app.db.database import async_session_local
+from backend.app.models.training import Training, TrainingStatusEnum, TrainingJobTypeEnum
+from backend.app.utils.artifacts import ArtifactInfo, artifact_store, key_version, model_key
+
+logger = logging.getLogger(__name__)
+
+# Retention for the model artifact store: removes artifacts that no completed model
+# refers to and, under MODEL_DISK_QUOTA_BYTES, the oldest superseded versions.
+
+
+def _delete_training_files(training: Any):
+    if training.job_type == TrainingJobTypeEnum.scoring:
+        if training.model_path:
+            try:
+                os.remove(training.model_path)
+            except FileNotFoundError:
+                pass
+    else:
+        artifact_store.delete(model_key(training.model_version))
+
+
+async def delete_training_files(trainings: List[Any]):
+    # For deleted trainings (or rows with their id, job_type, model_version and
+    # model_path); whatever fails here is left to the periodic collection
+    for training in trainings:
+        try:
+            await asyncio.to_thread(_delete_training_files, training)
+        except Exception:
+            logger.warning("Could not delete the files of training %s", training.id, exc_info=True)
+
+
+async def _completed_versions(versions: List[int]) -> Dict[int, int]:
+    # model_version -> user_id for the listed versions that are completed models
+    found: Dict[int, int] = {}
+    async with async_session_local() as db:
+        for start in range(0, len(versions), 500):
+            result = await db.execute(
+                select(Training.model_version, Training.user_id)
+                .filter(
+                    Training.model_version.in_(versions[start:start + 500]),
+                    Training.status == TrainingStatusEnum.completed,
+                    Training.job_type != TrainingJobTypeEnum.scoring,
+                )
+            )
+            found.update(result.tuples().all())
+    return found
+
+
+async def _pinned_versions() -> set:
+    # Bases of queued or running warm starts and scoring jobs
+    async with async_session_local() as db:
+        result = await db.execute(
+            select(Training.base_version)
+            .filter(Training.base_version.isnot(None), Training.status.in_((TrainingStatusEnum.pending, TrainingStatusEnum.running)))
+            .distinct()
+        )
+        return set(result.scalars().all())
+
+
+async def collect_artifacts(quota_bytes: int, keep_latest: int, grace_seconds: float) -> Dict[str, Any]:
+    # 1. Orphans: files that are not the artifact of a completed model (deleted or
+    #    failed trainings, leftovers of interrupted writes), once older than the grace
+    #    period so that a job's artifact is not removed before its row is updated.
+    # 2. Over quota: models beyond each user's `keep_latest` newest are deleted, oldest
+    #    first, until the store fits. Their trainings keep their row and metrics.
+    infos = await asyncio.to_thread(artifact_store.list)
+    versions = {info.key: key_version(info.key) for info in infos}
+    owners = await _completed_versions([v for v in versions.values() if v is not None])
+    now = time.time()
+    report = {"orphans_deleted": 0, "superseded_deleted": 0, "bytes_freed": 0}
+
+    live = []
+    for info in infos:
+        if versions[info.key] in owners:
+            live.append(info)
+        elif now - info.modified > grace_seconds:
+            await asyncio.to_thread(artifact_store.delete, info.key)
+            report["orphans_deleted"] += 1
+            report["bytes_freed"] += info.size
+
+    used = sum(info.size for info in live)
+    if quota_bytes > 0 and used > quota_bytes:
+        pinned = await _pinned_versions()
+        by_user: Dict[int, List[ArtifactInfo]] = {}
+        for info in live:
+            by_user.setdefault(owners[versions[info.key]], []).append(info)
+        superseded = [
+            info
+            for infos_of_user in by_user.values()
+            for info in sorted(infos_of_user, key=lambda i: versions[i.key], reverse=True)[keep_latest:]
+            if versions[info.key] not in pinned
+        ]
+        deleted = []
+        for info in sorted(superseded, key=lambda i: versions[i.key]):
+            if used <= quota_bytes:
+                break
+            await asyncio.to_thread(artifact_store.delete, info.key)
+            deleted.append(versions[info.key])
+            used -= info.size
+            report["bytes_freed"] += info.size
+        if deleted:
+            from backend.app.utils.serving import model_cache
+            async with async_session_local() as db:
+                await db.execute(update(Training).where(Training.model_version.in_(deleted), Training.job_type != TrainingJobTypeEnum.scoring).values(model_path=None))
+                await db.commit()
+            for version in deleted:
+                model_cache.invalidate(version)
+        report["superseded_deleted"] = len(deleted)
+        if used > quota_bytes:
+            logger.warning("Model artifacts use %d bytes, over the %d byte quota, after removing everything allowed", used, quota_bytes)
+    report["bytes_used"] = used
+    return report
+
+
+class ArtifactCollector:
+    def __init__(self, interval: float):
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        if self.interval > 0:
+            self._task = asyncio.create_task(self._collect_periodically())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def collect(self) -> Dict[str, Any]:
+        report = await collect_artifacts(settings.MODEL_DISK_QUOTA_BYTES, settings.MODEL_KEEP_LATEST, settings.MODEL_GC_GRACE_SECONDS)
+        if report["orphans_deleted"] or report["superseded_deleted"]:
+            logger.info("Model artifact GC: %s", report)
+        return report
+
+    async def _collect_periodically(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.collect()
+            except Exception:
+                logger.exception("Model artifact GC failed")
+
+
+artifact_collector = ArtifactCollector(settings.MODEL_GC_INTERVAL)
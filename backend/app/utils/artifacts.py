@@ -0,0 +1,208 @@
+import hashlib
+import os
+import re
+import uuid
+from contextlib import contextmanager
+from typing import Iterator, List, NamedTuple, Optional
+
+from backend.app.core.config import settings
+
+# Model artifact storage. Artifacts are written to a temporary file, checksummed and
+# then renamed (or uploaded) into place, so readers never see a partial file. Each
+# artifact has a SHA-256 that is checked when it is loaded from disk or downloaded.
+# Loading always goes through a local file, which is what joblib's mmap_mode needs.
+
+CHECKSUM_SUFFIX = ".sha256"
+MODEL_KEY = re.compile(r"^model_v(\d+)\.joblib$")
+
+
+class ArtifactNotFoundError(FileNotFoundError):
+    pass
+
+
+class ArtifactCorruptError(Exception):
+    pass
+
+
+class ArtifactInfo(NamedTuple):
+    key: str
+    size: int
+    modified: float
+
+
+def model_key(version: int) -> str:
+    return f"model_v{version}.joblib"
+
+
+def key_version(key: str) -> Optional[int]:
+    match = MODEL_KEY.match(key)
+    return int(match.group(1)) if match else None
+
+
+def file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _fsync(path: str):
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _write_text_atomic(path: str, text: str):
+    tmp = f"{path}.tmp-{uuid.uuid4().hex}"
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _check_key(key: str) -> str:
+    if not key or "/" in key or "\\" in key or key.startswith("."):
+        raise ValueError(f"Invalid artifact key {key!r}")
+    return key
+
+
+class LocalArtifactStore:
+    def __init__(self, root: str, verify: bool = True):
+        self.root = root
+        self.verify = verify
+        os.makedirs(root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, _check_key(key))
+
+    def uri(self, key: str) -> str:
+        return self._path(key)
+
+    @contextmanager
+    def writing(self, key: str) -> Iterator[str]:
+        # Yields a temporary path in the store's directory to write the artifact to
+        final = self._path(key)
+        tmp = f"{final}.tmp-{uuid.uuid4().hex}"
+        try:
+            yield tmp
+            _fsync(tmp)
+            _write_text_atomic(final + CHECKSUM_SUFFIX, file_sha256(tmp))
+            os.replace(tmp, final)
+        finally:
+            _remove(tmp)
+
+    def local_path(self, key: str) -> str:
+        path = self._path(key)
+        if not os.path.exists(path):
+            raise ArtifactNotFoundError(key)
+        if self.verify:
+            try:
+                with open(path + CHECKSUM_SUFFIX, encoding="utf-8") as f:
+                    expected = f.read().strip()
+            except FileNotFoundError:
+                expected = None  # written before checksums were recorded
+            if expected is not None and file_sha256(path) != expected:
+                raise ArtifactCorruptError(f"Checksum mismatch for {key}")
+        return path
+
+    def delete(self, key: str):
+        path = self._path(key)
+        _remove(path)
+        _remove(path + CHECKSUM_SUFFIX)
+
+    def list(self) -> List[ArtifactInfo]:
+        infos = []
+        with os.scandir(self.root) as entries:
+            for entry in entries:
+                if entry.is_file() and not entry.name.startswith(".") and not entry.name.endswith(CHECKSUM_SUFFIX):
+                    stat = entry.stat()
+                    infos.append(ArtifactInfo(entry.name, stat.st_size, stat.st_mtime))
+        return infos
+
+
+class S3ArtifactStore:
+    # Any S3-compatible service (AWS, MinIO, ...). Artifacts are downloaded once into
+    # `cache_dir` and verified against the checksum stored in the object's metadata.
+    def __init__(self, bucket: str, prefix: str, cache_dir: str, endpoint_url: Optional[str] = None):
+        try:
+            import boto3
+        except ImportError:
+            raise RuntimeError("MODEL_STORE=s3 requires the 'boto3' package")
+        self.client = boto3.client("s3", endpoint_url=endpoint_url)
+        self.bucket = bucket
+        self.prefix = prefix
+        self.cache = LocalArtifactStore(cache_dir, verify=False)
+
+    def _object(self, key: str) -> str:
+        return self.prefix + _check_key(key)
+
+    def uri(self, key: str) -> str:
+        return f"s3://{self.bucket}/{self._object(key)}"
+
+    @contextmanager
+    def writing(self, key: str) -> Iterator[str]:
+        with self.cache.writing(key) as tmp:
+            yield tmp
+            self.client.upload_file(tmp, self.bucket, self._object(key), ExtraArgs={"Metadata": {"sha256": file_sha256(tmp)}})
+
+    def local_path(self, key: str) -> str:
+        try:
+            return self.cache.local_path(key)
+        except ArtifactNotFoundError:
+            pass
+        try:
+            head = self.client.head_object(Bucket=self.bucket, Key=self._object(key))
+        except self.client.exceptions.ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                raise ArtifactNotFoundError(key)
+            raise
+        expected = head.get("Metadata", {}).get("sha256")
+        with self.cache.writing(key) as tmp:
+            self.client.download_file(self.bucket, self._object(key), tmp)
+            if expected and file_sha256(tmp) != expected:
+                raise ArtifactCorruptError(f"Checksum mismatch for {key}")
+        return self.cache.local_path(key)
+
+    def delete(self, key: str):
+        self.client.delete_object(Bucket=self.bucket, Key=self._object(key))
+        self.cache.delete(key)
+
+    def list(self) -> List[ArtifactInfo]:
+        infos = []
+        for page in self.client.get_paginator("list_objects_v2").paginate(Bucket=self.bucket, Prefix=self.prefix):
+            for item in page.get("Contents", []):
+                if "/" in item["Key"][len(self.prefix):]:
+                    continue
+                infos.append(ArtifactInfo(item["Key"][len(self.prefix):], item["Size"], item["LastModified"].timestamp()))
+        return infos
+
+
+def create_artifact_store():
+    if settings.MODEL_STORE == "s3":
+        return S3ArtifactStore(settings.MODEL_S3_BUCKET, settings.MODEL_S3_PREFIX, settings.MODEL_STORE_CACHE_DIR, settings.MODEL_S3_ENDPOINT_URL or None)
+    return LocalArtifactStore(settings.MODEL_DIR, verify=settings.MODEL_VERIFY_CHECKSUM)
+
+
+artifact_store = create_artifact_store()
+
+
+def joblib_compression(value: str):
+    # "" or "0": uncompressed (loadable with mmap_mode); "3": zlib level 3;
+    # "lz4:1", "zlib:6", ...: method and level
+    if not value or value == "0":
+        return 0
+    if ":" in value:
+        method, level = value.split(":", 1)
+        return method, int(level)
+    return int(value)
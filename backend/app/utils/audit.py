@@ -0,0 +1,138 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.exc import IntegrityError
+
+from backend.app.core.config import settings
+from backend.app.db.database import async_session_local, engine
+from backend.app.db.log_search import install_log_search
+from backend.app.models.log import Log
+from backend.app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLogWriter:
+    # Requests only append to an in-memory buffer; a background task writes the
+    # buffer with one multi-row INSERT when it reaches `batch_size` rows or every
+    # `flush_interval` seconds, and once more on shutdown.
+    def __init__(self, batch_size: int, flush_interval: float, max_queue: int):
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.max_queue = max(self.batch_size, max_queue)
+        self._buffer: List[Dict[str, Any]] = []
+        self._wakeup: Optional[asyncio.Event] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._tasks: List[asyncio.Task] = []
+        self.written = 0
+        self.dropped = 0
+
+    def log(self, user_id: int, action: str, details: Optional[str] = None):
+        if len(self._buffer) >= self.max_queue:
+            # The database is not keeping up; shed the oldest events rather than grow
+            self._buffer.pop(0)
+            self.dropped += 1
+        self._buffer.append({
+            "user_id": user_id,
+            "action": action[:256],
+            "details": details[:1024] if details else None,
+            "timestamp": datetime.utcnow(),
+        })
+        if len(self._buffer) >= self.batch_size and self._wakeup is not None:
+            self._wakeup.set()
+
+    async def start(self):
+        self._wakeup = asyncio.Event()
+        self._lock = asyncio.Lock()
+        try:
+            async with engine.begin() as conn:
+                await conn.run_sync(install_log_search)
+        except Exception:
+            logger.exception("Could not install the audit log search index")
+        self._tasks = [asyncio.create_task(self._flush_periodically())]
+        if settings.AUDIT_LOG_RETENTION_DAYS > 0:
+            self._tasks.append(asyncio.create_task(self._purge_periodically()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("Final audit log flush failed, %d events lost", len(self._buffer))
+
+    async def _flush_periodically(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("Audit log flush failed")
+
+    async def flush(self):
+        if self._lock is None:
+            return
+        async with self._lock:
+            while self._buffer:
+                batch, self._buffer = self._buffer[:self.batch_size], self._buffer[self.batch_size:]
+                try:
+                    await self._write(batch)
+                except BaseException:
+                    # Keep the events for the next attempt
+                    self._buffer[:0] = batch
+                    del self._buffer[:max(0, len(self._buffer) - self.max_queue)]
+                    raise
+
+    async def _write(self, batch: List[Dict[str, Any]]):
+        async with async_session_local() as db:
+            try:
+                await db.execute(insert(Log), batch)
+                await db.commit()
+            except IntegrityError:
+                # A user was deleted after its events were queued; drop just those
+                await db.rollback()
+                existing = set((await db.execute(
+                    select(User.id).filter(User.id.in_({row["user_id"] for row in batch}))
+                )).scalars())
+                kept = [row for row in batch if row["user_id"] in existing]
+                self.dropped += len(batch) - len(kept)
+                batch = kept
+                if batch:
+                    await db.execute(insert(Log), batch)
+                    await db.commit()
+        self.written += len(batch)
+
+    async def _purge_periodically(self):
+        while True:
+            try:
+                await purge_audit_logs(settings.AUDIT_LOG_RETENTION_DAYS)
+            except Exception:
+                logger.exception("Audit log retention failed")
+            await asyncio.sleep(settings.AUDIT_LOG_RETENTION_INTERVAL)
+
+
+async def purge_audit_logs(retention_days: int) -> int:
+    # Deletes in bounded batches (oldest first, on the timestamp index) so that the
+    # retention job never holds a long write lock
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    deleted = 0
+    while True:
+        async with async_session_local() as db:
+            expired = select(Log.id).filter(Log.timestamp < cutoff).order_by(Log.timestamp, Log.id).limit(settings.AUDIT_LOG_DELETE_BATCH)
+            result = await db.execute(delete(Log).where(Log.id.in_(expired)))
+            await db.commit()
+        deleted += result.rowcount
+        if result.rowcount < settings.AUDIT_LOG_DELETE_BATCH:
+            return deleted
+
+
+audit_log = AuditLogWriter(settings.AUDIT_LOG_BATCH_SIZE, settings.AUDIT_LOG_FLUSH_INTERVAL, settings.AUDIT_LOG_MAX_QUEUE)
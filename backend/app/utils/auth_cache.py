@@ -0,0 +1,137 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import inspect
+from sqlalchemy.orm import make_transient_to_detached
+
+from backend.app.core.config import settings
+from backend.app.models.user import User
+from backend.app.utils.broadcast import broadcast
+
+# Other processes evict a user when an admin changes it through this channel. They
+# receive every message through a broadcast callback; subscribers, which skip to a
+# channel's latest message, could miss one in a burst of changes.
+INVALIDATION_CHANNEL = "auth:invalidate"
+
+
+class TTLCache:
+    # Size-bounded LRU whose entries also expire after a deadline
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max(1, max_size)
+        self.ttl = ttl
+        self._entries: "OrderedDict[Any, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key) -> Optional[Any]:
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def set(self, key, value, ttl: Optional[float] = None):
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0:
+            return
+        self._entries[key] = (time.monotonic() + ttl, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def pop(self, key):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+class AuthCache:
+    # Caches decoded tokens (by token string) and the authenticated user's columns
+    # (by email). Hits hand out a fresh detached User, so requests never share state.
+    # Users are only cached when `cache_users` is set: with a process-local broadcast
+    # backend other processes would never hear that an admin changed one.
+    def __init__(self, max_size: int, ttl: float, cache_users: bool = True):
+        self.tokens = TTLCache(max_size, ttl)
+        self.users = TTLCache(max_size, ttl)
+        self.cache_users = cache_users
+
+    def get_payload(self, token: str) -> Optional[dict]:
+        return self.tokens.get(token)
+
+    def set_payload(self, token: str, payload: dict):
+        # Never outlive the token itself
+        self.tokens.set(token, payload, payload.get("exp", 0) - time.time())
+
+    def get_user(self, email: str) -> Optional[User]:
+        if not self.cache_users:
+            return None
+        values = self.users.get(email)
+        if values is None:
+            return None
+        user = User(**values)
+        make_transient_to_detached(user)
+        return user
+
+    def set_user(self, user: User):
+        if not self.cache_users:
+            return
+        self.users.set(user.email, {attr.key: getattr(user, attr.key) for attr in inspect(User).column_attrs})
+
+    def evict_user(self, email: str):
+        self.users.pop(email)
+
+    async def invalidate_user(self, email: str):
+        self.evict_user(email)
+        await broadcast.publish(INVALIDATION_CHANNEL, {"email": email, "at": time.time()})
+
+    async def invalidate_users(self, emails: List[str]):
+        # One message for a bulk change, which a burst of per-user messages could lose
+        for email in emails:
+            self.evict_user(email)
+        if emails:
+            await broadcast.publish(INVALIDATION_CHANNEL, {"emails": emails, "at": time.time()})
+
+    async def start(self):
+        broadcast.add_callback(INVALIDATION_CHANNEL, self._on_invalidation)
+
+    async def stop(self):
+        broadcast.remove_callback(INVALIDATION_CHANNEL, self._on_invalidation)
+
+    def _on_invalidation(self, message: dict):
+        for email in message.get("emails") or [message["email"]]:
+            self.evict_user(email)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"tokens": self.tokens.stats(), "users": self.users.stats(), "users_cached": self.cache_users}
+
+
+def users_cacheable() -> bool:
+    if settings.AUTH_CACHE_USERS is not None:
+        return settings.AUTH_CACHE_USERS
+    return settings.PROGRESS_BACKEND != "memory"
+
+
+auth_cache = AuthCache(settings.AUTH_CACHE_SIZE, settings.AUTH_CACHE_TTL_SECONDS, users_cacheable())
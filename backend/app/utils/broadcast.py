@@ -0,0 +1,254 @@
+import asyncio
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import AsyncIterator, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, select, text
+from backend.app.core.config import settings
+from backend.app.db.database import async_session_local, engine
+from backend.app.models.broadcast import BroadcastMessage
+
+logger = logging.getLogger(__name__)
+
+
+class _LocalHub:
+    # In-process fan-out. Every channel keeps only its latest message and an Event
+    # that is swapped on each publish, so publishing is O(1) however many subscribers
+    # are waiting, and a slow subscriber skips intermediate messages instead of
+    # buffering them. Callbacks, for consumers that must not miss a message, are
+    # called with every message as it is published.
+    def __init__(self):
+        self._latest: Dict[str, Tuple[int, dict]] = {}
+        self._events: Dict[str, asyncio.Event] = {}
+        self._callbacks: Dict[str, List[Callable[[dict], None]]] = {}
+        self._seq = 0
+
+    def add_callback(self, channel: str, callback: Callable[[dict], None]):
+        self._callbacks.setdefault(channel, []).append(callback)
+
+    def remove_callback(self, channel: str, callback: Callable[[dict], None]):
+        callbacks = self._callbacks.get(channel, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+
+    def publish(self, channel: str, message: dict, final: bool = False):
+        self._seq += 1
+        seq = self._seq
+        self._latest[channel] = (seq, message)
+        for callback in self._callbacks.get(channel, ()):
+            try:
+                callback(message)
+            except Exception:
+                logger.exception("Broadcast callback for %s failed", channel)
+        event = self._events.pop(channel, None)
+        if event is not None:
+            event.set()
+        if final:
+            asyncio.get_running_loop().call_later(settings.PROGRESS_RETAIN_SECONDS, self._forget, channel, seq)
+
+    def _forget(self, channel: str, seq: int):
+        entry = self._latest.get(channel)
+        if entry is not None and entry[0] == seq:
+            del self._latest[channel]
+
+    def latest(self, channel: str) -> Optional[dict]:
+        entry = self._latest.get(channel)
+        return entry[1] if entry is not None else None
+
+    async def listen(self, channel: str) -> AsyncIterator[dict]:
+        last_seen = 0
+        while True:
+            entry = self._latest.get(channel)
+            if entry is not None and entry[0] > last_seen:
+                last_seen = entry[0]
+                yield entry[1]
+                continue
+            event = self._events.get(channel)
+            if event is None:
+                event = self._events[channel] = asyncio.Event()
+            await event.wait()
+
+
+class Broadcast:
+    # In-process backend: only subscribers in the publishing process see messages.
+    def __init__(self):
+        self._hub = _LocalHub()
+
+    async def start(self):
+        pass
+
+    async def stop(self):
+        pass
+
+    async def publish(self, channel: str, message: dict, final: bool = False):
+        self._hub.publish(channel, message, final)
+
+    async def latest(self, channel: str) -> Optional[dict]:
+        return self._hub.latest(channel)
+
+    async def subscribe(self, channel: str) -> AsyncIterator[dict]:
+        async for message in self._hub.listen(channel):
+            yield message
+
+    def add_callback(self, channel: str, callback: Callable[[dict], None]):
+        self._hub.add_callback(channel, callback)
+
+    def remove_callback(self, channel: str, callback: Callable[[dict], None]):
+        self._hub.remove_callback(channel, callback)
+
+
+class RedisBroadcast(Broadcast):
+    # A single pattern subscription per process feeds the local hub; the latest
+    # message of each channel is also kept as a key for late subscribers.
+    prefix = "broadcast:"
+
+    def __init__(self, url: str):
+        super().__init__()
+        try:
+            import redis.asyncio as aioredis
+        except ImportError:
+            raise RuntimeError("PROGRESS_BACKEND=redis requires the 'redis' package")
+        self._redis = aioredis.from_url(url)
+        self._pubsub = None
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        self._pubsub = self._redis.pubsub()
+        await self._pubsub.psubscribe(f"{self.prefix}*")
+        self._task = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        if self._pubsub is not None:
+            await self._pubsub.close()
+        await self._redis.close()
+
+    async def _listen(self):
+        async for item in self._pubsub.listen():
+            if item["type"] != "pmessage":
+                continue
+            channel = item["channel"].decode()[len(self.prefix):]
+            envelope = json.loads(item["data"])
+            self._hub.publish(channel, envelope["message"], envelope["final"])
+
+    async def publish(self, channel: str, message: dict, final: bool = False):
+        envelope = json.dumps({"message": message, "final": final})
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.set(self.prefix + channel, envelope, ex=settings.PROGRESS_RETAIN_SECONDS if final else None)
+            pipe.publish(self.prefix + channel, envelope)
+            await pipe.execute()
+
+    async def latest(self, channel: str) -> Optional[dict]:
+        message = self._hub.latest(channel)
+        if message is not None:
+            return message
+        envelope = await self._redis.get(self.prefix + channel)
+        return json.loads(envelope)["message"] if envelope is not None else None
+
+
+class DatabaseBroadcast(Broadcast):
+    # Messages are rows in `broadcast_messages`. On PostgreSQL every insert is
+    # followed by a NOTIFY that a LISTEN connection forwards to the local hub; on
+    # SQLite a single poller per process picks up new rows.
+    notify_channel = "broadcast"
+
+    def __init__(self):
+        super().__init__()
+        self._postgres = engine.dialect.name == "postgresql"
+        self._task: Optional[asyncio.Task] = None
+        self._listen_conn = None
+
+    async def start(self):
+        if self._postgres:
+            self._listen_conn = await engine.connect()
+            raw = await self._listen_conn.get_raw_connection()
+            await raw.driver_connection.add_listener(self.notify_channel, self._on_notify)
+            self._task = asyncio.create_task(self._purge_periodically())
+        else:
+            async with async_session_local() as db:
+                last_id = (await db.execute(select(func.max(BroadcastMessage.id)))).scalar() or 0
+            self._task = asyncio.create_task(self._poll(last_id))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        if self._listen_conn is not None:
+            await self._listen_conn.close()
+
+    def _on_notify(self, connection, pid, channel, payload):
+        envelope = json.loads(payload)
+        self._hub.publish(envelope["channel"], envelope["message"], envelope["final"])
+
+    async def _poll(self, last_id: int):
+        polls = 0
+        while True:
+            await asyncio.sleep(settings.PROGRESS_POLL_INTERVAL)
+            try:
+                async with async_session_local() as db:
+                    rows = await db.execute(
+                        select(BroadcastMessage.id, BroadcastMessage.channel, BroadcastMessage.payload)
+                        .filter(BroadcastMessage.id > last_id)
+                        .order_by(BroadcastMessage.id)
+                    )
+                    for message_id, channel, envelope in rows:
+                        last_id = message_id
+                        self._hub.publish(channel, envelope["message"], envelope["final"])
+                    polls += 1
+                    if polls * settings.PROGRESS_POLL_INTERVAL >= settings.PROGRESS_RETAIN_SECONDS:
+                        polls = 0
+                        await self._purge(db)
+            except Exception:
+                logger.exception("Broadcast poll failed")
+
+    async def _purge_periodically(self):
+        while True:
+            await asyncio.sleep(settings.PROGRESS_RETAIN_SECONDS)
+            try:
+                async with async_session_local() as db:
+                    await self._purge(db)
+            except Exception:
+                logger.exception("Broadcast purge failed")
+
+    async def _purge(self, db):
+        cutoff = datetime.utcnow() - timedelta(seconds=settings.PROGRESS_RETAIN_SECONDS)
+        await db.execute(delete(BroadcastMessage).where(BroadcastMessage.created_at < cutoff))
+        await db.commit()
+
+    async def publish(self, channel: str, message: dict, final: bool = False):
+        envelope = {"message": message, "final": final}
+        async with async_session_local() as db:
+            db.add(BroadcastMessage(channel=channel, payload=envelope))
+            if self._postgres:
+                await db.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": self.notify_channel, "payload": json.dumps({"channel": channel, **envelope})},
+                )
+            await db.commit()
+
+    async def latest(self, channel: str) -> Optional[dict]:
+        message = self._hub.latest(channel)
+        if message is not None:
+            return message
+        async with async_session_local() as db:
+            envelope = (await db.execute(
+                select(BroadcastMessage.payload)
+                .filter(BroadcastMessage.channel == channel)
+                .order_by(BroadcastMessage.id.desc())
+                .limit(1)
+            )).scalar()
+        return envelope["message"] if envelope is not None else None
+
+
+def create_broadcast() -> Broadcast:
+    if settings.PROGRESS_BACKEND == "redis":
+        return RedisBroadcast(settings.PROGRESS_REDIS_URL)
+    if settings.PROGRESS_BACKEND == "database":
+        return DatabaseBroadcast()
+    return Broadcast()
+
+
+broadcast = create_broadcast()
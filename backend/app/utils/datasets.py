@@ -0,0 +1,358 @@
+from __future__ import annotations
+
+import os
+import csv
+import json
+import shutil
+import asyncio
+import hashlib
+import uuid
+from typing import Any, Dict, List, Optional
+
+from fastapi import UploadFile
+
+from backend.app.core.config import settings
+from backend.app.utils.lazy import LazyModule
+
+# Only parsing and reading datasets needs these; spooling uploads does not
+np = LazyModule("numpy")
+pd = LazyModule("pandas")
+
+os.makedirs(settings.UPLOAD_DIR, exist_ok=True)
+os.makedirs(settings.DATASET_DIR, exist_ok=True)
+
+
+class DatasetTooLargeError(Exception):
+    pass
+
+
+class SpooledCSV:
+    def __init__(self, path: str, sha256: str, size: int, rows: int, columns: List[str]):
+        self.path = path
+        self.sha256 = sha256
+        self.size = size
+        self.rows = rows
+        self.columns = columns
+
+    def discard(self):
+        discard_spool(self.path)
+
+
+def _new_spool_path() -> str:
+    return os.path.join(settings.UPLOAD_DIR, f"upload_{uuid.uuid4().hex}.csv")
+
+
+def discard_spool(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _read_header(path: str) -> List[str]:
+    with open(path, newline="", encoding="utf-8", errors="replace") as f:
+        return next(csv.reader(f), [])
+
+
+class _SpoolWriter:
+    # Writes chunks to the spool file while enforcing the byte and row caps. Rows are
+    # counted as line breaks, which is exact for CSVs without quoted newlines and an
+    # overestimate otherwise; the worker enforces the row cap exactly when parsing.
+    def __init__(self):
+        self.path = _new_spool_path()
+        self.size = 0
+        self.newlines = 0
+        self.ends_with_newline = True
+        self._hash = hashlib.sha256()
+        self._file = open(self.path, "wb")
+
+    def write(self, chunk: bytes):
+        self.size += len(chunk)
+        if self.size > settings.UPLOAD_MAX_BYTES:
+            raise DatasetTooLargeError(f"Dataset exceeds {settings.UPLOAD_MAX_BYTES} bytes")
+        self.newlines += chunk.count(b"\n")
+        if self.newlines > settings.UPLOAD_MAX_ROWS + 1:
+            raise DatasetTooLargeError(f"Dataset exceeds {settings.UPLOAD_MAX_ROWS} rows")
+        self._file.write(chunk)
+        self._hash.update(chunk)
+        self.ends_with_newline = chunk.endswith(b"\n")
+
+    def finish(self) -> SpooledCSV:
+        self._file.close()
+        lines = self.newlines + (0 if self.ends_with_newline or self.size == 0 else 1)
+        return SpooledCSV(self.path, self._hash.hexdigest(), self.size, max(lines - 1, 0), _read_header(self.path))
+
+    def abort(self):
+        self._file.close()
+        discard_spool(self.path)
+
+
+async def spool_upload(upload: UploadFile) -> SpooledCSV:
+    writer = _SpoolWriter()
+    try:
+        while True:
+            chunk = await upload.read(settings.UPLOAD_CHUNK_BYTES)
+            if not chunk:
+                break
+            await asyncio.to_thread(writer.write, chunk)
+        return await asyncio.to_thread(writer.finish)
+    except BaseException:
+        writer.abort()
+        raise
+
+
+def spool_bytes(data: bytes) -> SpooledCSV:
+    writer = _SpoolWriter()
+    try:
+        for start in range(0, len(data), settings.UPLOAD_CHUNK_BYTES):
+            writer.write(data[start:start + settings.UPLOAD_CHUNK_BYTES])
+        return writer.finish()
+    except BaseException:
+        writer.abort()
+        raise
+
+
+def _column_dtype(dtype) -> str:
+    # Integer columns stay integers, so that e.g. class labels keep their type
+    if pd.api.types.is_bool_dtype(dtype) or not pd.api.types.is_numeric_dtype(dtype):
+        return "object"
+    return "int64" if pd.api.types.is_integer_dtype(dtype) else "float64"
+
+
+def infer_csv_dtypes(path: str, sample_rows: int = 1000) -> Dict[str, str]:
+    # Fix every column's dtype from a sample so that chunks parse consistently and
+    # pandas does not re-infer (or fall back to mixed object columns) per chunk.
+    sample = pd.read_csv(path, nrows=sample_rows)
+    return {column: _column_dtype(dtype) for column, dtype in sample.dtypes.items()}
+
+
+DTYPE_WIDTH = ("int64", "float64", "object")
+
+
+def scan_csv_dtypes(path: str) -> Dict[str, str]:
+    # The widest dtype each column has in any chunk of the whole file: for files whose
+    # first rows are not representative (text or missing values further down)
+    dtypes: Dict[str, str] = {}
+    for chunk in pd.read_csv(path, chunksize=settings.CSV_CHUNK_ROWS):
+        for column, dtype in chunk.dtypes.items():
+            dtypes[column] = max(dtypes.get(column, "int64"), _column_dtype(dtype), key=DTYPE_WIDTH.index)
+    return dtypes
+
+
+def _parse_with_inferred_dtypes(parse, path: str, dtypes: Optional[Dict[str, str]]):
+    # Dtypes given by the caller are used as they are. Inferred ones come from a
+    # sample first, and from a scan of the whole file if the sample's do not parse it.
+    if dtypes:
+        return parse(dtypes)
+    try:
+        return parse(infer_csv_dtypes(path))
+    except (ValueError, OverflowError):
+        return parse(scan_csv_dtypes(path))
+
+
+def _read_csv_chunked(path: str, dtypes: Dict[str, str], max_rows: int) -> pd.DataFrame:
+    chunks = []
+    rows = 0
+    for chunk in pd.read_csv(path, dtype=dtypes, chunksize=settings.CSV_CHUNK_ROWS):
+        rows += len(chunk)
+        if rows > max_rows:
+            raise DatasetTooLargeError(f"Dataset exceeds {max_rows} rows")
+        chunks.append(chunk)
+    if not chunks:
+        raise ValueError("Dataset is empty")
+    return pd.concat(chunks, ignore_index=True, copy=False)
+
+
+def read_csv_chunked(path: str, dtypes: Optional[Dict[str, str]] = None, max_rows: Optional[int] = None) -> pd.DataFrame:
+    max_rows = max_rows if max_rows is not None else settings.UPLOAD_MAX_ROWS
+    return _parse_with_inferred_dtypes(lambda d: _read_csv_chunked(path, d, max_rows), path, dtypes)
+
+
+# Columnar dataset store. A dataset is stored once per content hash as one raw
+# binary file per column plus a meta.json: numeric columns as float64, text columns
+# dictionary-encoded as int32 codes (-1 for missing) with their categories in a
+# side file. Columns are opened with np.memmap, so repeated trainings and concurrent
+# workers share the page cache instead of re-parsing the CSV.
+
+def dataset_path(dataset_id: str) -> str:
+    if len(dataset_id) != 64 or any(c not in "0123456789abcdef" for c in dataset_id):
+        raise ValueError("Invalid dataset id")
+    return os.path.join(settings.DATASET_DIR, dataset_id)
+
+
+def dataset_exists(dataset_id: str) -> bool:
+    return os.path.exists(os.path.join(dataset_path(dataset_id), "meta.json"))
+
+
+def read_dataset_meta(dataset_id: str) -> Dict[str, Any]:
+    with open(os.path.join(dataset_path(dataset_id), "meta.json"), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _storage_dtype(dtype: str) -> str:
+    return _column_dtype(pd.api.types.pandas_dtype(dtype))
+
+
+def ingest_csv(csv_path: str, dataset_id: str, dtypes: Optional[Dict[str, str]] = None, max_rows: Optional[int] = None) -> Dict[str, Any]:
+    max_rows = max_rows if max_rows is not None else settings.UPLOAD_MAX_ROWS
+    return _parse_with_inferred_dtypes(lambda d: _ingest_csv(csv_path, dataset_id, d, max_rows), csv_path, dtypes)
+
+
+def _ingest_csv(csv_path: str, dataset_id: str, dtypes: Dict[str, str], max_rows: int) -> Dict[str, Any]:
+    # Parse integer columns as int64, other numeric ones as float64 and everything
+    # else as text
+    parse_dtypes = {name: _storage_dtype(dtype) for name, dtype in dtypes.items()}
+    target = dataset_path(dataset_id)
+    tmp = f"{target}.tmp-{uuid.uuid4().hex}"
+    os.makedirs(tmp)
+    try:
+        files = {}
+        categories: Dict[str, Dict[str, int]] = {}
+        rows = 0
+        for chunk in pd.read_csv(csv_path, dtype=parse_dtypes, chunksize=settings.CSV_CHUNK_ROWS):
+            rows += len(chunk)
+            if rows > max_rows:
+                raise DatasetTooLargeError(f"Dataset exceeds {max_rows} rows")
+            for i, name in enumerate(chunk.columns):
+                if name not in files:
+                    files[name] = open(os.path.join(tmp, f"c{i}.bin"), "wb")
+                series = chunk[name]
+                if parse_dtypes.get(name) == "int64":
+                    series.to_numpy(dtype=np.int64).tofile(files[name])
+                    continue
+                if parse_dtypes.get(name) == "float64":
+                    series.to_numpy(dtype=np.float64, na_value=np.nan).tofile(files[name])
+                    continue
+                # Map chunk-local category codes onto the dataset-wide dictionary
+                lookup = categories.setdefault(name, {})
+                local = pd.Categorical(series)
+                local_to_global = np.array([lookup.setdefault(v, len(lookup)) for v in local.categories], dtype=np.int32)
+                codes = np.full(len(local), -1, dtype=np.int32)
+                present = local.codes >= 0
+                codes[present] = local_to_global[local.codes[present]]
+                codes.tofile(files[name])
+        for f in files.values():
+            f.close()
+        if rows == 0:
+            raise ValueError("Dataset is empty")
+
+        columns = []
+        for i, name in enumerate(files):
+            column = {"name": name, "file": f"c{i}.bin"}
+            if name in categories:
+                column.update(kind="categorical", dtype="int32", categories_file=f"c{i}.categories.json")
+                with open(os.path.join(tmp, column["categories_file"]), "w", encoding="utf-8") as f:
+                    json.dump(list(categories[name]), f)
+            else:
+                column.update(kind="numeric", dtype=parse_dtypes.get(name, "float64"))
+            columns.append(column)
+        meta = {"id": dataset_id, "rows": rows, "columns": columns}
+        with open(os.path.join(tmp, "meta.json"), "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+        try:
+            os.rename(tmp, target)
+        except OSError:
+            # Another worker stored the same content first
+            if not dataset_exists(dataset_id):
+                raise
+            shutil.rmtree(tmp, ignore_errors=True)
+        return meta
+    except BaseException:
+        for f in files.values():
+            f.close()
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+
+def open_columns(dataset_id: str, meta: Optional[Dict[str, Any]] = None) -> Dict[str, np.ndarray]:
+    meta = meta or read_dataset_meta(dataset_id)
+    base = dataset_path(dataset_id)
+    return {
+        column["name"]: np.memmap(os.path.join(base, column["file"]), dtype=column["dtype"], mode="r", shape=(meta["rows"],))
+        for column in meta["columns"]
+    }
+
+
+def read_categories(dataset_id: str, column: Dict[str, Any]) -> List[str]:
+    with open(os.path.join(dataset_path(dataset_id), column["categories_file"]), encoding="utf-8") as f:
+        return json.load(f)
+
+
+def load_dataset(dataset_id: str) -> pd.DataFrame:
+    meta = read_dataset_meta(dataset_id)
+    arrays = open_columns(dataset_id, meta)
+    data = {}
+    for column in meta["columns"]:
+        values = arrays[column["name"]]
+        if column["kind"] == "categorical":
+            data[column["name"]] = pd.Categorical.from_codes(values, read_categories(dataset_id, column))
+        else:
+            data[column["name"]] = values
+    return pd.DataFrame(data, copy=False)
+
+
+class DatasetChunks:
+    # Row ranges of a stored dataset as DataFrames. Only the requested slice of each
+    # memory-mapped column is materialized.
+    def __init__(self, dataset_id: str):
+        meta = read_dataset_meta(dataset_id)
+        self.rows = meta["rows"]
+        self.columns = [column["name"] for column in meta["columns"]]
+        self._arrays = open_columns(dataset_id, meta)
+        self._categories = {
+            column["name"]: pd.Index(read_categories(dataset_id, column))
+            for column in meta["columns"] if column["kind"] == "categorical"
+        }
+
+    def read(self, start: int, stop: int) -> pd.DataFrame:
+        data = {}
+        for name in self.columns:
+            values = self._arrays[name][start:stop]
+            if name in self._categories:
+                data[name] = pd.Categorical.from_codes(values, self._categories[name])
+            else:
+                data[name] = values
+        return pd.DataFrame(data, copy=False)
+
+
+class FrameChunks:
+    # The same interface over an in-memory DataFrame (manual records, plain CSVs)
+    def __init__(self, data: pd.DataFrame):
+        self.data = data
+        self.rows = len(data)
+        self.columns = list(data.columns)
+
+    def read(self, start: int, stop: int) -> pd.DataFrame:
+        return self.data.iloc[start:stop]
+
+
+def _ensure_dataset(source: Dict[str, Any], progress=None):
+    if not dataset_exists(source["dataset_id"]):
+        if "csv_path" not in source or not os.path.exists(source["csv_path"]):
+            raise ValueError("Dataset is not available")
+        if progress is not None:
+            progress("ingest", 2)
+        ingest_csv(source["csv_path"], source["dataset_id"], source.get("dtypes"))
+
+
+def open_source_chunks(source: Dict[str, Any], progress=None):
+    if "dataset_id" in source:
+        _ensure_dataset(source, progress)
+        return DatasetChunks(source["dataset_id"])
+    return FrameChunks(load_source(source, progress))
+
+
+def load_source(source: Dict[str, Any], progress=None) -> pd.DataFrame:
+    # `source` is the JSON-serializable description of a training job's data that is
+    # passed to the worker process in place of a DataFrame.
+    if "dataset_id" in source:
+        _ensure_dataset(source, progress)
+        return load_dataset(source["dataset_id"])
+    if "csv_path" in source:
+        return read_csv_chunked(source["csv_path"], source.get("dtypes"))
+    return pd.DataFrame(source["records"])
+
+
+def discard_source(source: Dict[str, Any]):
+    if source.get("spooled"):
+        discard_spool(source["csv_path"])
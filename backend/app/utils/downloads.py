@@ -0,0 +1,61 @@
+import os
+from typing import Iterator, Optional, Tuple
+
+from fastapi import HTTPException
+from fastapi.responses import StreamingResponse
+
+from backend.app.core.config import settings
+
+
+class RangeNotSatisfiableError(ValueError):
+    pass
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    # A single "bytes=start-end", "bytes=start-" or "bytes=-suffix" range as an
+    # inclusive (start, end); None for the whole file. Multiple ranges and other
+    # units are answered with the whole file, which RFC 9110 allows.
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    start, _, end = header[len("bytes="):].strip().partition("-")
+    if not (start or end) or any(part and not part.isdigit() for part in (start, end)):
+        return None
+    if not start:
+        # Suffix range: the last `end` bytes
+        if int(end) == 0 or size == 0:
+            raise RangeNotSatisfiableError(header)
+        return max(size - int(end), 0), size - 1
+    first = int(start)
+    last = min(int(end), size - 1) if end else size - 1
+    if first >= size or first > last:
+        raise RangeNotSatisfiableError(header)
+    return first, last
+
+
+def _read_file(path: str, start: int, length: int) -> Iterator[bytes]:
+    with open(path, "rb") as f:
+        f.seek(start)
+        while length > 0:
+            data = f.read(min(settings.DOWNLOAD_CHUNK_BYTES, length))
+            if not data:
+                break
+            length -= len(data)
+            yield data
+
+
+def file_response(path: str, range_header: Optional[str], filename: str, media_type: str) -> StreamingResponse:
+    # Streams `path`, or the requested byte range of it with 206 Partial Content, so
+    # that interrupted downloads of large result files can be resumed
+    size = os.path.getsize(path)
+    headers = {"Accept-Ranges": "bytes", "Content-Disposition": f'attachment; filename="{filename}"'}
+    try:
+        byte_range = parse_range(range_header, size)
+    except RangeNotSatisfiableError:
+        raise HTTPException(status_code=416, detail="Requested range not satisfiable", headers={"Content-Range": f"bytes */{size}"})
+    if byte_range is None:
+        headers["Content-Length"] = str(size)
+        return StreamingResponse(_read_file(path, 0, size), media_type=media_type, headers=headers)
+    start, end = byte_range
+    headers["Content-Range"] = f"bytes {start}-{end}/{size}"
+    headers["Content-Length"] = str(end - start + 1)
+    return StreamingResponse(_read_file(path, start, end - start + 1), status_code=206, media_type=media_type, headers=headers)
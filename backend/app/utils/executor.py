@@ -0,0 +1,267 @@
+import asyncio
+import importlib
+import logging
+import multiprocessing
+import os
+import signal
+from collections import Counter, deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Union
+
+from backend.app.core.config import settings
+from backend.app.utils.metrics import Gauge
+
+logger = logging.getLogger(__name__)
+
+
+class ExecutorFullError(Exception):
+    pass
+
+
+class UserLimitError(Exception):
+    pass
+
+
+class JobCancelledError(Exception):
+    pass
+
+
+class JobFailedError(Exception):
+    pass
+
+
+class _PipeProgress:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __call__(self, stage: str, percent: int):
+        self.conn.send(("progress", (stage, percent)))
+
+
+def resolve_function(path: str) -> Callable[..., Any]:
+    module, _, name = path.partition(":")
+    return getattr(importlib.import_module(module), name)
+
+
+def _child_main(conn, fn, args, kwargs, report_progress):
+    if hasattr(os, "setpgrp"):
+        # Own process group, so that cancellation also reaches processes the job
+        # starts itself (e.g. the pool of a hyperparameter sweep)
+        os.setpgrp()
+    try:
+        if report_progress:
+            kwargs["progress"] = _PipeProgress(conn)
+        if isinstance(fn, str):
+            fn = resolve_function(fn)
+        result = fn(*args, **kwargs)
+    except BaseException as e:
+        conn.send(("error", str(e)))
+    else:
+        conn.send(("result", result))
+    finally:
+        conn.close()
+
+
+def _receive(conn):
+    try:
+        return conn.recv()
+    except EOFError:
+        return None
+
+
+class JobHandle:
+    # `runner` does the DB bookkeeping on the event loop; `run` executes the CPU-bound
+    # part in a dedicated worker process so that it can be killed on cancellation.
+    def __init__(self, job_id: int, user_id: int, runner: Callable[["JobHandle"], Awaitable[None]], on_drop: Optional[Callable[[], None]] = None):
+        self.job_id = job_id
+        self.user_id = user_id
+        self.runner = runner
+        self.on_drop = on_drop
+        self.cancelled = False
+        self.task: Optional[asyncio.Task] = None
+        self._process = None
+
+    async def run(self, fn: Union[Callable[..., Any], str], *args, on_progress: Optional[Callable[[str, int], Awaitable[None]]] = None, **kwargs) -> Any:
+        # With `on_progress`, `fn` receives a `progress(stage, percent)` callable whose
+        # calls in the worker process are forwarded to `on_progress` on the event loop.
+        # `fn` may also be a "module:function" path, imported in the worker process.
+        if self.cancelled:
+            raise JobCancelledError("Training cancelled")
+        ctx = multiprocessing.get_context(settings.TRAINING_START_METHOD)
+        parent_conn, child_conn = ctx.Pipe(duplex=False)
+        process = ctx.Process(target=_child_main, args=(child_conn, fn, args, kwargs, on_progress is not None), daemon=False)
+        process.start()
+        child_conn.close()
+        self._process = process
+        try:
+            while True:
+                message = await asyncio.to_thread(_receive, parent_conn)
+                if message is None or message[0] != "progress":
+                    break
+                if not self.cancelled:
+                    await on_progress(*message[1])
+        except asyncio.CancelledError:
+            self.kill()
+            raise
+        finally:
+            await asyncio.to_thread(process.join)
+            self._process = None
+        if self.cancelled:
+            raise JobCancelledError("Training cancelled")
+        if message is None:
+            raise JobFailedError(f"Training process exited unexpectedly (exit code {process.exitcode})")
+        kind, payload = message
+        if kind == "error":
+            raise JobFailedError(payload)
+        return payload
+
+    def drop(self):
+        # Called for a job that is cancelled before it ever started
+        self.cancelled = True
+        if self.on_drop is not None:
+            self.on_drop()
+
+    def kill(self):
+        self.cancelled = True
+        process = self._process
+        if process is None or not process.is_alive():
+            return
+        if hasattr(os, "killpg"):
+            try:
+                os.killpg(process.pid, signal.SIGTERM)
+                return
+            except ProcessLookupError:
+                pass
+        process.terminate()
+
+
+class TrainingExecutor:
+    # At most `max_workers` jobs run at once and at most `max_jobs_per_user` per user.
+    # With the "reject" policy a user over the limit is refused, with "queue" their
+    # jobs wait in the bounded pending queue while other users' jobs are dispatched.
+    def __init__(self, max_workers: int, max_pending: int, max_jobs_per_user: int, user_limit_policy: str = "queue"):
+        self.max_workers = max(1, max_workers)
+        self.max_pending = max_pending
+        self.max_jobs_per_user = max(1, max_jobs_per_user)
+        self.user_limit_policy = user_limit_policy
+        self._pending: Deque[JobHandle] = deque()
+        self._running: Dict[int, JobHandle] = {}
+        self._reserved: Counter = Counter()
+        self._closed = False
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._pending)
+
+    @property
+    def running(self) -> int:
+        return len(self._running)
+
+    @property
+    def free_slots(self) -> int:
+        return max(self.max_workers - len(self._running) - len(self._pending), 0)
+
+    def job_ids(self) -> List[int]:
+        return [*self._running, *(h.job_id for h in self._pending)]
+
+    def _running_for_user(self, user_id: int) -> int:
+        return sum(1 for h in self._running.values() if h.user_id == user_id)
+
+    def _active_for_user(self, user_id: int) -> int:
+        return self._running_for_user(user_id) + sum(1 for h in self._pending if h.user_id == user_id)
+
+    def check_admission(self, user_id: int, count: int = 1):
+        if self._closed:
+            raise ExecutorFullError("Training executor is shutting down")
+        if self.user_limit_policy == "reject" and self._active_for_user(user_id) + self._reserved[user_id] + count > self.max_jobs_per_user:
+            raise UserLimitError(f"At most {self.max_jobs_per_user} concurrent trainings per user")
+        free_slots = max(self.max_workers - len(self._running), 0)
+        if len(self._pending) + sum(self._reserved.values()) + count > self.max_pending + free_slots:
+            raise ExecutorFullError("Training queue is full")
+
+    def reserve(self, user_id: int, count: int = 1):
+        # Holds room for jobs whose rows are still being written, so that concurrent
+        # requests cannot take it before they are submitted with reserved=True
+        self.check_admission(user_id, count)
+        self._reserved[user_id] += count
+
+    def release(self, user_id: int, count: int = 1):
+        self._reserved[user_id] -= count
+        if self._reserved[user_id] <= 0:
+            del self._reserved[user_id]
+
+    def submit(self, job_id: int, user_id: int, runner: Callable[[JobHandle], Awaitable[None]], on_drop: Optional[Callable[[], None]] = None, reserved: bool = False) -> JobHandle:
+        if reserved:
+            self.release(user_id)
+        self.check_admission(user_id)
+        handle = JobHandle(job_id, user_id, runner, on_drop)
+        self._pending.append(handle)
+        self._dispatch()
+        return handle
+
+    def _dispatch(self):
+        while len(self._running) < self.max_workers:
+            handle = next((h for h in self._pending if self._running_for_user(h.user_id) < self.max_jobs_per_user), None)
+            if handle is None:
+                return
+            self._pending.remove(handle)
+            self._running[handle.job_id] = handle
+            handle.task = asyncio.create_task(self._run(handle))
+
+    async def _run(self, handle: JobHandle):
+        try:
+            await handle.runner(handle)
+        except Exception:
+            logger.exception("Training job %s crashed", handle.job_id)
+        finally:
+            self._running.pop(handle.job_id, None)
+            if not self._closed:
+                self._dispatch()
+
+    def cancel(self, job_id: int) -> bool:
+        for handle in self._pending:
+            if handle.job_id == job_id:
+                self._pending.remove(handle)
+                handle.drop()
+                return True
+        handle = self._running.get(job_id)
+        if handle is None:
+            return False
+        handle.kill()
+        return True
+
+    async def drain(self, timeout: float):
+        # Stop dispatching and give running jobs `timeout` seconds to finish. Jobs still
+        # running after that are interrupted without recording a final status, so
+        # that a durable queue can hand them to another worker.
+        self._closed = True
+        self._pending.clear()
+        tasks = [handle.task for handle in self._running.values() if handle.task is not None]
+        if not tasks:
+            return
+        _, unfinished = await asyncio.wait(tasks, timeout=timeout)
+        for task in unfinished:
+            task.cancel()
+        await asyncio.gather(*unfinished, return_exceptions=True)
+
+    async def shutdown(self):
+        self._closed = True
+        for handle in self._pending:
+            handle.drop()
+        self._pending.clear()
+        tasks = []
+        for handle in list(self._running.values()):
+            handle.kill()
+            if handle.task is not None:
+                tasks.append(handle.task)
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+training_executor = TrainingExecutor(
+    max_workers=settings.TRAINING_MAX_WORKERS,
+    max_pending=settings.TRAINING_MAX_PENDING,
+    max_jobs_per_user=settings.TRAINING_MAX_JOBS_PER_USER,
+    user_limit_policy=settings.TRAINING_USER_LIMIT_POLICY,
+)
+
+Gauge("training_queue_depth", "Training jobs waiting for a worker slot.", callback=lambda: training_executor.queue_depth)
+Gauge("training_jobs_running", "Training jobs currently running.", callback=lambda: training_executor.running)
@@ -0,0 +1,126 @@
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import SGDClassifier
+
+from backend.app.core.config import settings
+from backend.app.utils.datasets import open_source_chunks
+from backend.app.utils.model import ProgressCallback, _no_progress, load_base_model, make_pipeline, make_preprocessor, save_model
+
+
+def metrics_from_confusion(confusion: np.ndarray) -> Dict[str, float]:
+    # Same metrics as classification_metrics: binary scores for the second class,
+    # macro averages with more classes
+    total = confusion.sum()
+    true_positive = np.diag(confusion).astype(np.float64)
+    predicted = confusion.sum(axis=0)
+    actual = confusion.sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        precision = np.where(predicted > 0, true_positive / predicted, 0.0)
+        recall = np.where(actual > 0, true_positive / actual, 0.0)
+        f1 = np.where(precision + recall > 0, 2 * precision * recall / (precision + recall), 0.0)
+    pick = (lambda values: float(values[1])) if len(confusion) == 2 else (lambda values: float(values.mean()))
+    return {
+        "accuracy": float(true_positive.sum() / total) if total else 0.0,
+        "precision": pick(precision),
+        "recall": pick(recall),
+        "f1_score": pick(f1),
+    }
+
+
+def fit_incremental_and_save(parameters: dict, source: dict, version: int, progress: Optional[ProgressCallback] = None, base_version: Optional[int] = None) -> Tuple[str, Dict[str, Any]]:
+    # Out-of-core training: the dataset is only ever read `chunk_rows` rows at a time
+    # (memory-mapped when stored), first to fit the preprocessor and collect the
+    # classes, then once per epoch through SGDClassifier.partial_fit, and finally to
+    # score the model. Peak memory depends on the chunk size, not the dataset size.
+    progress = progress or _no_progress
+    options = parameters.get("incremental", {})
+    epochs = max(1, int(options.get("epochs", settings.INCREMENTAL_EPOCHS)))
+    chunk_rows = max(1, int(options.get("chunk_rows", settings.INCREMENTAL_CHUNK_ROWS)))
+    shuffle = options.get("shuffle", True)
+    rng = np.random.default_rng(options.get("random_state"))
+
+    progress("load", 1)
+    base = load_base_model(base_version) if base_version is not None else None
+    if base is not None and not isinstance(base.named_steps["model"], SGDClassifier):
+        raise ValueError("Incremental training can only continue from an incremental model")
+    chunks = open_source_chunks(source, progress)
+    target = parameters.get("target_column")
+    if not target or target not in chunks.columns:
+        raise ValueError("Target column not found in data")
+    features = [name for name in chunks.columns if name != target]
+    bounds = [(start, min(start + chunk_rows, chunks.rows)) for start in range(0, chunks.rows, chunk_rows)]
+    if not bounds:
+        raise ValueError("Dataset is empty")
+
+    def read(bound: Tuple[int, int]) -> Tuple[pd.DataFrame, np.ndarray]:
+        chunk = chunks.read(*bound)
+        y = chunk[target].to_numpy()
+        labelled = pd.notna(y)
+        if not labelled.all():
+            chunk, y = chunk[labelled], y[labelled]
+        return chunk[features], y
+
+    progress("scan", 5)
+    labels = set()
+
+    def scan():
+        for bound in bounds:
+            X, y = read(bound)
+            labels.update(pd.unique(y).tolist())
+            yield X
+
+    if base is not None:
+        # Continue from the base model: same fitted preprocessor, same classes, and
+        # partial_fit picks up from its coefficients
+        preprocessor = base.named_steps["preprocess"]
+        for _ in scan():
+            pass
+        model = base.named_steps["model"]
+        classes = model.classes_
+        if not labels <= set(classes.tolist()):
+            raise ValueError("Target classes differ from the base model's classes")
+        if parameters.get("model_params"):
+            model.set_params(**parameters["model_params"])
+    else:
+        preprocessor = make_preprocessor(parameters)
+        preprocessor.fit_chunks(scan())
+        classes = np.array(sorted(labels))
+        if len(classes) < 2:
+            raise ValueError("Target column must contain at least two classes")
+        model_params = {"loss": "log_loss", "random_state": options.get("random_state"), **parameters.get("model_params", {})}
+        model = SGDClassifier(**model_params)
+    history: List[Dict[str, Any]] = []
+    steps = epochs * len(bounds)
+    for epoch in range(epochs):
+        order = rng.permutation(len(bounds)) if shuffle else range(len(bounds))
+        correct = scored = 0
+        for i, index in enumerate(order):
+            X, y = read(bounds[index])
+            if not len(y):
+                continue
+            Xt = preprocessor.transform(X)
+            if shuffle:
+                rows = rng.permutation(len(y))
+                Xt, y = Xt[rows], y[rows]
+            if hasattr(model, "coef_"):
+                # Progressive validation: score each chunk before learning from it
+                correct += int((model.predict(Xt) == y).sum())
+                scored += len(y)
+            model.partial_fit(Xt, y, classes=classes)
+            progress("fit", 10 + int(70 * (epoch * len(bounds) + i + 1) / steps))
+        history.append({"epoch": epoch + 1, "progressive_accuracy": correct / scored if scored else None})
+
+    progress("metrics", 80)
+    confusion = np.zeros((len(classes), len(classes)), dtype=np.int64)
+    for bound in bounds:
+        X, y = read(bound)
+        if not len(y):
+            continue
+        y_pred = model.predict(preprocessor.transform(X))
+        np.add.at(confusion, (np.searchsorted(classes, y), np.searchsorted(classes, y_pred)), 1)
+    summary: Dict[str, Any] = {**metrics_from_confusion(confusion), "mode": "incremental", "rows": chunks.rows, "epochs": history}
+
+    progress("save", 90)
+    return save_model(make_pipeline(preprocessor, model), version), summary
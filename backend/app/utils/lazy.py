@@ -0,0 +1,36 @@
+import importlib
+from typing import Tuple
+
+# The ML stack (pandas, scikit-learn, ...) takes seconds and hundreds of MB to
+# import. API code paths that do not train or predict must not pay for it, so
+# modules on those paths reference it through LazyModule or import it locally.
+
+ML_MODULES: Tuple[str, ...] = (
+    "numpy",
+    "pandas",
+    "scipy.sparse",
+    "joblib",
+    "sklearn.linear_model",
+    "sklearn.pipeline",
+    "backend.app.utils.model",
+    "backend.app.utils.incremental",
+    "backend.app.utils.scoring",
+    "backend.app.utils.sweep",
+)
+
+
+class LazyModule:
+    # Stands in for a module until one of its attributes is first used
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str):
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+
+def preload_ml():
+    for name in ML_MODULES:
+        importlib.import_module(name)
@@ -1,45 +1,119 @@
-import os
 import joblib
+import numpy as np
 import pandas as pd
 from sklearn.linear_model import LogisticRegression
 from sklearn.metrics import accuracy_score, precision_score, recall_score, f1_score
-from typing import Tuple, Dict
-from tempfile import NamedTemporaryFile
+from sklearn.pipeline import Pipeline
+from typing import Tuple, Dict, Callable, Optional
+from backend.app.core.config import settings
+from backend.app.utils.artifacts import ArtifactNotFoundError, artifact_store, joblib_compression, model_key
+from backend.app.utils.datasets import load_source
+from backend.app.utils.preprocessing import TabularPreprocessor
 
-MODEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "../../models")
+ProgressCallback = Callable[[str, int], None]
 
-os.makedirs(MODEL_DIR, exist_ok=True)
+def _no_progress(stage: str, percent: int):
+    pass
 
-def train_model(parameters: dict, data: pd.DataFrame) -> Tuple[LogisticRegression, Dict[str, float]]:
+def train_model(parameters: dict, data: pd.DataFrame, progress: Optional[ProgressCallback] = None, base: Optional[Pipeline] = None) -> Tuple[Pipeline, Dict[str, float]]:
+    progress = progress or _no_progress
     # Example: Train logistic regression with parameters
+    progress("prepare", 5)
     target = parameters.get("target_column")
     if not target or target not in data.columns:
         raise ValueError("Target column not found in data")
     
     X = data.drop(columns=[target])
-    y = data[target]
+    y = data[target].to_numpy()
+    del data
 
-    model = LogisticRegression(**parameters.get("model_params", {}))
-    model.fit(X, y)
+    progress("preprocess", 7)
+    if base is not None:
+        # Same feature space as the base model, so that its coefficients still apply
+        preprocessor = base.named_steps["preprocess"]
+        fitted = hasattr(preprocessor, "numeric_columns_")
+        Xt = preprocessor.transform(X) if fitted else preprocessor.fit_transform(X)
+    else:
+        preprocessor = make_preprocessor(parameters)
+        Xt = preprocessor.fit_transform(X)
+    del X
 
-    y_pred = model.predict(X)
-    metrics = {
+    progress("fit", 10)
+    if base is not None:
+        model = warm_start_estimator(base.named_steps["model"], parameters, Xt, y)
+    else:
+        model = LogisticRegression(**parameters.get("model_params", {}))
+    model.fit(Xt, y)
+
+    progress("metrics", 80)
+    y_pred = model.predict(Xt)
+    return make_pipeline(preprocessor, model), classification_metrics(y, y_pred)
+
+def make_preprocessor(parameters: dict) -> TabularPreprocessor:
+    options = parameters.get("preprocessing", {})
+    return TabularPreprocessor(
+        hash_threshold=options.get("hash_threshold", settings.PREPROCESS_HASH_THRESHOLD),
+        hash_features=options.get("hash_features", settings.PREPROCESS_HASH_FEATURES),
+    )
+
+def make_pipeline(preprocessor: TabularPreprocessor, model) -> Pipeline:
+    # Saved as one artifact, so prediction reuses the transformer fitted for this version
+    return Pipeline([("preprocess", preprocessor), ("model", model)])
+
+def classification_metrics(y, y_pred) -> Dict[str, float]:
+    return {
         "accuracy": accuracy_score(y, y_pred),
         "precision": precision_score(y, y_pred, zero_division=0),
         "recall": recall_score(y, y_pred, zero_division=0),
         "f1_score": f1_score(y, y_pred, zero_division=0),
     }
-    return model, metrics
+
+def load_base_model(version: int) -> Pipeline:
+    # Not memory-mapped: warm starts update the coefficients in place
+    model = load_model(version, writable=True)
+    if not isinstance(model, Pipeline):
+        # Saved before preprocessing was part of the artifact: fitted on the raw
+        # numeric columns, which is what a freshly fitted preprocessor reproduces
+        model = make_pipeline(TabularPreprocessor(), model)
+    return model
+
+def warm_start_estimator(estimator, parameters: dict, Xt, y):
+    # Refit the base estimator in place starting from its coefficients; lbfgs and
+    # SGD then typically converge in a fraction of the iterations
+    if not hasattr(estimator, "warm_start"):
+        raise ValueError(f"{type(estimator).__name__} models cannot be warm-started")
+    classes = np.unique(y)
+    if len(classes) != len(estimator.classes_) or not np.all(classes == estimator.classes_):
+        raise ValueError("Target classes differ from the base model's classes")
+    if Xt.shape[1] != estimator.coef_.shape[1]:
+        raise ValueError("Features differ from the base model's features")
+    estimator.set_params(warm_start=True, **parameters.get("model_params", {}))
+    return estimator
 
 def save_model(model, version: int) -> str:
-    filename = f"model_v{version}.joblib"
-    filepath = os.path.join(MODEL_DIR, filename)
-    joblib.dump(model, filepath)
-    return filepath
-
-def load_model(version: int):
-    filename = f"model_v{version}.joblib"
-    filepath = os.path.join(MODEL_DIR, filename)
-    if not os.path.exists(filepath):
+    key = model_key(version)
+    with artifact_store.writing(key) as path:
+        joblib.dump(model, path, compress=joblib_compression(settings.MODEL_COMPRESSION))
+    return artifact_store.uri(key)
+
+def fit_and_save(parameters: dict, source: dict, version: int, progress: Optional[ProgressCallback] = None, base_version: Optional[int] = None) -> Tuple[str, Dict[str, float]]:
+    # Entry point of the training worker process: the dataset is parsed here and the
+    # fitted estimator stays here; only its path and the metrics go back to the API.
+    progress = progress or _no_progress
+    progress("load", 1)
+    base = load_base_model(base_version) if base_version is not None else None
+    data = load_source(source, progress)
+    model, metrics = train_model(parameters, data, progress, base)
+    progress("save", 90)
+    return save_model(model, version), metrics
+
+def load_model(version: int, writable: bool = False):
+    # Uncompressed artifacts are memory-mapped (MODEL_MMAP_MODE): large coefficient
+    # arrays are paged in on use and shared between processes loading the same
+    # version. joblib ignores mmap_mode for compressed artifacts.
+    mmap_mode = None if writable else settings.MODEL_MMAP_MODE or None
+    try:
+        path = artifact_store.local_path(model_key(version))
+    except ArtifactNotFoundError:
         raise FileNotFoundError(f"Model version {version} not found")
-    return joblib.load(filepath)
+    return joblib.load(path, mmap_mode=mmap_mode)
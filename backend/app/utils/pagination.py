@@ -0,0 +1,50 @@
+import base64
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+from fastapi import HTTPException, Response
+from sqlalchemy import String, literal, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    return base64.urlsafe_b64encode(f"{timestamp.isoformat()}|{row_id}".encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        timestamp, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def _timestamp_param(db: AsyncSession, column, value: datetime):
+    if db.bind.dialect.name == "sqlite":
+        # SQLite keeps server-side timestamps as 'YYYY-MM-DD HH:MM:SS' text and ones
+        # written by SQLAlchemy with microseconds; compare against the same text so
+        # that rows in the same second are neither repeated nor skipped
+        fmt = "%Y-%m-%d %H:%M:%S.%f" if value.microsecond else "%Y-%m-%d %H:%M:%S"
+        return literal(value.strftime(fmt), String)
+    return literal(value, column.type)
+
+async def keyset_page(db: AsyncSession, query, timestamp_column, id_column, cursor: Optional[str], limit: int, response: Response, skip: int = 0) -> List[Any]:
+    # Newest first, ordered on (timestamp, id) so that each page is an index range
+    # scan that starts right after the previous page's last row. `skip` is only kept
+    # for clients that still page with offsets.
+    query = query.order_by(timestamp_column.desc(), id_column.desc())
+    if cursor:
+        timestamp, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(timestamp_column, id_column) < tuple_(_timestamp_param(db, timestamp_column, timestamp), row_id))
+    elif skip:
+        query = query.offset(skip)
+    result = await db.execute(query.limit(limit + 1))
+    rows = result.all()
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        response.headers[NEXT_CURSOR_HEADER] = encode_cursor(_value(last, timestamp_column), _value(last, id_column))
+    return [row[0] if len(row) == 1 else row for row in rows]
+
+def _value(row, column):
+    entity = row[0] if len(row) == 1 else row
+    return getattr(entity, column.key)
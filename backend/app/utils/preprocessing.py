@@ -0,0 +1,109 @@
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_extraction import FeatureHasher
+from sklearn.preprocessing import OneHotEncoder
+
+MISSING_CATEGORY = "__missing__"
+FLOAT32_MAX = float(np.finfo(np.float32).max)
+# Integers above this magnitude are not all representable in float32
+FLOAT32_EXACT_INT = 2 ** 24
+
+
+def _as_categories(column: pd.Series) -> np.ndarray:
+    values = column.astype(object).to_numpy()
+    missing = pd.isna(values)
+    if missing.any():
+        values = values.copy()
+        values[missing] = MISSING_CATEGORY
+    return values.astype(str)
+
+
+class TabularPreprocessor(BaseEstimator, TransformerMixin):
+    # Turns a raw DataFrame into a model matrix: numeric columns are mean-imputed and
+    # kept as float32 when that loses nothing, low-cardinality text columns are
+    # one-hot encoded and high-cardinality ones hashed, both as sparse CSR. Without
+    # text columns the output stays a dense array.
+    def __init__(self, hash_threshold: int = 1000, hash_features: int = 2 ** 20):
+        self.hash_threshold = hash_threshold
+        self.hash_features = hash_features
+
+    def fit(self, X: pd.DataFrame, y=None):
+        return self.fit_chunks([X])
+
+    def fit_chunks(self, chunks: Iterable[pd.DataFrame]):
+        # One pass over the data in chunks, keeping only per-column aggregates; a text
+        # column's distinct values stop being collected once there are more than
+        # `hash_threshold`, so memory does not grow with the number of rows
+        numeric: List[str] = []
+        categorical: List[str] = []
+        sums: Dict[str, float] = {}
+        counts: Dict[str, int] = {}
+        largest: Dict[str, float] = {}
+        integral: Dict[str, bool] = {}
+        seen: Dict[str, set] = {}
+        first = True
+        for X in chunks:
+            if first:
+                first = False
+                self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+                self.n_features_in_ = len(X.columns)
+                for name, dtype in X.dtypes.items():
+                    if pd.api.types.is_numeric_dtype(dtype) and not isinstance(dtype, pd.CategoricalDtype):
+                        numeric.append(name)
+                        sums[name], counts[name], largest[name], integral[name] = 0.0, 0, 0.0, True
+                    else:
+                        categorical.append(name)
+                        seen[name] = set()
+            for name in numeric:
+                values = X[name].to_numpy(dtype=np.float64, na_value=np.nan)
+                finite = values[np.isfinite(values)]
+                if finite.size:
+                    sums[name] += float(finite.sum())
+                    counts[name] += finite.size
+                    largest[name] = max(largest[name], float(np.abs(finite).max()))
+                    integral[name] = integral[name] and bool(np.all(np.mod(finite, 1) == 0))
+            for name in categorical:
+                if len(seen[name]) <= self.hash_threshold:
+                    seen[name].update(np.unique(_as_categories(X[name])).tolist())
+        if first:
+            raise ValueError("Dataset is empty")
+
+        self.numeric_columns_: List[str] = numeric
+        self.fill_values_: Dict[str, float] = {name: sums[name] / counts[name] if counts[name] else 0.0 for name in numeric}
+        safe = all(largest[name] <= FLOAT32_MAX and (not integral[name] or largest[name] <= FLOAT32_EXACT_INT) for name in numeric)
+        self.dtype_ = np.float32 if safe else np.float64
+
+        self.onehot_columns_: List[str] = [name for name in categorical if len(seen[name]) <= self.hash_threshold]
+        self.hashed_columns_: List[str] = [name for name in categorical if len(seen[name]) > self.hash_threshold]
+        self.encoder_: Optional[OneHotEncoder] = None
+        if self.onehot_columns_:
+            categories = [sorted(seen[name]) for name in self.onehot_columns_]
+            self.encoder_ = OneHotEncoder(categories=categories, handle_unknown="ignore", sparse_output=True, dtype=self.dtype_)
+            self.encoder_.fit(np.array([[values[0] for values in categories]], dtype=str))
+        self.hasher_: Optional[FeatureHasher] = None
+        if self.hashed_columns_:
+            self.hasher_ = FeatureHasher(n_features=self.hash_features, input_type="string", dtype=self.dtype_)
+        return self
+
+    def transform(self, X: pd.DataFrame):
+        n = len(X)
+        numeric = np.empty((n, len(self.numeric_columns_)), dtype=self.dtype_)
+        for i, name in enumerate(self.numeric_columns_):
+            values = pd.to_numeric(X[name], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+            values = np.where(np.isnan(values), self.fill_values_[name], values)
+            numeric[:, i] = values
+        if not self.onehot_columns_ and not self.hashed_columns_:
+            return numeric
+
+        blocks = [sparse.csr_matrix(numeric)] if self.numeric_columns_ else []
+        if self.encoder_ is not None:
+            blocks.append(self.encoder_.transform(np.column_stack([_as_categories(X[name]) for name in self.onehot_columns_])))
+        if self.hasher_ is not None:
+            columns = {name: _as_categories(X[name]) for name in self.hashed_columns_}
+            tokens = ([f"{name}={columns[name][i]}" for name in self.hashed_columns_] for i in range(n))
+            blocks.append(self.hasher_.transform(tokens))
+        return sparse.hstack(blocks, format="csr", dtype=self.dtype_)
@@ -0,0 +1,133 @@
+import multiprocessing
+import os
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from backend.app.core.config import settings
+from backend.app.utils.datasets import open_source_chunks
+from backend.app.utils.model import ProgressCallback, _no_progress, load_model
+
+os.makedirs(settings.SCORING_OUTPUT_DIR, exist_ok=True)
+
+
+def scores_path(version: int) -> str:
+    return os.path.join(settings.SCORING_OUTPUT_DIR, f"scores_v{version}.csv")
+
+
+def _features(model, columns: List[str]) -> List[str]:
+    names = [str(name) for name in getattr(model, "feature_names_in_", [])]
+    missing = [name for name in names if name not in columns]
+    if missing:
+        raise ValueError(f"Missing features: {', '.join(missing)}")
+    return names or columns
+
+
+def score_frame(model, frame: pd.DataFrame, features: List[str], passthrough: List[str]) -> bytes:
+    # One chunk of the output file, formatted where it was scored
+    out = pd.DataFrame({name: frame[name].to_numpy() for name in passthrough})
+    X = frame[features]
+    if hasattr(model, "predict_proba"):
+        probabilities = model.predict_proba(X)
+        out["prediction"] = model.classes_[probabilities.argmax(axis=1)]
+        for i, label in enumerate(model.classes_):
+            out[f"probability_{label}"] = probabilities[:, i]
+    else:
+        out["prediction"] = model.predict(X)
+    return out.to_csv(header=False, index=False, float_format="%.6g").encode("utf-8")
+
+
+def output_header(model, passthrough: List[str]) -> bytes:
+    columns = [*passthrough, "prediction"]
+    if hasattr(model, "predict_proba"):
+        columns += [f"probability_{label}" for label in model.classes_]
+    return pd.DataFrame(columns=columns).to_csv(index=False).encode("utf-8")
+
+
+# Per-worker state: the model and the memory-mapped dataset, opened once in the initializer
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(model_version: int, source: Dict[str, Any], features: List[str], passthrough: List[str]):
+    _worker["model"] = load_model(model_version)
+    _worker["chunks"] = open_source_chunks(source)
+    _worker["features"] = features
+    _worker["passthrough"] = passthrough
+
+
+def _score_chunk(bound: Tuple[int, int]) -> bytes:
+    return score_frame(_worker["model"], _worker["chunks"].read(*bound), _worker["features"], _worker["passthrough"])
+
+
+def score_and_save(parameters: dict, source: dict, version: int, progress: Optional[ProgressCallback] = None, base_version: Optional[int] = None) -> Tuple[str, Dict[str, Any]]:
+    # Entry point of a scoring job's worker process: applies model `base_version` to
+    # the dataset and writes predictions (and class probabilities) as CSV. Stored
+    # datasets are scored chunk by chunk in a process pool whose workers map the
+    # columns themselves; results are written in row order with a bounded number of
+    # chunks in flight, so memory does not grow with the dataset.
+    progress = progress or _no_progress
+    if base_version is None:
+        raise ValueError("No model version to score with")
+    options = parameters.get("scoring", {})
+    chunk_rows = max(1, int(options.get("chunk_rows", settings.SCORING_CHUNK_ROWS)))
+    passthrough = list(options.get("passthrough", []))
+
+    progress("load", 1)
+    model = load_model(base_version)
+    chunks = open_source_chunks(source, progress)
+    missing = [name for name in passthrough if name not in chunks.columns]
+    if missing:
+        raise ValueError(f"Passthrough columns not found: {', '.join(missing)}")
+    features = _features(model, chunks.columns)
+    bounds = [(start, min(start + chunk_rows, chunks.rows)) for start in range(0, chunks.rows, chunk_rows)]
+    if not bounds:
+        raise ValueError("Dataset is empty")
+
+    progress("score", 5)
+    path = scores_path(version)
+    tmp = f"{path}.tmp-{uuid.uuid4().hex}"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(output_header(model, passthrough))
+
+            def write(done: int, data: bytes):
+                f.write(data)
+                progress("score", 5 + int(90 * done / len(bounds)))
+
+            workers = max(1, min(settings.SCORING_MAX_WORKERS, len(bounds)))
+            if workers == 1 or "dataset_id" not in source:
+                for done, bound in enumerate(bounds, start=1):
+                    write(done, score_frame(model, chunks.read(*bound), features, passthrough))
+            else:
+                del model, chunks
+                context = multiprocessing.get_context(settings.TRAINING_START_METHOD)
+                with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker, initargs=(base_version, source, features, passthrough)) as pool:
+                    # At most two chunks per worker are scored or waiting to be written
+                    window = 2 * workers
+                    futures = [pool.submit(_score_chunk, bound) for bound in bounds[:window]]
+                    for done in range(1, len(bounds) + 1):
+                        data = futures[done - 1].result()
+                        futures[done - 1] = None
+                        if done - 1 + window < len(bounds):
+                            futures.append(pool.submit(_score_chunk, bounds[done - 1 + window]))
+                        write(done, data)
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except FileNotFoundError:
+            pass
+        raise
+
+    progress("save", 95)
+    summary = {
+        "mode": "scoring",
+        "model_version": base_version,
+        "rows": bounds[-1][1],
+        "output_bytes": os.path.getsize(path),
+        "chunks": len(bounds),
+        "workers": workers,
+    }
+    return path, summary
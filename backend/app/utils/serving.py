@@ -0,0 +1,208 @@
+import asyncio
+import logging
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from sqlalchemy.future import select
+
+from backend.app.core.config import settings
+from backend.app.db.database import async_session_local
+from backend.app.models.training import Training, TrainingStatusEnum, TrainingJobTypeEnum
+
+logger = logging.getLogger(__name__)
+
+
+class ModelNotFoundError(Exception):
+    pass
+
+
+class InvalidRowError(ValueError):
+    pass
+
+
+def _to_python(value):
+    return value.item() if hasattr(value, "item") else value
+
+
+def predict_rows(model, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    # One vectorized predict_proba call for the whole batch
+    import pandas as pd
+    features = list(getattr(model, "feature_names_in_", []))
+    frame = pd.DataFrame.from_records(rows, columns=features or None)
+    probabilities = model.predict_proba(frame)
+    classes = [_to_python(c) for c in model.classes_]
+    labels = [classes[i] for i in probabilities.argmax(axis=1)]
+    return [
+        {"prediction": label, "probabilities": {str(c): float(p) for c, p in zip(classes, row)}}
+        for label, row in zip(labels, probabilities)
+    ]
+
+
+def check_row(model, row: Dict[str, Any]):
+    missing = [name for name in getattr(model, "feature_names_in_", []) if name not in row]
+    if missing:
+        raise InvalidRowError(f"Missing features: {', '.join(missing)}")
+
+
+class MicroBatcher:
+    # Collects concurrent single-row requests for up to `max_wait` seconds (or until
+    # `max_size` rows are waiting) and scores them with a single predict call.
+    def __init__(self, model, max_size: int, max_wait: float):
+        self.model = model
+        self.max_size = max_size
+        self.max_wait = max_wait
+        self._pending: List[Tuple[Dict[str, Any], asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+
+    async def predict(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((row, future))
+        if len(self._pending) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        batch = [(row, future) for row, future in batch if not future.done()]
+        if not batch:
+            return
+        # Scored in a thread like multi-row requests, so that the loop keeps serving
+        task = asyncio.get_running_loop().create_task(self._score(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _score(self, batch: List[Tuple[Dict[str, Any], asyncio.Future]]):
+        try:
+            outcomes = await asyncio.to_thread(self._predict_batch, [row for row, _ in batch])
+        except Exception as e:
+            outcomes = [e] * len(batch)
+        for (_, future), outcome in zip(batch, outcomes):
+            if future.done():
+                continue
+            if isinstance(outcome, Exception):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
+
+    def _predict_batch(self, rows: List[Dict[str, Any]]) -> List[Any]:
+        try:
+            return predict_rows(self.model, rows)
+        except Exception:
+            pass
+        # Score rows one by one so that a single bad row only fails its own request
+        outcomes = []
+        for row in rows:
+            try:
+                outcomes.append(predict_rows(self.model, [row])[0])
+            except Exception as e:
+                outcomes.append(InvalidRowError(str(e)))
+        return outcomes
+
+
+class CachedModel:
+    def __init__(self, version: int, owner_id: int, model):
+        self.version = version
+        self.owner_id = owner_id
+        self.model = model
+        self.batcher = MicroBatcher(
+            model,
+            max_size=settings.PREDICT_BATCH_MAX_SIZE,
+            max_wait=settings.PREDICT_BATCH_MAX_WAIT_MS / 1000,
+        )
+
+
+class ModelCache:
+    # LRU cache of loaded estimators. Concurrent misses for the same version share
+    # one load, which runs in a thread so that joblib.load does not block the loop.
+    def __init__(self, max_size: int, loader: Callable[[int], Awaitable[CachedModel]]):
+        self.max_size = max(1, max_size)
+        self.loader = loader
+        self._entries: "OrderedDict[int, CachedModel]" = OrderedDict()
+        self._loading: Dict[int, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    async def get(self, version: int) -> CachedModel:
+        entry = self._entries.get(version)
+        if entry is not None:
+            self._entries.move_to_end(version)
+            self.hits += 1
+            return entry
+        self.misses += 1
+        loading = self._loading.get(version)
+        if loading is not None:
+            return await asyncio.shield(loading)
+        loading = self._loading[version] = asyncio.get_running_loop().create_future()
+        try:
+            entry = await self.loader(version)
+        except BaseException as e:
+            loading.set_exception(e)
+            loading.exception()  # mark retrieved when nobody else was waiting
+            raise
+        finally:
+            self._loading.pop(version, None)
+        loading.set_result(entry)
+        self._entries[version] = entry
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def invalidate(self, version: int):
+        self._entries.pop(version, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+async def load_registered_model(version: int) -> CachedModel:
+    async with async_session_local() as db:
+        result = await db.execute(
+            select(Training.user_id)
+            .filter(Training.model_version == version, Training.status == TrainingStatusEnum.completed, Training.job_type != TrainingJobTypeEnum.scoring)
+            .limit(1)
+        )
+        owner_id = result.scalar()
+    if owner_id is None:
+        raise ModelNotFoundError(f"Model version {version} not found")
+    from backend.app.utils.model import load_model
+    try:
+        model = await asyncio.to_thread(load_model, version)
+    except FileNotFoundError as e:
+        raise ModelNotFoundError(str(e))
+    return CachedModel(version, owner_id, model)
+
+
+model_cache = ModelCache(settings.MODEL_CACHE_SIZE, load_registered_model)
+
+
+async def warm_up_model_cache(count: int):
+    async with async_session_local() as db:
+        result = await db.execute(
+            select(Training.model_version)
+            .filter(Training.status == TrainingStatusEnum.completed, Training.job_type != TrainingJobTypeEnum.scoring)
+            .order_by(Training.model_version.desc())
+            .limit(count)
+        )
+        versions = result.scalars().all()
+    for version in versions:
+        try:
+            await model_cache.get(version)
+        except Exception:
+            logger.warning("Could not warm up model version %s", version, exc_info=True)
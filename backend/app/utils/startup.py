@@ -0,0 +1,75 @@
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, Optional
+
+from backend.app.utils.lazy import ML_MODULES
+from backend.app.utils.metrics import Gauge
+
+# Imported first by backend/main.py, so STARTED is (nearly) when the app import began
+STARTED = time.perf_counter()
+
+# uvicorn's logger, the one that is configured to show INFO under uvicorn
+logger = logging.getLogger("uvicorn.error")
+
+_import_seconds: Optional[float] = None
+
+
+def rss_bytes() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        # Not Linux: peak instead of current RSS
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == "darwin" else peak * 1024
+
+
+def private_bytes() -> Optional[int]:
+    # Memory not shared with other processes; with a preloaded parent, the workers'
+    # copy-on-write pages only count here once they are written to
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            return sum(int(line.split()[1]) * 1024 for line in f if line.startswith(("Private_Clean:", "Private_Dirty:")))
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def mark_imported():
+    global _import_seconds
+    _import_seconds = time.perf_counter() - STARTED
+    IMPORT_SECONDS.set(_import_seconds)
+
+
+def startup_report() -> Dict[str, Any]:
+    return {
+        "pid": os.getpid(),
+        "import_seconds": _import_seconds,
+        "startup_seconds": time.perf_counter() - STARTED,
+        "rss_bytes": rss_bytes(),
+        "private_bytes": private_bytes(),
+        "ml_loaded": [name for name in ML_MODULES if name in sys.modules],
+    }
+
+
+def log_startup_report():
+    report = startup_report()
+    STARTUP_SECONDS.set(report["startup_seconds"])
+    private = report["private_bytes"]
+    logger.info(
+        "Started pid %s: imports %.2fs, ready after %.2fs, RSS %.1f MB (%s private), ML modules loaded: %s",
+        report["pid"],
+        report["import_seconds"] or 0.0,
+        report["startup_seconds"],
+        report["rss_bytes"] / 2**20,
+        f"{private / 2**20:.1f} MB" if private is not None else "unknown",
+        ", ".join(report["ml_loaded"]) or "none",
+    )
+    return report
+
+
+IMPORT_SECONDS = Gauge("app_import_seconds", "Time spent importing the application.")
+STARTUP_SECONDS = Gauge("app_startup_seconds", "Time from the start of the application import until startup completed.")
+Gauge("process_resident_memory_bytes", "Resident memory size of this process.", callback=rss_bytes)
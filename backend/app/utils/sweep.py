@@ -0,0 +1,170 @@
+import itertools
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from scipy import sparse
+from sklearn.linear_model import LogisticRegression
+
+from backend.app.core.config import settings
+from backend.app.utils.datasets import load_source
+from backend.app.utils.model import ProgressCallback, _no_progress, classification_metrics, make_pipeline, make_preprocessor, save_model
+
+
+def sweep_candidates(sweep: Dict[str, Any]) -> List[Dict[str, Any]]:
+    space = sweep.get("space") or {}
+    names = sorted(space)
+    grid = [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+    if sweep.get("strategy", "grid") == "random":
+        rng = random.Random(sweep.get("random_state"))
+        grid = rng.sample(grid, min(sweep.get("n_iter", 10), len(grid)))
+    return grid
+
+
+def _share(array: np.ndarray) -> Tuple[shared_memory.SharedMemory, Dict[str, Any]]:
+    shm = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=shm.buf)[...] = array
+    return shm, {"name": shm.name, "shape": array.shape, "dtype": array.dtype.str}
+
+
+def _share_matrix(X, segments: List[shared_memory.SharedMemory]) -> Dict[str, Any]:
+    # Dense arrays are shared as one segment, CSR matrices as their three arrays
+    if not sparse.issparse(X):
+        shm, spec = _share(X)
+        segments.append(shm)
+        return spec
+    parts = {}
+    for name in ("data", "indices", "indptr"):
+        shm, parts[name] = _share(getattr(X, name))
+        segments.append(shm)
+    return {"sparse": True, "shape": X.shape, "parts": parts}
+
+
+def _view(spec: Dict[str, Any], segment) -> Any:
+    if not spec.get("sparse"):
+        return np.ndarray(spec["shape"], dtype=np.dtype(spec["dtype"]), buffer=segment(spec["name"]).buf)
+    parts = {name: np.ndarray(part["shape"], dtype=np.dtype(part["dtype"]), buffer=segment(part["name"]).buf) for name, part in spec["parts"].items()}
+    return sparse.csr_matrix((parts["data"], parts["indices"], parts["indptr"]), shape=spec["shape"], copy=False)
+
+
+# Per-worker state: the dataset arrays attached from shared memory in the initializer
+_worker: Dict[str, Any] = {}
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    # Pool workers share the sweep process's resource tracker, which unlinks the
+    # segment once, when the sweep process does.
+    shm = shared_memory.SharedMemory(name=name)
+    _worker.setdefault("segments", []).append(shm)
+    return shm
+
+
+def _init_worker(x_spec: Dict[str, Any], y_spec: Dict[str, Any], n_train: int, model_params: Dict[str, Any]):
+    _worker["X"] = _view(x_spec, _attach)
+    _worker["y"] = _view(y_spec, _attach)
+    _worker["n_train"] = n_train
+    _worker["model_params"] = model_params
+
+
+def _evaluate(candidate: Dict[str, Any]) -> Dict[str, Any]:
+    X, y, n_train = _worker["X"], _worker["y"], _worker["n_train"]
+    result: Dict[str, Any] = {"params": candidate}
+    try:
+        model = LogisticRegression(**{**_worker["model_params"], **candidate})
+        start = time.perf_counter()
+        model.fit(X[:n_train], y[:n_train])
+        result["fit_seconds"] = time.perf_counter() - start
+        start = time.perf_counter()
+        y_pred = model.predict(X[n_train:])
+        result["score_seconds"] = time.perf_counter() - start
+        result["metrics"] = classification_metrics(y[n_train:], y_pred)
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+def sweep_and_save(parameters: dict, source: dict, version: int, progress: Optional[ProgressCallback] = None) -> Tuple[str, Dict[str, Any]]:
+    # Entry point of a sweep job's worker process. The preprocessed dataset is put
+    # once in shared memory, shuffled so that the training and validation splits are
+    # plain slices, and every candidate is fitted in a pool process that maps it
+    # zero-copy.
+    progress = progress or _no_progress
+    sweep = parameters.get("sweep") or {}
+    candidates = sweep_candidates(sweep)
+    if not candidates:
+        raise ValueError("Sweep search space is empty")
+    if len(candidates) > settings.SWEEP_MAX_CANDIDATES:
+        raise ValueError(f"Sweep has {len(candidates)} candidates, at most {settings.SWEEP_MAX_CANDIDATES} are allowed")
+    scoring = sweep.get("scoring", "f1_score")
+
+    progress("load", 1)
+    data = load_source(source, progress)
+    target = parameters.get("target_column")
+    if not target or target not in data.columns:
+        raise ValueError("Target column not found in data")
+
+    progress("prepare", 5)
+    order = np.random.default_rng(sweep.get("random_state")).permutation(len(data))
+    # Labels are shared as integer codes; the final model is refitted on the labels
+    classes, y = np.unique(data[target].to_numpy()[order], return_inverse=True)
+    features = data.drop(columns=[target])
+    del data
+    # The transformer is fitted once on all rows and shared by every candidate
+    progress("preprocess", 7)
+    preprocessor = make_preprocessor(parameters)
+    X = preprocessor.fit_transform(features)[order]
+    del features
+    # X is a CSR matrix as soon as there is a text column, which has no len()
+    rows = X.shape[0]
+    n_train = rows - max(int(rows * sweep.get("validation_fraction", 0.2)), 1)
+    if n_train < 1:
+        raise ValueError("Dataset is too small for a validation split")
+
+    segments: List[shared_memory.SharedMemory] = []
+    try:
+        x_spec = _share_matrix(X, segments)
+        y_spec = _share_matrix(y, segments)
+        del X, y
+        by_name = {shm.name: shm for shm in segments}
+        X = _view(x_spec, by_name.__getitem__)
+        y = _view(y_spec, by_name.__getitem__)
+
+        progress("search", 10)
+        workers = max(1, min(settings.SWEEP_MAX_WORKERS, len(candidates)))
+        results = []
+        context = multiprocessing.get_context(settings.TRAINING_START_METHOD)
+        with ProcessPoolExecutor(workers, mp_context=context, initializer=_init_worker, initargs=(x_spec, y_spec, n_train, parameters.get("model_params", {}))) as pool:
+            futures = [pool.submit(_evaluate, candidate) for candidate in candidates]
+            for done, future in enumerate(as_completed(futures), start=1):
+                results.append(future.result())
+                progress("search", 10 + int(75 * done / len(candidates)))
+
+        scored = [r for r in results if "metrics" in r]
+        if not scored:
+            raise ValueError(f"All sweep candidates failed: {results[0].get('error')}")
+        best = max(scored, key=lambda r: r["metrics"].get(scoring, 0.0))
+
+        # Refit the winner on the full dataset and register it as this job's version
+        progress("refit", 85)
+        model = LogisticRegression(**{**parameters.get("model_params", {}), **best["params"]})
+        model.fit(X, classes[y])
+        progress("save", 90)
+        model_path = save_model(make_pipeline(preprocessor, model), version)
+    finally:
+        # Views into the segments must be gone before they can be closed
+        X = y = None
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+
+    summary = {
+        **best["metrics"],
+        "scoring": scoring,
+        "best_params": best["params"],
+        "candidates": sorted(results, key=lambda r: r.get("metrics", {}).get(scoring, float("-inf")), reverse=True),
+    }
+    return model_path, summary
@@ -0,0 +1,144 @@
+import asyncio
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from backend.benchmarks.common import LoopLagMonitor, create_tables, dispose_engine, now, summarize
+
+# API scenarios against the in-process app (httpx ASGI transport, no network).
+# configure_environment() must have been called before this module is imported.
+
+PASSWORD = "benchmark-password"
+
+
+async def register(client, app, email: str) -> str:
+    response = await client.post(app.url_path_for("register_user"), json={"email": email, "password": PASSWORD})
+    response.raise_for_status()
+    response = await client.post(app.url_path_for("login_user"), json={"email": email, "password": PASSWORD})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def bench_current_user(token: str, requests: int) -> Dict[str, float]:
+    # The dependency itself, so that routing and serialization do not dilute it
+    from backend.app.api.deps import get_current_user
+    from backend.app.db.database import async_session_local
+
+    latencies = []
+    start = now()
+    async with async_session_local() as db:
+        for _ in range(requests):
+            request_start = now()
+            await get_current_user(token, db)
+            latencies.append(now() - request_start)
+    return summarize(latencies, now() - start)
+
+
+async def bench_start_training(client, app, token: str, requests: int, concurrency: int) -> Dict[str, float]:
+    # Submission only: jobs beyond the single worker slot stay queued and are dropped
+    # when the executor shuts down after the run
+    headers = {"Authorization": f"Bearer {token}"}
+    body = {"parameters": {"target_column": "y", "data": [{"x": i % 7, "y": i % 2} for i in range(50)]}}
+    path = app.url_path_for("start_training")
+    latencies: List[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def submit():
+        nonlocal errors
+        async with semaphore:
+            request_start = now()
+            response = await client.post(path, json=body, headers=headers)
+            if response.status_code == 200:
+                latencies.append(now() - request_start)
+            else:
+                errors += 1
+
+    with LoopLagMonitor() as monitor:
+        start = now()
+        await asyncio.gather(*(submit() for _ in range(requests)))
+        elapsed = now() - start
+    results = summarize(latencies, elapsed, errors)
+    results["max_loop_lag_ms"] = monitor.max_lag * 1000
+    return results
+
+
+async def seed_trainings(user_id: int, count: int):
+    from sqlalchemy import insert
+    from backend.app.db.database import async_session_local
+    from backend.app.db.stats import recompute_user_stats
+    from backend.app.db.versions import allocate_model_versions
+    from backend.app.models.training import Training, TrainingStatusEnum, TrainingJobTypeEnum
+
+    async with async_session_local() as db:
+        versions = await allocate_model_versions(db, count)
+        start = datetime.utcnow() - timedelta(days=365)
+        rows = [
+            {
+                "user_id": user_id,
+                "model_version": version,
+                "status": TrainingStatusEnum.completed if i % 5 else TrainingStatusEnum.failed,
+                "job_type": TrainingJobTypeEnum.training,
+                "parameters": {"target_column": "y"},
+                "results": {"accuracy": 0.9, "precision": 0.9, "recall": 0.9, "f1_score": 0.9},
+                "created_at": start + timedelta(minutes=i),
+                "updated_at": start + timedelta(minutes=i),
+            }
+            for i, version in enumerate(versions)
+        ]
+        for offset in range(0, len(rows), 1000):
+            await db.execute(insert(Training), rows[offset:offset + 1000])
+        await recompute_user_stats(db, user_id)
+        await db.commit()
+
+
+async def bench_dashboard(client, app, token: str, requests: int) -> Dict[str, Dict[str, float]]:
+    headers = {"Authorization": f"Bearer {token}"}
+    results = {}
+    for name in ("get_summary", "get_results"):
+        path = app.url_path_for(name)
+        latencies = []
+        start = now()
+        for _ in range(requests):
+            request_start = now()
+            response = await client.get(path, headers=headers)
+            response.raise_for_status()
+            latencies.append(now() - request_start)
+        results[name] = summarize(latencies, now() - start)
+    return results
+
+
+async def run(quick: bool = False) -> Dict[str, Dict[str, float]]:
+    import httpx
+    from backend.main import app
+    from backend.benchmarks import login
+
+    results: Dict[str, Dict[str, float]] = {}
+    try:
+        await create_tables()
+        await app.router.startup()
+        results["api.login"] = await login.run(users=5 if quick else 20, requests=50 if quick else 200, concurrency=16 if quick else 32)
+        async with httpx.AsyncClient(app=app, base_url="http://benchmark") as client:
+            token = await register(client, app, "current-user@example.com")
+            results["api.current_user"] = await bench_current_user(token, 500 if quick else 5000)
+            token = await register(client, app, "submitter@example.com")
+            results["api.start_training"] = await bench_start_training(client, app, token, 50 if quick else 300, 16)
+
+            for count in ((10, 1000) if quick else (10, 100, 1000, 10000)):
+                email = f"dashboard{count}@example.com"
+                token = await register(client, app, email)
+                await seed_trainings(await user_id_for(email), count)
+                for name, summary in (await bench_dashboard(client, app, token, 20 if quick else 100)).items():
+                    results[f"api.dashboard.{name}.trainings_{count}"] = summary
+    finally:
+        await app.router.shutdown()
+        await dispose_engine()
+    return results
+
+
+async def user_id_for(email: str) -> int:
+    from sqlalchemy import select
+    from backend.app.db.database import async_session_local
+    from backend.app.models.user import User
+
+    async with async_session_local() as db:
+        return (await db.execute(select(User.id).filter(User.email == email))).scalar_one()
@@ -0,0 +1,94 @@
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+
+def configure_environment(workdir: str):
+    # Must run before anything under backend.app is imported: settings are read at
+    # import time. A throwaway SQLite database and artifact directories keep
+    # benchmark runs away from real data.
+    os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{os.path.join(workdir, 'benchmark.db')}"
+    for name in ("UPLOAD_DIR", "DATASET_DIR", "MODEL_DIR", "SCORING_OUTPUT_DIR", "MODEL_STORE_CACHE_DIR"):
+        os.environ[name] = os.path.join(workdir, name.lower())
+    # One worker slot and a deep queue, so that submission benchmarks measure the API
+    # rather than admission control or training processes competing for the CPU
+    os.environ.setdefault("TRAINING_MAX_WORKERS", "1")
+    os.environ.setdefault("TRAINING_MAX_PENDING", "100000")
+    os.environ.setdefault("TRAINING_USER_LIMIT_POLICY", "queue")
+
+
+def make_workdir() -> str:
+    return tempfile.mkdtemp(prefix="ml-you-bench-")
+
+
+async def create_tables():
+    from backend.app.db.database import Base, engine
+    from backend.app.models import broadcast, counter, dataset, log, stats, training, user  # noqa: F401 (register tables)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def dispose_engine():
+    # Pooled aiosqlite connections run on non-daemon threads; without this the
+    # process would not exit after the results are written
+    from backend.app.db.database import engine
+
+    await engine.dispose()
+
+
+def summarize(latencies: List[float], elapsed: float, errors: int = 0) -> Dict[str, float]:
+    ordered = sorted(latencies)
+
+    def percentile(p: float) -> float:
+        if not ordered:
+            return 0.0
+        return ordered[min(len(ordered) - 1, int(p * len(ordered)))] * 1000
+
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed if elapsed else 0.0,
+        "mean_ms": statistics.fmean(ordered) * 1000 if ordered else 0.0,
+        "p50_ms": percentile(0.50),
+        "p95_ms": percentile(0.95),
+        "p99_ms": percentile(0.99),
+    }
+
+
+class LoopLagMonitor:
+    # Measures how late a periodic timer fires; large values mean something blocked
+    # the event loop while requests were in flight.
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.max_lag = 0.0
+        self._task = None
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            start = loop.time()
+            await asyncio.sleep(self.interval)
+            self.max_lag = max(self.max_lag, loop.time() - start - self.interval)
+
+    def __enter__(self):
+        self._task = asyncio.create_task(self._run())
+        return self
+
+    def __exit__(self, *exc):
+        self._task.cancel()
+
+
+def print_results(title: str, results: Dict[str, float]):
+    print(title)
+    for key, value in results.items():
+        print(f"  {key:>12}: {value:.2f}" if isinstance(value, float) else f"  {key:>12}: {value}")
+
+
+def now() -> float:
+    return time.perf_counter()
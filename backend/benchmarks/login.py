@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+
+from backend.benchmarks.common import LoopLagMonitor, configure_environment, create_tables, dispose_engine, make_workdir, now, print_results, summarize
+
+# Login throughput under concurrency. Run from the repository root:
+#   python -m backend.benchmarks.login --users 20 --requests 200 --concurrency 32
+# BCRYPT_ROUNDS, PASSWORD_HASH_WORKERS and PASSWORD_HASH_MAX_PENDING are read from
+# the environment as usual. "max_loop_lag_ms" shows whether hashing blocked the loop.
+
+
+async def run(users: int, requests: int, concurrency: int) -> dict:
+    import httpx
+    from backend.main import app
+
+    await create_tables()
+    password = "benchmark-password"
+    emails = [f"bench{i}@example.com" for i in range(users)]
+    async with httpx.AsyncClient(app=app, base_url="http://benchmark") as client:
+        register_path = app.url_path_for("register_user")
+        login_path = app.url_path_for("login_user")
+        for email in emails:
+            response = await client.post(register_path, json={"email": email, "password": password})
+            response.raise_for_status()
+
+        latencies = []
+        rejected = 0
+        errors = 0
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def login(i: int):
+            nonlocal rejected, errors
+            async with semaphore:
+                start = now()
+                response = await client.post(login_path, json={"email": emails[i % users], "password": password})
+                if response.status_code == 200:
+                    latencies.append(now() - start)
+                elif response.status_code == 503:
+                    rejected += 1
+                else:
+                    errors += 1
+
+        with LoopLagMonitor() as monitor:
+            start = now()
+            await asyncio.gather(*(login(i) for i in range(requests)))
+            elapsed = now() - start
+
+    results = summarize(latencies, elapsed, rejected + errors)
+    results.update(rejected=rejected, max_loop_lag_ms=monitor.max_lag * 1000, concurrency=concurrency)
+    return results
+
+
+async def run_standalone(users: int, requests: int, concurrency: int) -> dict:
+    try:
+        return await run(users, requests, concurrency)
+    finally:
+        await dispose_engine()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark /auth login throughput")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    args = parser.parse_args()
+    configure_environment(make_workdir())
+    print_results("login", asyncio.run(run_standalone(args.users, args.requests, args.concurrency)))
+
+
+if __name__ == "__main__":
+    main()
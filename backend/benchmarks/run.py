@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from backend.benchmarks.common import configure_environment, make_workdir
+
+# Benchmark runner. From the repository root:
+#   python -m backend.benchmarks.run --output bench.json
+#   python -m backend.benchmarks.run --compare bench.json --tolerance 0.15
+# Compare mode exits with status 1 when a metric is worse than the baseline by more
+# than the tolerance.
+
+LOWER_IS_BETTER = ("_ms", "seconds", "peak_mb")
+HIGHER_IS_BETTER = ("throughput",)
+
+
+def metric_direction(name: str) -> int:
+    if name.endswith(HIGHER_IS_BETTER):
+        return 1
+    if name.endswith(LOWER_IS_BETTER):
+        return -1
+    return 0
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]], tolerance: float) -> List[str]:
+    regressions = []
+    for scenario, metrics in results.items():
+        base_metrics = baseline.get(scenario)
+        if base_metrics is None:
+            continue
+        for name, value in metrics.items():
+            direction = metric_direction(name)
+            base = base_metrics.get(name)
+            if not direction or not isinstance(base, (int, float)) or base <= 0:
+                continue
+            change = (value - base) / base
+            if -direction * change > tolerance:
+                regressions.append(f"{scenario}.{name}: {base:.4g} -> {value:.4g} ({change:+.1%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the backend benchmark suite")
+    parser.add_argument("--suite", action="append", choices=["api", "training"], help="Suites to run (default: all)")
+    parser.add_argument("--quick", action="store_true", help="Smaller workloads for a smoke run")
+    parser.add_argument("--output", help="Write results as JSON to this file")
+    parser.add_argument("--compare", help="Baseline JSON to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed relative slowdown before flagging (default 0.2)")
+    args = parser.parse_args()
+    suites = args.suite or ["api", "training"]
+
+    configure_environment(make_workdir())
+    results: Dict[str, Dict[str, Any]] = {}
+    if "api" in suites:
+        from backend.benchmarks import api
+        results.update(asyncio.run(api.run(args.quick)))
+    if "training" in suites:
+        from backend.benchmarks import training
+        results.update(training.run(args.quick))
+
+    report = {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "quick": args.quick,
+        },
+        "results": results,
+    }
+    output = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+        regressions = compare(results, baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+        print(f"No regressions beyond {args.tolerance:.0%} against {args.compare}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+import gc
+import statistics
+import tracemalloc
+from typing import Dict, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backend.benchmarks.common import now
+
+# train_model wall time and peak traced memory (NumPy and Python allocations) across
+# dataset shapes. Data is synthetic and seeded, so runs are comparable.
+
+SHAPES = [(1_000, 10), (10_000, 10), (10_000, 50), (100_000, 10), (100_000, 50)]
+QUICK_SHAPES = [(1_000, 10), (10_000, 10), (10_000, 50)]
+
+
+def make_dataset(rows: int, columns: int, seed: int = 0) -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(rows, columns))
+    weights = rng.normal(size=columns)
+    data = pd.DataFrame(X, columns=[f"f{i}" for i in range(columns)])
+    data["target"] = (X @ weights + rng.normal(scale=0.5, size=rows) > 0).astype(int)
+    return data
+
+
+def bench_shape(rows: int, columns: int, repeats: int) -> Dict[str, float]:
+    from backend.app.utils.model import train_model
+
+    data = make_dataset(rows, columns)
+    parameters = {"target_column": "target", "model_params": {"max_iter": 200}}
+    times = []
+    for _ in range(repeats):
+        gc.collect()
+        start = now()
+        train_model(parameters, data)
+        times.append(now() - start)
+
+    # Separate traced run: tracing slows allocation-heavy code down
+    gc.collect()
+    tracemalloc.start()
+    try:
+        train_model(parameters, data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "rows": rows,
+        "columns": columns,
+        "seconds": statistics.median(times),
+        "min_seconds": min(times),
+        "peak_mb": peak / 2**20,
+        "input_mb": data.memory_usage(deep=True).sum() / 2**20,
+    }
+
+
+def run(quick: bool = False, repeats: int = 3) -> Dict[str, Dict[str, float]]:
+    shapes: Tuple = QUICK_SHAPES if quick else SHAPES
+    return {f"training.train_model.rows_{rows}.cols_{columns}": bench_shape(rows, columns, 1 if quick else repeats) for rows, columns in shapes}
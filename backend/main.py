@@ -1,3 +1,5 @@
+from backend.app.utils import startup
+import asyncio
 import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
@@ -6,10 +8,23 @@ from fastapi.exceptions import RequestValidationError
 from starlette.websockets import WebSocket
 from starlette.websockets import WebSocketDisconnect
 from starlette.middleware.sessions import SessionMiddleware
-from backend.app.api.api_v1 import auth, training, admin, dashboard
+from backend.app.api.api_v1 import auth, training, admin, dashboard, models, metrics
 from backend.app.core.config import settings
+from backend.app.db.database import engine
+from backend.app.utils.artifact_gc import artifact_collector
+from backend.app.utils.audit import audit_log
+from backend.app.utils.auth_cache import auth_cache
+from backend.app.utils.broadcast import broadcast
+from backend.app.utils.executor import training_executor
+from backend.app.utils.metrics import MetricsMiddleware
+from backend.app.utils.pagination import NEXT_CURSOR_HEADER
+from backend.app.utils.responses import CompressionMiddleware
+from backend.app.utils.security import password_hasher
+from backend.app.utils.serving import warm_up_model_cache
 from fastapi.exceptions import HTTPException
 
+startup.mark_imported()
+
 app = FastAPI(title="MLops Intelligent Analyzer Backend")
 
 origins = [
@@ -25,16 +40,54 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, "ETag"],
+)
+app.add_middleware(
+    CompressionMiddleware,
+    minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+    gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+    brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
 )
+app.add_middleware(MetricsMiddleware)
 
 app.include_router(auth.router, prefix="/auth")
 app.include_router(training.router, prefix="/training")
 app.include_router(admin.router, prefix="/admin")
 app.include_router(dashboard.router, prefix="/dashboard")
+app.include_router(models.router, prefix="/models")
+app.include_router(metrics.router)
+
+@app.on_event("startup")
+async def start_broadcast():
+    await broadcast.start()
+    await auth_cache.start()
+    await audit_log.start()
+    await artifact_collector.start()
+
+@app.on_event("startup")
+async def start_model_cache_warm_up():
+    if settings.MODEL_CACHE_WARMUP > 0:
+        asyncio.create_task(warm_up_model_cache(settings.MODEL_CACHE_WARMUP))
+
+@app.on_event("startup")
+async def report_startup():
+    startup.log_startup_report()
+
+@app.on_event("shutdown")
+async def shutdown_training_executor():
+    await training_executor.shutdown()
+    password_hasher.shutdown()
+    await artifact_collector.stop()
+    await audit_log.stop()
+    await auth_cache.stop()
+    await broadcast.stop()
+    # Pooled aiosqlite connections run on non-daemon threads that would keep the
+    # process alive after the server stops
+    await engine.dispose()
 
 @app.exception_handler(HTTPException)
 async def http_exception_handler(request: Request, exc: HTTPException):
-    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail})
+    return JSONResponse(status_code=exc.status_code, content={"detail": exc.detail}, headers=getattr(exc, "headers", None))
 
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
@@ -0,0 +1,101 @@
+import argparse
+import gc
+import logging
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Set
+
+import uvicorn
+
+# Pre-fork API server (POSIX only). The parent imports the app once, optionally
+# together with the ML stack (--preload), then forks the workers, which share those
+# pages copy-on-write instead of each importing everything again:
+#   python -m backend.serve --workers 4 --preload
+# Without --preload each worker imports the ML stack on first use.
+
+logger = logging.getLogger("backend.serve")
+
+
+def bind(host: str, port: int) -> socket.socket:
+    sock = socket.socket(socket.AF_INET6 if ":" in host else socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(2048)
+    sock.set_inheritable(True)
+    return sock
+
+
+def spawn(app, sock: socket.socket, log_level: str) -> int:
+    pid = os.fork()
+    if pid:
+        return pid
+    code = 0
+    try:
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        uvicorn.Server(uvicorn.Config(app, log_level=log_level)).run(sockets=[sock])
+    except BaseException:
+        logger.exception("Worker %s crashed", os.getpid())
+        code = 1
+    finally:
+        os._exit(code)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the API in pre-forked worker processes")
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=int(os.environ.get("WEB_CONCURRENCY", os.cpu_count() or 1)))
+    parser.add_argument("--preload", action="store_true", help="Import the ML stack in the parent before forking")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args()
+    if not hasattr(os, "fork"):
+        sys.exit("backend.serve needs os.fork; use uvicorn directly on this platform")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    from backend.app.utils import startup
+    if args.preload:
+        from backend.app.utils.lazy import preload_ml
+        preload_ml()
+    from backend.main import app
+    logger.info("Parent %s loaded the app: RSS %.1f MB", os.getpid(), startup.rss_bytes() / 2**20)
+
+    # Everything allocated so far lives as long as the workers; frozen objects are
+    # skipped by the garbage collector, which would otherwise write to (and so copy)
+    # their pages in every worker
+    gc.collect()
+    gc.freeze()
+
+    sock = bind(args.host, args.port)
+    children: Set[int] = {spawn(app, sock, args.log_level) for _ in range(max(1, args.workers))}
+    stopping = False
+
+    def stop(signum, frame):
+        nonlocal stopping
+        stopping = True
+        for pid in children:
+            try:
+                os.kill(pid, signal.SIGTERM)
+            except ProcessLookupError:
+                pass
+
+    signal.signal(signal.SIGTERM, stop)
+    signal.signal(signal.SIGINT, stop)
+    while children:
+        try:
+            pid, status = os.wait()
+        except ChildProcessError:
+            break
+        children.discard(pid)
+        if not stopping:
+            logger.warning("Worker %s exited with status %s, starting a new one", pid, status)
+            time.sleep(1)
+            if not stopping:
+                children.add(spawn(app, sock, args.log_level))
+
+
+if __name__ == "__main__":
+    main()
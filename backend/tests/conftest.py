@@ -0,0 +1,139 @@
+import asyncio
+import itertools
+import os
+import socket
+import sys
+import tempfile
+import time
+
+import pytest
+
+# Settings are read when backend.app is first imported, so the environment for the
+# whole session is set here, before any test imports the app. Everything lives in a
+# throwaway directory with its own SQLite database.
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+sys.path.insert(0, ROOT)
+WORKDIR = tempfile.mkdtemp(prefix="ml-you-tests-")
+os.environ.update(
+    SECRET_KEY="test-secret",
+    DATABASE_URL=f"sqlite+aiosqlite:///{os.path.join(WORKDIR, 'test.db')}",
+    ADMIN_EMAILS='["admin@example.com"]',
+    BCRYPT_ROUNDS="4",
+    TRAINING_MAX_WORKERS="2",
+    TRAINING_MAX_JOBS_PER_USER="2",
+    SWEEP_MAX_WORKERS="2",
+    SCORING_MAX_WORKERS="2",
+    AUDIT_LOG_FLUSH_INTERVAL="0.05",
+    MODEL_GC_INTERVAL="0",
+)
+for name in ("UPLOAD_DIR", "DATASET_DIR", "MODEL_DIR", "SCORING_OUTPUT_DIR", "MODEL_STORE_CACHE_DIR"):
+    os.environ[name] = os.path.join(WORKDIR, name.lower())
+
+PASSWORD = "test-password"
+TERMINAL = ("completed", "failed", "cancelled")
+_emails = itertools.count()
+
+
+@pytest.fixture(scope="session")
+def event_loop():
+    # One loop for the session: the engine's pooled connections belong to it
+    loop = asyncio.new_event_loop()
+    yield loop
+    loop.close()
+
+
+async def create_tables():
+    from backend.app.db.database import Base, engine
+    from backend.app.models import broadcast, counter, dataset, log, stats, training, user  # noqa: F401 (register tables)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+@pytest.fixture(scope="session")
+async def app():
+    from backend.app.db.database import engine
+    from backend.main import app
+
+    await create_tables()
+    await app.router.startup()
+    yield app
+    await app.router.shutdown()
+    await engine.dispose()
+
+
+@pytest.fixture
+async def client(app):
+    import httpx
+
+    async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+        yield client
+
+
+def path(name: str, **params) -> str:
+    # Routers carry their own prefixes on top of the ones in main.py, so tests look
+    # routes up by endpoint name
+    from backend.main import app
+
+    return app.url_path_for(name, **{key: str(value) for key, value in params.items()})
+
+
+async def login(client, email: str) -> dict:
+    response = await client.post(path("login_user"), json={"email": email, "password": PASSWORD})
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def register(client, email: str = None) -> dict:
+    email = email or f"user{next(_emails)}-{time.time_ns()}@example.com"
+    response = await client.post(path("register_user"), json={"email": email, "password": PASSWORD})
+    response.raise_for_status()
+    return await login(client, email)
+
+
+@pytest.fixture
+async def user_headers(client) -> dict:
+    return await register(client)
+
+
+@pytest.fixture
+async def admin_headers(client) -> dict:
+    response = await client.post(path("register_user"), json={"email": "admin@example.com", "password": PASSWORD})
+    assert response.status_code in (200, 400)
+    return await login(client, "admin@example.com")
+
+
+async def wait_for_training(client, headers: dict, training_id: int, timeout: float = 120) -> dict:
+    deadline = time.monotonic() + timeout
+    while True:
+        response = await client.get(path("get_training", training_id=training_id), headers=headers)
+        response.raise_for_status()
+        training = response.json()
+        if training["status"] in TERMINAL:
+            return training
+        if time.monotonic() > deadline:
+            raise AssertionError(f"Training {training_id} still {training['status']} after {timeout}s")
+        await asyncio.sleep(0.2)
+
+
+def records(rows: int = 60) -> list:
+    return [{"x1": i % 7, "x2": (i * 3) % 11, "y": int(i % 7 > 3)} for i in range(rows)]
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(port: int, timeout: float = 30):
+    # First answer of a server started as a subprocess: an unknown login
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            return httpx.post(f"http://127.0.0.1:{port}{path('login_user')}", json={"email": "nobody@example.com", "password": "x" * 8})
+        except httpx.TransportError:
+            assert time.monotonic() < deadline, "server did not start"
+            time.sleep(0.2)
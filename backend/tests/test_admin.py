@@ -0,0 +1,64 @@
+import time
+
+from sqlalchemy import func
+from sqlalchemy.future import select
+
+from conftest import path, records, register, wait_for_training
+
+
+async def user_with_model(client) -> tuple:
+    from backend.app.db.database import async_session_local
+    from backend.app.models.user import User
+
+    email = f"bulk-{time.time_ns()}@example.com"
+    headers = await register(client, email)
+    response = await client.post(path("start_training"), json={"parameters": {"target_column": "y", "data": records()}}, headers=headers)
+    training = await wait_for_training(client, headers, response.json()["id"])
+    async with async_session_local() as db:
+        user_id = (await db.execute(select(User.id).filter(User.email == email))).scalar()
+    return user_id, headers, training
+
+
+async def test_bulk_update_then_delete_users(client, admin_headers):
+    from backend.app.db.database import async_session_local
+    from backend.app.models.log import Log
+    from backend.app.models.training import Training
+    from backend.app.utils.artifacts import artifact_store, model_key
+
+    users = [await user_with_model(client) for _ in range(2)]
+    user_ids = [user_id for user_id, _, _ in users]
+
+    response = await client.post(path("bulk_update_users"), json={"user_ids": user_ids, "is_active": False}, headers=admin_headers)
+    assert response.json()["count"] == 2 and sorted(response.json()["user_ids"]) == sorted(user_ids)
+    for _, headers, _ in users:
+        assert (await client.get(path("get_summary"), headers=headers)).status_code == 401
+
+    response = await client.post(path("bulk_delete_users"), json={"user_ids": user_ids}, headers=admin_headers)
+    assert response.status_code == 200 and response.json()["count"] == 2
+    async with async_session_local() as db:
+        trainings = (await db.execute(select(func.count(Training.id)).filter(Training.user_id.in_(user_ids)))).scalar()
+        logs = (await db.execute(select(func.count(Log.id)).filter(Log.user_id.in_(user_ids)))).scalar()
+    assert trainings == 0 and logs == 0
+    keys = {info.key for info in artifact_store.list()}
+    assert not keys & {model_key(training["model_version"]) for _, _, training in users}
+
+
+async def test_purge_trainings_updates_the_summary(client, admin_headers):
+    user_id, headers, training = await user_with_model(client)
+    body = {"user_ids": [user_id], "statuses": ["completed"]}
+    response = await client.post(path("purge_trainings_by_filter"), json=body, headers=admin_headers)
+    assert response.json() == {"deleted": 1}
+    assert (await client.get(path("get_summary"), headers=headers)).json()["count"] == 0
+    # Active trainings cannot be purged
+    body["statuses"] = ["running"]
+    assert (await client.post(path("purge_trainings_by_filter"), json=body, headers=admin_headers)).status_code == 422
+
+
+async def test_admins_cannot_deactivate_themselves(client, admin_headers):
+    from backend.app.db.database import async_session_local
+    from backend.app.models.user import User
+
+    async with async_session_local() as db:
+        admin_id = (await db.execute(select(User.id).filter(User.email == "admin@example.com"))).scalar()
+    response = await client.post(path("bulk_update_users"), json={"user_ids": [admin_id], "is_active": False}, headers=admin_headers)
+    assert response.status_code == 400
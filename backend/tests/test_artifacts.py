@@ -0,0 +1,45 @@
+import os
+
+import pytest
+
+from backend.app.utils.artifacts import ArtifactCorruptError, LocalArtifactStore, artifact_store, model_key
+
+from conftest import WORKDIR, path, records, wait_for_training
+
+
+def write(store, key: str, data: bytes):
+    with store.writing(key) as tmp:
+        with open(tmp, "wb") as f:
+            f.write(data)
+
+
+def test_writes_are_atomic_and_checksummed():
+    store = LocalArtifactStore(os.path.join(WORKDIR, "artifacts-unit"))
+    write(store, "model_v1.joblib", b"model")
+    with pytest.raises(RuntimeError):
+        with store.writing("model_v2.joblib") as tmp:
+            with open(tmp, "wb") as f:
+                f.write(b"partial")
+            raise RuntimeError("job failed")
+    assert [info.key for info in store.list()] == ["model_v1.joblib"]
+    assert sorted(os.listdir(store.root)) == ["model_v1.joblib", "model_v1.joblib.sha256"]
+
+    with open(store.local_path("model_v1.joblib"), "ab") as f:
+        f.write(b"!")
+    with pytest.raises(ArtifactCorruptError):
+        store.local_path("model_v1.joblib")
+
+
+async def test_collection_removes_only_orphans(client, user_headers):
+    from backend.app.utils.artifact_gc import collect_artifacts
+
+    response = await client.post(path("start_training"), json={"parameters": {"target_column": "y", "data": records()}}, headers=user_headers)
+    training = await wait_for_training(client, user_headers, response.json()["id"])
+    assert training["status"] == "completed", training
+    orphan = model_key(10**9)
+    write(artifact_store, orphan, b"left behind by a deleted training")
+
+    report = await collect_artifacts(quota_bytes=0, keep_latest=1, grace_seconds=0)
+    keys = {info.key for info in artifact_store.list()}
+    assert report["orphans_deleted"] >= 1 and orphan not in keys
+    assert model_key(training["model_version"]) in keys
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy.future import select
+
+from conftest import path, register
+
+
+async def test_logins_are_written_in_batches_and_searchable(client, admin_headers):
+    from backend.app.db.database import async_session_local
+    from backend.app.models.user import User
+    from backend.app.utils.audit import audit_log
+
+    await register(client, "audited@example.com")
+    await audit_log.flush()
+    async with async_session_local() as db:
+        user_id = (await db.execute(select(User.id).filter(User.email == "audited@example.com"))).scalar()
+    response = await client.get(path("get_logs"), params={"user_id": user_id, "action": "ogi"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert [log["action"] for log in response.json()] == ["login"]
+
+
+async def test_retention_deletes_only_expired_logs(app):
+    from backend.app.db.database import async_session_local
+    from backend.app.models.log import Log
+    from backend.app.models.user import User
+    from backend.app.utils.audit import purge_audit_logs
+
+    async with async_session_local() as db:
+        user = User(email="retention@example.com", hashed_password="x")
+        db.add(user)
+        await db.flush()
+        db.add_all([
+            Log(user_id=user.id, action="old", timestamp=datetime.utcnow() - timedelta(days=40)),
+            Log(user_id=user.id, action="recent", timestamp=datetime.utcnow() - timedelta(days=1)),
+        ])
+        await db.commit()
+    assert await purge_audit_logs(30) >= 1
+    async with async_session_local() as db:
+        actions = (await db.execute(select(Log.action).filter(Log.user_id == user.id))).scalars().all()
+    assert actions == ["recent"]
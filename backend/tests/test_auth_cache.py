@@ -0,0 +1,57 @@
+from sqlalchemy.future import select
+
+from conftest import path, register
+
+
+def cached_user(email: str, token_version: int = 0):
+    from backend.app.models.user import User
+
+    return User(id=1, email=email, hashed_password="x", is_active=True, is_admin=False, token_version=token_version)
+
+
+def test_users_are_not_cached_with_a_process_local_backend(app):
+    from backend.app.utils.auth_cache import AuthCache, auth_cache, users_cacheable
+
+    # The tests run with PROGRESS_BACKEND=memory
+    assert not users_cacheable() and not auth_cache.cache_users
+    cache = AuthCache(10, 30, cache_users=False)
+    cache.set_user(cached_user("a@example.com"))
+    assert cache.get_user("a@example.com") is None
+
+
+async def test_a_burst_of_invalidations_evicts_every_user(app):
+    from backend.app.utils.auth_cache import INVALIDATION_CHANNEL, AuthCache
+    from backend.app.utils.broadcast import broadcast
+
+    cache = AuthCache(10, 30, cache_users=True)
+    await cache.start()
+    try:
+        for email in ("a@example.com", "b@example.com", "c@example.com"):
+            cache.set_user(cached_user(email))
+        # Back to back, as other processes' messages arrive: a subscriber would only
+        # see the last one
+        await broadcast.publish(INVALIDATION_CHANNEL, {"email": "a@example.com"})
+        await broadcast.publish(INVALIDATION_CHANNEL, {"emails": ["b@example.com"]})
+        assert cache.get_user("a@example.com") is None
+        assert cache.get_user("b@example.com") is None
+        assert cache.get_user("c@example.com") is not None
+    finally:
+        await cache.stop()
+
+
+async def test_deactivated_user_is_rejected(client, admin_headers):
+    from backend.app.db.database import async_session_local
+    from backend.app.models.user import User
+
+    headers = await register(client, "deactivated@example.com")
+    assert (await client.get(path("get_summary"), headers=headers)).status_code == 200
+    async with async_session_local() as db:
+        user_id = (await db.execute(select(User.id).filter(User.email == "deactivated@example.com"))).scalar()
+    response = await client.put(path("update_user", user_id=user_id), params={"is_active": "false"}, headers=admin_headers)
+    assert response.status_code == 200
+    assert (await client.get(path("get_summary"), headers=headers)).status_code == 401
+
+
+async def test_stats_report_whether_users_are_cached(client, admin_headers):
+    stats = (await client.get(path("get_auth_cache_stats"), headers=admin_headers)).json()
+    assert stats["users_cached"] is False and stats["tokens"]["hits"] >= 0
@@ -0,0 +1,22 @@
+import subprocess
+import sys
+
+from backend.benchmarks.run import compare
+
+from conftest import ROOT
+
+
+def test_compare_flags_only_regressions_beyond_tolerance():
+    baseline = {"api.login": {"p95_ms": 100.0, "throughput": 50.0, "requests": 10}}
+    results = {"api.login": {"p95_ms": 130.0, "throughput": 48.0, "requests": 99}, "api.new": {"p95_ms": 1.0}}
+    regressions = compare(results, baseline, tolerance=0.2)
+    assert len(regressions) == 1 and regressions[0].startswith("api.login.p95_ms")
+
+
+def test_standalone_benchmark_runs_and_exits():
+    result = subprocess.run(
+        [sys.executable, "-m", "backend.benchmarks.login", "--users", "1", "--requests", "4", "--concurrency", "2"],
+        cwd=ROOT, capture_output=True, text=True, timeout=120,
+    )
+    assert result.returncode == 0, result.stderr
+    assert "login" in result.stdout
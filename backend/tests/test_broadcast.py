@@ -0,0 +1,29 @@
+import asyncio
+
+from backend.app.utils.broadcast import Broadcast, DatabaseBroadcast
+
+
+async def first_message(broadcast, channel: str) -> dict:
+    async for message in broadcast.subscribe(channel):
+        return message
+
+
+async def test_late_subscriber_starts_from_the_latest_message():
+    broadcast = Broadcast()
+    await broadcast.publish("training:1", {"progress": 10})
+    await broadcast.publish("training:1", {"progress": 50})
+    assert await broadcast.latest("training:1") == {"progress": 50}
+    assert await asyncio.wait_for(first_message(broadcast, "training:1"), 1) == {"progress": 50}
+
+
+async def test_database_backend_reaches_other_processes(app):
+    # Two instances stand in for two API workers sharing the database
+    publisher, receiver = DatabaseBroadcast(), DatabaseBroadcast()
+    await receiver.start()
+    try:
+        waiting = asyncio.create_task(first_message(receiver, "training:2"))
+        await publisher.publish("training:2", {"progress": 100}, final=True)
+        assert await asyncio.wait_for(waiting, 10) == {"progress": 100}
+        assert await DatabaseBroadcast().latest("training:2") == {"progress": 100}
+    finally:
+        await receiver.stop()
@@ -0,0 +1,42 @@
+from conftest import path, records, wait_for_training
+
+
+async def train(client, headers, count: int = 1) -> list:
+    body = {"jobs": [{"parameters": {"target_column": "y", "data": records()}} for _ in range(count)]}
+    response = await client.post(path("start_training_batch"), json=body, headers=headers)
+    assert response.status_code == 200, response.text
+    return [await wait_for_training(client, headers, training["id"]) for training in response.json()]
+
+
+async def test_results_list_only_the_charted_metrics(client, user_headers):
+    trainings = await train(client, user_headers)
+    response = await client.get(path("get_results"), headers=user_headers)
+    assert response.status_code == 200
+    [item] = response.json()
+    assert item["id"] == trainings[0]["id"] and "parameters" not in item
+    assert set(item["results"]) == {"accuracy", "f1_score"}
+    assert item["results"]["accuracy"] == trainings[0]["results"]["accuracy"]
+
+
+async def test_results_pages_with_a_cursor(client, user_headers):
+    trainings = await train(client, user_headers, 2)
+    first = await client.get(path("get_results"), params={"limit": 1}, headers=user_headers)
+    cursor = first.headers["X-Next-Cursor"]
+    second = await client.get(path("get_results"), params={"limit": 1, "cursor": cursor}, headers=user_headers)
+    ids = [first.json()[0]["id"], second.json()[0]["id"]]
+    assert ids == sorted((training["id"] for training in trainings), reverse=True)
+    assert "X-Next-Cursor" not in second.headers
+
+
+async def test_summary_follows_submissions_and_outcomes(client, user_headers):
+    summary = (await client.get(path("get_summary"), headers=user_headers)).json()
+    assert summary == {"count": 0, "last_training": None, "success_rate": 0.0}
+    await train(client, user_headers, 2)
+    # A job that fails (no such target column in its data) counts but does not succeed
+    body = {"parameters": {"target_column": "missing", "data": records()}}
+    response = await client.post(path("start_training"), json=body, headers=user_headers)
+    assert (await wait_for_training(client, user_headers, response.json()["id"]))["status"] == "failed"
+
+    summary = (await client.get(path("get_summary"), headers=user_headers)).json()
+    assert summary["count"] == 3 and summary["last_training"] is not None
+    assert abs(summary["success_rate"] - 2 / 3) < 1e-9
@@ -0,0 +1,35 @@
+import os
+import signal
+import subprocess
+import sys
+
+from sqlalchemy import text
+
+from backend.app.db.database import async_session_local
+
+from conftest import ROOT, free_port, wait_for_server
+
+
+async def test_sqlite_connections_are_tuned(app):
+    async with async_session_local() as db:
+        journal_mode = (await db.execute(text("PRAGMA journal_mode"))).scalar()
+        foreign_keys = (await db.execute(text("PRAGMA foreign_keys"))).scalar()
+    assert journal_mode.lower() == "wal"
+    assert foreign_keys == 1
+
+
+def test_server_exits_after_shutdown(app):
+    # The pool keeps connections (and their threads) open between requests; the
+    # shutdown handler must close them or the process never exits
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port)],
+        cwd=ROOT, env=os.environ.copy(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        assert wait_for_server(port).status_code == 401
+        server.send_signal(signal.SIGINT)
+        assert server.wait(timeout=20) == 0
+    finally:
+        if server.poll() is None:
+            server.kill()
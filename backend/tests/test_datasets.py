@@ -0,0 +1,79 @@
+import io
+import os
+import uuid
+
+import pandas as pd
+
+from backend.app.utils.datasets import ingest_csv, load_dataset, read_csv_chunked
+
+from conftest import WORKDIR, path, register, wait_for_training
+
+
+def late_text_csv(rows: int = 1500) -> str:
+    # "code" looks numeric for far more rows than the dtype sample
+    lines = ["x1,code,y"]
+    for i in range(rows):
+        code = "unknown" if i == rows - 1 else str(i % 5)
+        lines.append(f"{i % 7},{code},{int(i % 7 > 3)}")
+    return "\n".join(lines) + "\n"
+
+
+def write_csv(text: str) -> str:
+    csv_path = os.path.join(WORKDIR, f"{uuid.uuid4().hex}.csv")
+    with open(csv_path, "w") as f:
+        f.write(text)
+    return csv_path
+
+
+def test_ingest_falls_back_to_text_for_late_non_numeric_values():
+    dataset_id = uuid.uuid4().hex * 2
+    meta = ingest_csv(write_csv(late_text_csv()), dataset_id)
+    kinds = {column["name"]: (column["kind"], column["dtype"]) for column in meta["columns"]}
+    assert kinds == {"x1": ("numeric", "int64"), "code": ("categorical", "int32"), "y": ("numeric", "int64")}
+    data = load_dataset(dataset_id)
+    assert data["y"].dtype == "int64" and data["code"].iloc[-1] == "unknown"
+
+
+def test_plain_csv_keeps_integers_and_widens_on_missing_values():
+    text = "a,b\n" + "".join(f"{i},{i}\n" for i in range(1200)) + "1200,\n"
+    data = read_csv_chunked(write_csv(text))
+    assert data["a"].dtype == "int64" and data["b"].dtype == "float64"
+    assert pd.isna(data["b"].iloc[-1])
+
+
+async def test_uploaded_integer_target_predicts_integers(client, user_headers):
+    files = {"file": ("data.csv", io.BytesIO(late_text_csv().encode()), "text/csv")}
+    response = await client.post(path("upload_training"), files=files, data={"parameters": '{"target_column": "y"}'}, headers=user_headers)
+    assert response.status_code == 200, response.text
+    training = await wait_for_training(client, user_headers, response.json()["id"])
+    assert training["status"] == "completed", training
+
+    body = {"rows": [{"x1": 6, "code": "1"}]}
+    response = await client.post(path("predict", version=training["model_version"]), json=body, headers=user_headers)
+    assert response.status_code == 200, response.text
+    prediction = response.json()["predictions"][0]
+    assert prediction["prediction"] in (0, 1) and isinstance(prediction["prediction"], int)
+    assert set(prediction["probabilities"]) == {"0", "1"}
+
+
+async def test_identical_uploads_share_one_stored_dataset(client, user_headers):
+    from backend.app.core.config import settings
+
+    text = "x1,x2,y\n" + "".join(f"{i % 7},{(i * 3) % 11},{int(i % 7 > 3)}\n" for i in range(80))
+    trainings = []
+    for _ in range(2):
+        files = {"file": ("data.csv", io.BytesIO(text.encode()), "text/csv")}
+        response = await client.post(path("upload_training"), files=files, data={"parameters": '{"target_column": "y"}'}, headers=user_headers)
+        assert response.status_code == 200, response.text
+        trainings.append(await wait_for_training(client, user_headers, response.json()["id"]))
+    dataset_id = trainings[0]["dataset_id"]
+    assert dataset_id and trainings[1]["dataset_id"] == dataset_id
+    assert [name for name in os.listdir(settings.DATASET_DIR) if name.startswith(dataset_id)] == [dataset_id]
+
+    # Retraining by id parses nothing; other users cannot use the dataset
+    body = {"parameters": {"target_column": "y"}, "dataset_id": dataset_id}
+    response = await client.post(path("start_training"), json=body, headers=user_headers)
+    assert response.status_code == 200, response.text
+    assert (await wait_for_training(client, user_headers, response.json()["id"]))["status"] == "completed"
+    other = await register(client)
+    assert (await client.post(path("start_training"), json=body, headers=other)).status_code == 404
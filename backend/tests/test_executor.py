@@ -0,0 +1,86 @@
+import asyncio
+
+import pytest
+
+from backend.app.utils.executor import ExecutorFullError, JobCancelledError, TrainingExecutor, UserLimitError
+
+
+async def test_queue_capacity_is_enforced():
+    executor = TrainingExecutor(max_workers=1, max_pending=1, max_jobs_per_user=1)
+    release = asyncio.Event()
+
+    async def runner(handle):
+        await release.wait()
+
+    executor.submit(1, 1, runner)
+    executor.submit(2, 2, runner)
+    assert (executor.running, executor.queue_depth) == (1, 1)
+    with pytest.raises(ExecutorFullError):
+        executor.submit(3, 3, runner)
+    release.set()
+    await executor.shutdown()
+
+
+async def test_reject_policy_limits_jobs_per_user():
+    executor = TrainingExecutor(max_workers=4, max_pending=10, max_jobs_per_user=1, user_limit_policy="reject")
+    release = asyncio.Event()
+
+    async def runner(handle):
+        await release.wait()
+
+    executor.submit(1, 1, runner)
+    with pytest.raises(UserLimitError):
+        executor.submit(2, 1, runner)
+    executor.submit(3, 2, runner)
+    release.set()
+    await executor.shutdown()
+
+
+async def test_reserved_room_is_kept_for_the_reserving_batch():
+    executor = TrainingExecutor(max_workers=1, max_pending=1, max_jobs_per_user=2)
+    release = asyncio.Event()
+
+    async def runner(handle):
+        await release.wait()
+
+    executor.reserve(1, 2)
+    with pytest.raises(ExecutorFullError):
+        executor.check_admission(2)
+    executor.submit(1, 1, runner, reserved=True)
+    executor.release(1)
+    executor.check_admission(2)
+    release.set()
+    await executor.shutdown()
+
+
+async def test_cancel_kills_the_worker_process():
+    executor = TrainingExecutor(max_workers=1, max_pending=1, max_jobs_per_user=1)
+    outcome = asyncio.get_running_loop().create_future()
+
+    async def runner(handle):
+        try:
+            await handle.run("time:sleep", 60)
+        except JobCancelledError as e:
+            outcome.set_result(e)
+
+    executor.submit(1, 1, runner)
+    await asyncio.sleep(0.5)
+    assert executor.cancel(1)
+    assert isinstance(await asyncio.wait_for(outcome, 30), JobCancelledError)
+    await executor.shutdown()
+
+
+async def test_cancel_drops_a_queued_job():
+    executor = TrainingExecutor(max_workers=1, max_pending=2, max_jobs_per_user=1)
+    release = asyncio.Event()
+    dropped = []
+
+    async def runner(handle):
+        await release.wait()
+
+    executor.submit(1, 1, runner)
+    executor.submit(2, 1, runner, on_drop=lambda: dropped.append(2))
+    assert executor.cancel(2)
+    assert dropped == [2] and executor.queue_depth == 0
+    release.set()
+    await executor.shutdown()
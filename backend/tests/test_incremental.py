@@ -0,0 +1,39 @@
+from conftest import path, records, wait_for_training
+
+INCREMENTAL = {"target_column": "y", "mode": "incremental", "incremental": {"chunk_rows": 16, "epochs": 2, "random_state": 0}}
+
+
+async def train(client, headers, parameters: dict, base_version: int = None) -> dict:
+    body = {"parameters": {**parameters, "data": records(120)}, "base_version": base_version}
+    response = await client.post(path("start_training"), json=body, headers=headers)
+    assert response.status_code == 200, response.text
+    return await wait_for_training(client, headers, response.json()["id"])
+
+
+async def test_incremental_training_reads_the_data_in_chunks(client, user_headers):
+    training = await train(client, user_headers, INCREMENTAL)
+    assert training["status"] == "completed", training
+    results = training["results"]
+    assert results["mode"] == "incremental" and results["rows"] == 120
+    assert [epoch["epoch"] for epoch in results["epochs"]] == [1, 2]
+    assert 0 <= results["accuracy"] <= 1
+
+
+async def test_warm_start_continues_from_a_base_version(client, user_headers):
+    base = await train(client, user_headers, {"target_column": "y"})
+    assert base["status"] == "completed", base
+    warm = await train(client, user_headers, {"target_column": "y"}, base["model_version"])
+    assert warm["status"] == "completed", warm
+    assert warm["base_version"] == base["model_version"]
+
+    incremental = await train(client, user_headers, INCREMENTAL)
+    continued = await train(client, user_headers, INCREMENTAL, incremental["model_version"])
+    assert continued["status"] == "completed", continued
+    # Only incremental models can be continued incrementally
+    mismatched = await train(client, user_headers, INCREMENTAL, base["model_version"])
+    assert mismatched["status"] == "failed" and "incremental" in mismatched["results"]["error"]
+
+
+async def test_warm_start_needs_a_visible_completed_model(client, user_headers):
+    body = {"parameters": {"target_column": "y", "data": records()}, "base_version": 10**9}
+    assert (await client.post(path("start_training"), json=body, headers=user_headers)).status_code == 404
@@ -0,0 +1,131 @@
+import time
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from conftest import PASSWORD
+
+
+async def create_job(db, **values):
+    from backend.app.db.versions import allocate_model_versions
+    from backend.app.models.training import Training, TrainingStatusEnum
+    from backend.app.models.user import User
+
+    user = User(email=f"queue-{time.time_ns()}@example.com", hashed_password=PASSWORD)
+    db.add(user)
+    await db.flush()
+    version = (await allocate_model_versions(db, 1))[0]
+    training = Training(user_id=user.id, model_version=version, status=TrainingStatusEnum.pending, parameters={}, source={"records": []}, **values)
+    db.add(training)
+    await db.commit()
+    return training
+
+
+async def expire_leases(db, training_id: int):
+    from backend.app.models.training import Training
+
+    await db.execute(update(Training).where(Training.id == training_id).values(lease_expires_at=datetime.utcnow() - timedelta(seconds=1)))
+    await db.commit()
+
+
+class FakeHandle:
+    # Stands in for the executor's handle: runs `during` while the "job" runs
+    def __init__(self, job_id: int, during):
+        self.job_id = job_id
+        self.during = during
+
+    async def run(self, *args, **kwargs):
+        await self.during()
+        return "model.joblib", {"accuracy": 1.0}
+
+
+async def test_requeued_job_ignores_the_stale_worker(app):
+    from backend.app.db.database import async_session_local
+    from backend.app.db.job_queue import claim_jobs, renew_leases, requeue_expired
+    from backend.app.db.stats import transition_training
+    from backend.app.models.training import Training, TrainingStatusEnum
+
+    async with async_session_local() as db:
+        training = await create_job(db)
+        assert [job.id for job in await claim_jobs(db, "worker-a", 100) if job.id == training.id] == [training.id]
+        await db.commit()
+        await expire_leases(db, training.id)
+        assert await requeue_expired(db) >= 1
+        await db.commit()
+        assert training.id in [job.id for job in await claim_jobs(db, "worker-b", 100)]
+        await db.commit()
+
+        # worker-a lost the job: it neither renews the lease nor records a result
+        assert await renew_leases(db, "worker-a", [training.id]) == set()
+        training = await db.get(Training, training.id)
+        assert not await transition_training(db, training, TrainingStatusEnum.completed, (TrainingStatusEnum.running,), "worker-a", results={"stale": True})
+        await db.commit()
+        assert training.status == TrainingStatusEnum.running
+        assert training.lease_owner == "worker-b"
+        assert training.results is None
+
+        assert await transition_training(db, training, TrainingStatusEnum.completed, (TrainingStatusEnum.running,), "worker-b", results={"ok": True})
+        await db.commit()
+        assert training.status == TrainingStatusEnum.completed
+
+
+async def test_completion_does_not_overwrite_a_cancellation(app):
+    from backend.app.api.api_v1.training import run_training
+    from backend.app.db.database import async_session_local
+    from backend.app.db.job_queue import claim_jobs
+    from backend.app.db.stats import transition_training
+    from backend.app.models.stats import UserTrainingStats
+    from backend.app.models.training import Training, TrainingStatusEnum
+
+    async with async_session_local() as db:
+        training = await create_job(db)
+        await claim_jobs(db, "worker-a", 100)
+        await db.commit()
+
+    async def cancel_meanwhile():
+        async with async_session_local() as db:
+            row = await db.get(Training, training.id)
+            assert await transition_training(db, row, TrainingStatusEnum.cancelled, (TrainingStatusEnum.pending, TrainingStatusEnum.running))
+            await db.commit()
+
+    await run_training(FakeHandle(training.id, cancel_meanwhile), {}, {"records": []}, lease_owner="worker-a")
+
+    async with async_session_local() as db:
+        row = await db.get(Training, training.id)
+        assert row.status == TrainingStatusEnum.cancelled
+        assert row.results is None and row.model_path is None
+        stats = await db.get(UserTrainingStats, row.user_id)
+        assert stats is None or stats.completed == 0
+
+
+async def test_claims_respect_the_per_user_limit(app, monkeypatch):
+    from backend.app.core.config import settings
+    from backend.app.db.database import async_session_local
+    from backend.app.db.job_queue import claim_jobs, unclaim_jobs
+    from backend.app.db.versions import allocate_model_versions
+    from backend.app.models.training import Training, TrainingStatusEnum
+
+    monkeypatch.setattr(settings, "TRAINING_MAX_JOBS_PER_USER", 2)
+    async with async_session_local() as db:
+        first = await create_job(db)
+        versions = await allocate_model_versions(db, 4)
+        db.add_all([
+            Training(user_id=first.user_id, model_version=version, status=TrainingStatusEnum.pending, parameters={}, source={"records": []})
+            for version in versions
+        ])
+        await db.commit()
+
+        claimed = [job.id for job in await claim_jobs(db, "worker-a", 100) if job.user_id == first.user_id]
+        await db.commit()
+        assert len(claimed) == 2
+        assert [job for job in await claim_jobs(db, "worker-a", 100) if job.user_id == first.user_id] == []
+        await db.commit()
+
+        # A job the worker could not start goes back as if it was never claimed
+        assert await unclaim_jobs(db, "worker-a", claimed[1:]) == 1
+        await db.commit()
+        row = await db.get(Training, claimed[1])
+        await db.refresh(row)
+        assert row.status == TrainingStatusEnum.pending and row.attempts == 0 and row.lease_owner is None
+        assert [job.id for job in await claim_jobs(db, "worker-b", 100) if job.user_id == first.user_id] == [claimed[1]]
+        await db.commit()
@@ -0,0 +1,27 @@
+import re
+
+from conftest import path
+
+
+def sample(text: str, name: str, **labels) -> float:
+    # Value of the first sample of `name` whose labels include `labels`
+    for line in text.splitlines():
+        match = re.match(rf"^{name}(?:\{{(.*)\}})? (\S+)$", line)
+        if match and all(f'{key}="{value}"' in (match.group(1) or "") for key, value in labels.items()):
+            return float(match.group(2))
+    raise AssertionError(f"No {name} sample with {labels}")
+
+
+async def test_metrics_count_requests_by_route_template(client, user_headers):
+    route = path("get_summary")
+    before = (await client.get(path("get_metrics"))).text
+    start = sample(before, "http_requests_total", route=route, status="200") if f'route="{route}"' in before else 0
+    for _ in range(3):
+        assert (await client.get(route, headers=user_headers)).status_code == 200
+
+    response = await client.get(path("get_metrics"))
+    assert response.status_code == 200 and response.headers["content-type"].startswith("text/plain")
+    assert sample(response.text, "http_requests_total", method="GET", route=route, status="200") == start + 3
+    assert sample(response.text, "http_request_duration_seconds_count", route=route) >= 3
+    assert sample(response.text, "db_query_duration_seconds_count", operation="SELECT") > 0
+    assert sample(response.text, "training_queue_depth") >= 0
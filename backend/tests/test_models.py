@@ -0,0 +1,61 @@
+import asyncio
+import threading
+
+import numpy as np
+
+from backend.app.utils.serving import MicroBatcher
+
+from conftest import path, records, register, wait_for_training
+
+
+class CountingModel:
+    feature_names_in_ = np.array(["x1"])
+    classes_ = np.array([0, 1])
+
+    def __init__(self):
+        self.calls = 0
+        self.threads = set()
+
+    def predict_proba(self, frame):
+        self.calls += 1
+        self.threads.add(threading.current_thread())
+        if (frame["x1"] < 0).any():
+            raise ValueError("x1 must not be negative")
+        return np.column_stack([1 - frame["x1"].to_numpy() / 10, frame["x1"].to_numpy() / 10])
+
+
+async def test_concurrent_rows_are_scored_in_one_call():
+    model = CountingModel()
+    batcher = MicroBatcher(model, max_size=64, max_wait=0.05)
+    results = await asyncio.gather(*(batcher.predict({"x1": x}) for x in (1, 9, 2)))
+    assert model.calls == 1
+    assert [result["prediction"] for result in results] == [0, 1, 0]
+
+
+async def test_batches_are_scored_off_the_event_loop():
+    model = CountingModel()
+    batcher = MicroBatcher(model, max_size=64, max_wait=0.01)
+    results = await asyncio.gather(*(batcher.predict({"x1": x}) for x in (1, -1, 9)), return_exceptions=True)
+    assert threading.main_thread() not in model.threads
+    # The failed batch is retried row by row, so only the bad row fails
+    assert results[0]["prediction"] == 0 and results[2]["prediction"] == 1
+    assert isinstance(results[1], ValueError) and "negative" in str(results[1])
+
+
+async def test_predict_serves_cached_models_to_their_owner(client, user_headers, admin_headers):
+    response = await client.post(path("start_training"), json={"parameters": {"target_column": "y", "data": records()}}, headers=user_headers)
+    training = await wait_for_training(client, user_headers, response.json()["id"])
+    assert training["status"] == "completed", training
+    predict = path("predict", version=training["model_version"])
+
+    singles = await asyncio.gather(*(client.post(predict, json={"rows": [{"x1": i, "x2": i}]}, headers=user_headers) for i in range(4)))
+    assert all(response.status_code == 200 for response in singles)
+    response = await client.post(predict, json={"rows": [{"x1": 1, "x2": 2}, {"x1": 6, "x2": 3}]}, headers=user_headers)
+    assert response.status_code == 200 and len(response.json()["predictions"]) == 2
+    assert (await client.post(predict, json={"rows": [{"x1": 1}]}, headers=user_headers)).status_code == 422
+
+    other = await register(client)
+    assert (await client.post(predict, json={"rows": [{"x1": 1, "x2": 2}]}, headers=other)).status_code == 404
+    assert (await client.post(path("predict", version=10**9), json={"rows": [{"x1": 1}]}, headers=user_headers)).status_code == 404
+    stats = (await client.get(path("get_model_cache_stats"), headers=admin_headers)).json()
+    assert stats["size"] >= 1 and stats["hits"] >= 1
@@ -0,0 +1,37 @@
+from conftest import path, records, wait_for_training
+
+
+async def test_training_detail_is_compressed_and_revalidated(client, user_headers):
+    body = {"parameters": {"target_column": "y", "notes": "x" * 4000, "data": records()}}
+    response = await client.post(path("start_training"), json=body, headers=user_headers)
+    training = await wait_for_training(client, user_headers, response.json()["id"])
+    detail = path("get_training", training_id=training["id"])
+
+    response = await client.get(detail, headers={**user_headers, "Accept-Encoding": "gzip"})
+    assert response.status_code == 200 and response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < 4000
+    assert response.json()["parameters"]["notes"] == "x" * 4000
+    etag = response.headers["etag"]
+
+    response = await client.get(detail, headers={**user_headers, "If-None-Match": etag})
+    assert response.status_code == 304 and response.content == b""
+    response = await client.get(detail, headers={**user_headers, "If-None-Match": '"stale"', "Accept-Encoding": "identity"})
+    assert response.status_code == 200 and "content-encoding" not in response.headers
+
+
+async def test_etag_changes_with_a_same_second_update(client, user_headers):
+    from sqlalchemy import update
+
+    from backend.app.db.database import async_session_local
+    from backend.app.models.training import Training
+
+    response = await client.post(path("start_training"), json={"parameters": {"target_column": "y", "data": records()}}, headers=user_headers)
+    training = await wait_for_training(client, user_headers, response.json()["id"])
+    detail = path("get_training", training_id=training["id"])
+    etag = (await client.get(detail, headers=user_headers)).headers["etag"]
+
+    async with async_session_local() as db:
+        await db.execute(update(Training).where(Training.id == training["id"]).values(results={"accuracy": 0.5}))
+        await db.commit()
+    response = await client.get(detail, headers={**user_headers, "If-None-Match": etag})
+    assert response.status_code == 200 and response.json()["results"] == {"accuracy": 0.5}
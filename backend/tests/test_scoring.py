@@ -0,0 +1,26 @@
+import io
+
+from conftest import path, records, wait_for_training
+
+
+async def test_scoring_job_writes_a_resumable_download(client, user_headers):
+    response = await client.post(path("start_training"), json={"parameters": {"target_column": "y", "data": records()}}, headers=user_headers)
+    model = await wait_for_training(client, user_headers, response.json()["id"])
+    assert model["status"] == "completed", model
+
+    text = "x1,x2\n" + "".join(f"{i % 7},{i % 11}\n" for i in range(500))
+    files = {"file": ("score.csv", io.BytesIO(text.encode()), "text/csv")}
+    data = {"model_version": str(model["model_version"]), "parameters": '{"scoring": {"chunk_rows": 64}}'}
+    response = await client.post(path("upload_scoring"), files=files, data=data, headers=user_headers)
+    assert response.status_code == 200, response.text
+    job = await wait_for_training(client, user_headers, response.json()["id"])
+    assert job["status"] == "completed" and job["job_type"] == "scoring", job
+
+    scores = path("download_scores", training_id=job["id"])
+    full = await client.get(scores, headers=user_headers)
+    assert full.status_code == 200 and full.headers["accept-ranges"] == "bytes"
+    assert len(full.text.splitlines()) == 501
+    partial = await client.get(scores, headers={**user_headers, "Range": "bytes=10-"})
+    assert partial.status_code == 206 and partial.content == full.content[10:]
+    assert partial.headers["content-range"] == f"bytes 10-{len(full.content) - 1}/{len(full.content)}"
+    assert (await client.get(scores, headers={**user_headers, "Range": f"bytes={len(full.content)}-"})).status_code == 416
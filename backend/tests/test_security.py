@@ -0,0 +1,35 @@
+import asyncio
+
+from passlib.context import CryptContext
+from sqlalchemy.future import select
+
+from backend.app.utils.security import HasherBusyError, PasswordHasher, pwd_context
+
+from conftest import PASSWORD, path
+
+
+async def test_hasher_rejects_work_beyond_its_bound():
+    hasher = PasswordHasher(max_workers=1, max_pending=1)
+    try:
+        results = await asyncio.gather(hasher.hash("a"), hasher.hash("b"), return_exceptions=True)
+        assert isinstance(results[1], HasherBusyError) and hasher.rejected == 1
+        assert pwd_context.verify("a", results[0])
+        # Once the first hash is done there is room again
+        assert pwd_context.verify("c", await hasher.hash("c"))
+    finally:
+        hasher.shutdown()
+
+
+async def test_login_rehashes_with_the_configured_cost(client):
+    from backend.app.db.database import async_session_local
+    from backend.app.models.user import User
+
+    email = "old-cost@example.com"
+    async with async_session_local() as db:
+        db.add(User(email=email, hashed_password=CryptContext(schemes=["bcrypt"], bcrypt__rounds=5).hash(PASSWORD)))
+        await db.commit()
+    response = await client.post(path("login_user"), json={"email": email, "password": PASSWORD})
+    assert response.status_code == 200
+    async with async_session_local() as db:
+        hashed = (await db.execute(select(User.hashed_password).filter(User.email == email))).scalar()
+    assert hashed.startswith("$2b$04$") and pwd_context.verify(PASSWORD, hashed)
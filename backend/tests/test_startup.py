@@ -0,0 +1,40 @@
+import json
+import os
+import signal
+import subprocess
+import sys
+
+from conftest import ROOT, free_port, wait_for_server
+
+CHECK = """
+import json, sys
+import backend.main
+from backend.app.utils.lazy import ML_MODULES, preload_ml
+before = [name for name in ML_MODULES if name in sys.modules]
+preload_ml()
+after = [name for name in ML_MODULES if name not in sys.modules]
+print(json.dumps({"before": before, "missing_after_preload": after}))
+"""
+
+
+def test_api_import_does_not_load_the_ml_stack():
+    # A fresh interpreter: this test process has long imported everything
+    result = subprocess.run([sys.executable, "-c", CHECK], cwd=ROOT, env=os.environ.copy(), capture_output=True, text=True, timeout=120)
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert report == {"before": [], "missing_after_preload": []}
+
+
+def test_preforked_workers_serve_and_stop(app):
+    port = free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "backend.serve", "--workers", "2", "--preload", "--port", str(port), "--host", "127.0.0.1"],
+        cwd=ROOT, env=os.environ.copy(), stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        assert wait_for_server(port, timeout=60).status_code == 401
+        server.send_signal(signal.SIGTERM)
+        assert server.wait(timeout=30) == 0
+    finally:
+        if server.poll() is None:
+            server.kill()
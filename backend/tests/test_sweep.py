@@ -0,0 +1,46 @@
+from backend.app.utils.sweep import sweep_candidates
+
+from conftest import path, records, wait_for_training
+
+COLORS = ("red", "green", "blue")
+
+
+def test_grid_and_random_candidates():
+    space = {"C": [0.1, 1.0, 10.0], "fit_intercept": [True, False]}
+    assert len(sweep_candidates({"space": space})) == 6
+    sampled = sweep_candidates({"space": space, "strategy": "random", "n_iter": 4, "random_state": 7})
+    assert len(sampled) == 4 and len({tuple(sorted(c.items())) for c in sampled}) == 4
+    assert sampled == sweep_candidates({"space": space, "strategy": "random", "n_iter": 4, "random_state": 7})
+
+
+async def test_sweep_ranks_candidates_and_registers_the_best(client, user_headers):
+    body = {
+        "parameters": {"target_column": "y", "data": records()},
+        "sweep": {"strategy": "random", "space": {"C": [0.01, 0.1, 1.0, 10.0]}, "n_iter": 3, "scoring": "accuracy", "random_state": 0},
+    }
+    response = await client.post(path("start_sweep"), json=body, headers=user_headers)
+    training = await wait_for_training(client, user_headers, response.json()["id"])
+    assert training["status"] == "completed", training["results"]
+    results = training["results"]
+    scores = [candidate["metrics"]["accuracy"] for candidate in results["candidates"]]
+    assert len(scores) == 3 and scores == sorted(scores, reverse=True)
+    assert results["best_params"] == results["candidates"][0]["params"]
+    assert results["accuracy"] == scores[0]
+
+
+def categorical_records(rows: int = 90) -> list:
+    return [{"x": i % 5, "color": COLORS[i % 3], "y": int(COLORS[i % 3] == "red" or i % 5 == 0)} for i in range(rows)]
+
+
+async def test_sweep_with_a_categorical_column(client, user_headers):
+    body = {
+        "parameters": {"target_column": "y", "data": categorical_records()},
+        "sweep": {"space": {"C": [0.1, 1.0, 10.0]}, "random_state": 0},
+    }
+    response = await client.post(path("start_sweep"), json=body, headers=user_headers)
+    assert response.status_code == 200, response.text
+    training = await wait_for_training(client, user_headers, response.json()["id"])
+    assert training["status"] == "completed", training["results"]
+    results = training["results"]
+    assert len(results["candidates"]) == 3
+    assert results["best_params"]["C"] in (0.1, 1.0, 10.0)
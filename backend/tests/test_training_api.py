@@ -0,0 +1,48 @@
+from backend.app.db.database import async_session_local
+from backend.app.db.versions import allocate_model_versions
+
+from conftest import path, records, wait_for_training
+
+
+async def test_first_version_allocation_on_empty_database(app):
+    async with async_session_local() as db:
+        first = await allocate_model_versions(db, 1)
+        second = await allocate_model_versions(db, 3)
+        await db.rollback()
+    assert len(first) == 1 and list(second) == [first[0] + 1, first[0] + 2, first[0] + 3]
+
+
+async def test_training_runs_to_completion(client, user_headers):
+    body = {"parameters": {"target_column": "y", "data": records()}}
+    response = await client.post(path("start_training"), json=body, headers=user_headers)
+    assert response.status_code == 200, response.text
+    training = await wait_for_training(client, user_headers, response.json()["id"])
+    assert training["status"] == "completed", training
+    assert set(training["results"]) >= {"accuracy", "f1_score"}
+
+
+async def test_batch_submission_allocates_distinct_versions(client, user_headers):
+    body = {"jobs": [{"parameters": {"target_column": "y", "data": records()}} for _ in range(2)]}
+    response = await client.post(path("start_training_batch"), json=body, headers=user_headers)
+    assert response.status_code == 200, response.text
+    versions = [training["model_version"] for training in response.json()]
+    assert len(set(versions)) == 2
+    for training in response.json():
+        assert (await wait_for_training(client, user_headers, training["id"]))["status"] == "completed"
+
+
+async def test_concurrent_batches_are_admitted_whole_or_not_at_all(client, user_headers, monkeypatch):
+    import asyncio
+
+    from backend.app.utils.executor import training_executor
+
+    monkeypatch.setattr(training_executor, "max_workers", 1)
+    monkeypatch.setattr(training_executor, "max_pending", 2)
+    body = {"jobs": [{"parameters": {"target_column": "y", "data": records()}} for _ in range(3)]}
+    responses = await asyncio.gather(*(client.post(path("start_training_batch"), json=body, headers=user_headers) for _ in range(2)))
+    assert sorted(response.status_code for response in responses) == [200, 503]
+    accepted = next(response for response in responses if response.status_code == 200)
+    for training in accepted.json():
+        assert (await wait_for_training(client, user_headers, training["id"]))["status"] == "completed"
+    # The rejected batch left no rows behind
+    assert (await client.get(path("get_summary"), headers=user_headers)).json()["count"] == 3
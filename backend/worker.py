@@ -0,0 +1,106 @@
+import asyncio
+import functools
+import logging
+import os
+import signal
+import socket
+import uuid
+
+from backend.app.api.api_v1.training import run_training
+from backend.app.core.config import settings
+from backend.app.db.database import async_session_local, engine
+from backend.app.db.job_queue import claim_jobs, release_leases, renew_leases, requeue_expired, unclaim_jobs
+from backend.app.utils.broadcast import broadcast
+from backend.app.utils.executor import ExecutorFullError, UserLimitError, training_executor
+
+# Training worker for TRAINING_QUEUE=database. Run as many as needed, on any host
+# that shares the database and the upload/dataset/model directories:
+#   python -m backend.worker
+# Each worker runs up to TRAINING_MAX_WORKERS jobs at a time in child processes.
+
+logger = logging.getLogger("backend.worker")
+
+
+async def claim(owner: str):
+    free = training_executor.free_slots
+    if not free:
+        return
+    async with async_session_local() as db:
+        jobs = await claim_jobs(db, owner, free)
+        await db.commit()
+    unstarted = []
+    for job in jobs:
+        try:
+            training_executor.submit(job.id, job.user_id, functools.partial(run_training, parameters=job.parameters, source=job.source, lease_owner=owner))
+        except (ExecutorFullError, UserLimitError) as exc:
+            logger.warning("Returning training %s to the queue: %s", job.id, exc)
+            unstarted.append(job.id)
+            continue
+        logger.info("Claimed training %s", job.id)
+    if unstarted:
+        async with async_session_local() as db:
+            await unclaim_jobs(db, owner, unstarted)
+            await db.commit()
+
+
+async def heartbeat(owner: str):
+    while True:
+        await asyncio.sleep(settings.TRAINING_LEASE_SECONDS / 3)
+        try:
+            job_ids = training_executor.job_ids()
+            async with async_session_local() as db:
+                held = await renew_leases(db, owner, job_ids)
+                requeued = await requeue_expired(db)
+                await db.commit()
+            if requeued:
+                logger.warning("Re-queued %s trainings with expired leases", requeued)
+            # Cancelled, or requeued after a missed heartbeat and possibly claimed by
+            # another worker: this run could not record its result anymore
+            for job_id in job_ids:
+                if job_id not in held:
+                    logger.info("Stopping training %s, this worker no longer holds it", job_id)
+                    training_executor.cancel(job_id)
+        except Exception:
+            logger.exception("Lease heartbeat failed")
+
+
+async def run_worker():
+    if settings.TRAINING_QUEUE != "database":
+        logger.warning("TRAINING_QUEUE is %r; the API also runs trainings itself", settings.TRAINING_QUEUE)
+    if settings.PROGRESS_BACKEND == "memory":
+        logger.warning("PROGRESS_BACKEND=memory: progress from this worker will not reach API clients")
+    owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stop.set)
+
+    await broadcast.start()
+    beat = asyncio.create_task(heartbeat(owner))
+    logger.info("Worker %s started with %s slots", owner, training_executor.max_workers)
+    try:
+        while not stop.is_set():
+            try:
+                await claim(owner)
+            except Exception:
+                logger.exception("Claiming trainings failed")
+            try:
+                await asyncio.wait_for(stop.wait(), settings.TRAINING_QUEUE_POLL_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        logger.info("Worker %s stopping, waiting up to %ss for running trainings", owner, settings.TRAINING_WORKER_DRAIN_SECONDS)
+        await training_executor.drain(settings.TRAINING_WORKER_DRAIN_SECONDS)
+        beat.cancel()
+        async with async_session_local() as db:
+            released = await release_leases(db, owner)
+            await db.commit()
+        if released:
+            logger.info("Returned %s unfinished trainings to the queue", released)
+        await broadcast.stop()
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(run_worker())